@@ -20,18 +20,43 @@
 import sys
 import os.path
 from os import path
-
-def checkInputFiles():
+import numpy as np
+from annotationTrack import AnnotationTrack
+from intervalIndex import readCdsGenes
+from gcIndex import buildGCIndex, circularPositions, gcMask
+from packedGenome import readPackedOrFasta
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from stageMetrics import NO_METRICS
+
+def printUsage():
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    print("\nUsage:\npython GCContentORFsCdsCirc.py [file_path_name.uORFs] [file_path_name.cds] [file_path_name.fasta] [--track-format=csv|bedgraph|npy|npz] [--bundle] [--metrics[=file.json]] [--profile[=file.prof]]")
+    print("       [--quiet] [--results=tsv|jsonl] [--no-gct] [--incremental]\n")
+    print("\nBatch usage:\npython GCContentORFsCdsCirc.py --batch=[manifest.tsv or folder] [--workers=N] [--track-format=csv|bedgraph|npy|npz] [--bundle] [--metrics] [--profile]")
+    print("       [--results=tsv|jsonl] [--no-gct] [--incremental]\n")
+    print("The per-nucleotide track is saved as csv (default, one row per nucleotide), bedgraph (one row per run of equal values),")
+    print("npy (binary array) or npz (compressed runs)")
+    print("With --bundle, the input files are read once and kept in a binary '.uORFs.bundle.npz' file (genomeBundle.py), loaded by the next runs")
+    print("--metrics saves the wall time, CPU time and peak memory of each stage (input parsing, array construction, uORF pass, whole genome pass and")
+    print("output writing) in a JSON file ('.gct.metrics.json') and --profile saves a cProfile dump ('.gct.prof'). In a batch, each genome has its own files")
+    print("--quiet does not print the results of each uORF (the final summary is still printed). --results saves the results of each uORF and the summary")
+    print("in a tab separated ('.tsv' and '.summary.tsv') or JSON lines ('.jsonl') file (resultsWriter.py), and --no-gct does not save the '.gct' file")
+    print("In a batch, the results of each uORF are never printed")
+    print("With --incremental, the genome, the genes of the cds file and the results of each uORF are kept in a '.uORFs.state.npz' file (uORFsState.py).")
+    print("When only the uORFs file changed, the next run computes only the uORFs that were added or edited (not used with --bundle)")
+    print("The manifest has one genome per line: [file_path_name.uORFs] [file_path_name.cds] [file_path_name.fasta], separated by tab")
+    print("A folder is searched for subfolders with one '.uORFs', one '.cds' and one '.fasta' file each\n")
+    sys.exit(0)
+
+def checkInputFiles(arguments):
     # #Check if all the necessary files names are passed as arguments
-    if (len(sys.argv)!=4 or sys.argv[1].find(".uORFs")==-1 or  sys.argv[2].find(".cds")==-1 or sys.argv[3].find(".fasta")==-1):
-        print("\n----------------------------------------------------------------------------------------------------\n")
-        print("\nUsage:\npython GCContentORFsCdsCirc.py [file_path_name.uORFs] [file_path_name.cds] [file_path_name.fasta]\n")
-        sys.exit(0)
+    if (len(arguments)!=3 or arguments[0].find(".uORFs")==-1 or  arguments[1].find(".cds")==-1 or arguments[2].find(".fasta")==-1):
+        printUsage()
 
     #Get path/file names
-    uORFs_file_name=sys.argv[1]
-    cds_file_name=sys.argv[2]
-    fasta_file_name=sys.argv[3]
+    uORFs_file_name=arguments[0]
+    cds_file_name=arguments[1]
+    fasta_file_name=arguments[2]
 
     #Check if path/files exists
     if (path.exists(uORFs_file_name)==False or path.exists(cds_file_name)==False or path.exists(fasta_file_name)==False):
@@ -40,17 +65,14 @@ def checkInputFiles():
         print("\n--------------------------------------------------------------------------------------------\n")
         exit(0)
 
-    #Open input files
-    uORFs_file=open(uORFs_file_name,'r') 
-    cds_file=open(cds_file_name, 'r')
-    fasta_file=open(fasta_file_name,'r')
+    return uORFs_file_name, cds_file_name, fasta_file_name
 
+#With save_gct=False (option --no-gct) the '.gct' file is not created and output_gct_file is None
+def openGenomeFiles(uORFs_file_name, save_gct=True):
     #Open output files. The ID filename in uORFs file is used to generate the result files ('.gct' and '.csv')
-    if (os.name=="nt"):
-        uORFs_file_name=uORFs_file_name.strip(".\\")
-    output_file_name=uORFs_file_name[0:uORFs_file_name.find(".")]
-    output_gct_file=open(output_file_name+".gct",'w')
-    #The csv file was generated to help analyze the results. Each row of 'csv' file represent a nucleotide position in the whole genome. 
+    output_file_name=getOutputFileName(uORFs_file_name)
+    output_gct_file=open(output_file_name+".gct",'w') if save_gct else None
+    #The csv file (or the track in the format of --track-format, written by trackWriter.py) was generated to help analyze the results. Each row of 'csv' file represent a nucleotide position in the whole genome. 
     #The idea is as follows:
     #Row value= 0 = indicates the nucleotide belongs a non coding region
     #Row value= 1 = indicates the nucleotide belongs a coding region
@@ -60,97 +82,122 @@ def checkInputFiles():
     #Row value= 12 = indicates the nucleotide belongs a coding region, to a uORF and 2 genes
     #Row value= 22 = indicates the nucleotide belongs a coding region, to 2 uORFs and 2 genes
     #and so on
-    #The strip will remove '.\' that appear on console in Windows 10 before path\filename 
-    output_csv_file=open(output_file_name+".csv",'w')
-
-    return uORFs_file,cds_file,fasta_file,output_gct_file,output_csv_file 
-
-
-#This function creates a numerical array (genome_array) which will tell us where the coding, non coding and uORFs are.
-#Based on cds file, the genome_array returned from it contains the data of coding and noncoding regions of genes detailed in GenBank 
-def createGenomeArray(cds_file):
-    #genome_array represent the whole genome. Position 0 is not used.
-    genome_array=[]
-    genome_size=0
-    #Loop to get data from cds file
-    for line in cds_file: 
-        #get total genome size from cds file
-        if (line.find("Genome size: ")!=-1):
-            genome_size=int(line[13:]) 
-            #Instantiate size of genome in genome_array and populates with value=0
-            genome_array=[0]*(genome_size+1)
-        
-        #Get start and end positions of coding regions (genes on cds)
-        if (line.find(";")!=-1):
-            aux_index=line.find(";")
-            line=line.strip()
-            start=int(line[:aux_index])
-            end=int(line[aux_index+1:line.find("#")])
-            #Loop to register nucleotides that belong to coding regions, based on start and end positions retrieved
-            #This adds +1 every time a nucleotide belong to a gene in cds file
-            #To contemplate the circular genome, we use a while loop to process every nucleotide in the sequence
-            i=start
-            while True:
-                genome_array[i]=genome_array[i]+1
-                if (i==end):
-                    break
-                i=i+1
-                #Check if it is the final position of genome and point to the first one
-                if (i>len(genome_array)-1):
-                    i=1
-    return genome_size,genome_array
-
-def checkCG(nc_char):
-    if (nc_char=='C' or nc_char=='G'):
-        return True
-    else:
-        return False
 
-#This function calculates the GC content of the coding and non coding regions of a sequence. Using the genome_array as input,
+    return output_gct_file,output_file_name
+
+#This function closes and removes the '.gct' file and the results file of a genome when they were not closed (the run failed before the end)
+def discardGenomeFiles(output_gct_file, results_writer):
+    if (output_gct_file is not None and not output_gct_file.closed):
+        output_gct_file.close()
+        if (path.exists(output_gct_file.name)):
+            os.remove(output_gct_file.name)
+    if (results_writer is not None):
+        results_writer.discard()
+
+#The ID filename in uORFs file is used to name the result files, in the same folder of the uORFs file
+def getOutputFileName(uORFs_file_name):
+    #The strip will remove '.\' that appear on console in Windows 10 before path\filename 
+    if (os.name=="nt"):
+        uORFs_file_name=uORFs_file_name.strip(".\\")
+    #Only the file name is cut at the first '.', so paths like './folder/ID.uORFs' keep their folder
+    folder_name, file_name=path.split(uORFs_file_name)
+    return path.join(folder_name, file_name[0:file_name.find(".")])
+
+
+#This function creates the annotation track (annotationTrack.py) which will tell us where the coding, non coding and uORFs are.
+#Based on cds file, the gene plane of the track contains the data of coding and noncoding regions of genes detailed in GenBank 
+def createAnnotationTrack(cds_file):
+    #Get total genome size and the start and end positions of coding regions (genes on cds) from cds file
+    genome_size, starts, ends, names=readCdsGenes(cds_file)
+    return genome_size,trackFromGenes(genome_size, starts, ends)
+
+#This function creates the annotation track of the genes (start and end positions) read from the cds file
+def trackFromGenes(genome_size, starts, ends):
+    #The track represent the whole genome, with a gene plane and an uORF plane. Position 0 is not used.
+    #Every nucleotide that belongs to a gene in cds file gets +1 in the gene plane. Genes with start > end contemplate the circular genome,
+    #wrapping from the final position of genome to the first one
+    annotation_track=AnnotationTrack(genome_size, ("gene","uORF"))
+    annotation_track.addIntervals("gene", starts, ends)
+    return annotation_track
+
+#This function reads the whole genome, the annotation track and the uORFs (name, start, end and sequence) of a genome
+#With use_bundle=True they come from the bundle of the uORFs file (genomeBundle.py), which is created when it is missing or its files changed
+#The reading of the files and the creation of the track are measured as the stages input_parsing and array_construction
+def readGenomeData(uORFs_file_name, cds_file_name, fasta_file_name, use_bundle=False, metrics=NO_METRICS):
+    from genomeBundle import loadCdsBundle, readuORFsRecords
+    if (use_bundle):
+        with metrics.stage("input_parsing"):
+            whole_genome, genome_size, gene_coverage, uORFs=loadCdsBundle(uORFs_file_name, cds_file_name, fasta_file_name)
+        with metrics.stage("array_construction"):
+            annotation_track=AnnotationTrack(genome_size, ("gene","uORF"))
+            annotation_track.addCoverage("gene", gene_coverage)
+        return whole_genome, genome_size, annotation_track, uORFs
+
+    with metrics.stage("input_parsing"):
+        #Call function that reads data from 'cds' file
+        with open(cds_file_name, 'r') as cds_file:
+            genome_size, starts, ends, names=readCdsGenes(cds_file)
+
+        #Call function to read whole genome from fasta file
+        whole_genome=readWholeGenome(open(fasta_file_name,'r'))
+
+        with open(uORFs_file_name,'r') as uORFs_file:
+            uORFs=readuORFsRecords(uORFs_file)
+
+    #Call function that creates the annotation track with the genes of the 'cds' file
+    with metrics.stage("array_construction"):
+        annotation_track=trackFromGenes(genome_size, starts, ends)
+    return whole_genome, genome_size, annotation_track, uORFs
+
+#This function is readGenomeData for the option --incremental. The genome, the genes and the uORF plane come from the state of the uORFs file
+#(uORFsState.py), when it was built with the same cds and fasta files. Only the uORFs file is always read
+#Returns the state too, which tells uORFsFileGCCalc the uORFs that do not need to be computed again
+def readIncrementalGenomeData(uORFs_file_name, cds_file_name, fasta_file_name, metrics=NO_METRICS):
+    from genomeBundle import readuORFsRecords
+    from genomeCoverage import buildCoverageArray
+    from uORFsState import STATE_EXTENSION, UORFsState, stateDigest, loadState
+    with metrics.stage("input_parsing"):
+        digest=stateDigest(cds_file_name, fasta_file_name)
+        uORFs_state=loadState(uORFs_file_name+STATE_EXTENSION, digest)
+        with open(uORFs_file_name,'r') as uORFs_file:
+            uORFs=readuORFsRecords(uORFs_file)
+        if (uORFs_state is None):
+            with open(cds_file_name, 'r') as cds_file:
+                genome_size, starts, ends, names=readCdsGenes(cds_file)
+            whole_genome=readWholeGenome(open(fasta_file_name,'r'))
+
+    with metrics.stage("array_construction"):
+        if (uORFs_state is None):
+            uORFs_state=UORFsState(digest, whole_genome, genome_size, buildCoverageArray(genome_size, starts, ends))
+        annotation_track=uORFs_state.annotationTrack()
+    return uORFs_state.whole_genome, uORFs_state.genome_size, annotation_track, uORFs, uORFs_state
+
+#This function calculates the GC content of the coding and non coding regions of a sequence. Using the gc_index as input,
 #its possible to determinte the GC content in coding and non coding regions. 
-def gcContentCalc(start, end, sequence, genome_array):
+def gcContentCalc(start, end, sequence, annotation_track, gc_index, whole_genome):
+    #Positions of the sequence in the genome. When start > end the sequence contemplate the circular genome, going from the final position to the first one
+    positions=circularPositions(start, end, annotation_track.genome_size)
+    region_size=positions.size
+    seq_codes=np.frombuffer(sequence.encode("latin-1"), dtype=np.uint8)[:region_size]
+    positions=positions[:seq_codes.size]
+    #Check which nucleotides of the sequence are part of coding region
+    coding=gc_index.coding[positions]
     #seq_cds store the sequence of nucleotides that are part of the coding region. Those nucleotides that are not part of the coding region are replaced by '-'
-    seq_cds=""
-    #sum_GC_nc store the sum of GC nucleotides in the sequence
-    sum_GC_nc=0
-    #sum_GC_nc_cds store the sum of GC nucleotides that are part of coding region in the sequence
-    sum_GC_nc_cds=0
-    #sum_nc_cds store the sum of ALL nucleotides that are part of coding region in the sequence
-    sum_nc_cds=0
-    #For every nucleotide in the sequence we do a while loop which comtemplate the circular genome
-    #Here we have a sequence of interest being compared and saved on seq_cds, because of this we have a second iterator
-    i=start
-    seq_it=0
-    while True:
-        if (checkCG(sequence[seq_it])):
-            sum_GC_nc=sum_GC_nc+1
-            #Check if nucleotide is part of coding region
-            #uORFs nucleotides adds +10 to genome_array and gene coding regions derived form cds file adds +1
-            #So we get the remainder of division by 10
-            if (genome_array[i]%10>0):
-                sum_GC_nc_cds= sum_GC_nc_cds+1
-                sum_nc_cds=sum_nc_cds+1
-                #Add nucleotide to seq_cds
-                seq_cds=seq_cds+sequence[seq_it]
-            else:
-                seq_cds=seq_cds+'-'
-        elif (genome_array[i]%10>0):
-                sum_nc_cds=sum_nc_cds+1
-                #Add nucleotide to seq_cds
-                seq_cds=seq_cds+sequence[seq_it]
-        else:
-            seq_cds=seq_cds+'-'
-        #Adding +10 to genome_array will help later check where are the nucleotides that belong to uORFs in csv file
-        #Values greater than or equal 10
-        genome_array[i]=genome_array[i]+10
-        if (i==end):
-            break
-        i=i+1
-        seq_it=seq_it+1
-        #Check if 'i' it is the final position of genome and point to the first one
-        if (i>len(genome_array)-1):
-            i=1
-    tam_seq=len(sequence)
+    seq_cds=np.where(coding, seq_codes, ord("-")).astype(np.uint8).tobytes().decode("latin-1")
+    if (positions.size==region_size and np.array_equal(whole_genome.codes()[positions], seq_codes)):
+        #When the sequence is the same of the genome, the sums come straight from gc_index
+        sum_GC_nc, sum_nc_cds, sum_GC_nc_cds=gc_index.query(start, end)
+    else:
+        #Otherwise they are counted in the sequence itself
+        gc=gcMask(seq_codes)
+        #sum_GC_nc store the sum of GC nucleotides in the sequence
+        sum_GC_nc=int(np.count_nonzero(gc))
+        #sum_GC_nc_cds store the sum of GC nucleotides that are part of coding region in the sequence
+        sum_GC_nc_cds=int(np.count_nonzero(gc & coding))
+        #sum_nc_cds store the sum of ALL nucleotides that are part of coding region in the sequence
+        sum_nc_cds=int(np.count_nonzero(coding))
+    #Adding +1 to the uORF plane will help later check where are the nucleotides that belong to uORFs in csv file (values greater than or equal 10)
+    annotation_track.addPositions("uORF", positions)
     #The next command line returns: proportion of GC nucleotides in the sequence
     #Nucleotides in coding region of the sequence
     #Total of GC nucleotides in the sequence
@@ -162,30 +209,25 @@ def gcContentCalc(start, end, sequence, genome_array):
 #This function read the whole genome from fasta file
 def readWholeGenome(fasta_file):
     #The position 0 of whole_genome will not be used
-    whole_genome=" "
-    for line in fasta_file:
-        if(line[0]!=">"):
-            line=line.upper()
-            whole_genome=whole_genome+line.strip()
+    #When the fasta file was converted by packedGenome.py, the genome is decoded from the '.pack' file instead
+    whole_genome=readPackedOrFasta(fasta_file)
     fasta_file.close()
     return whole_genome
 
 #Funtion that prints and save on output file the individual ORFs results
-def printSaveuORFsResults(name_ORF,seq_ORF,sum_ORF_cds,start_ORF,end_ORF,ratio_GC_ORF,ratio_GC_ORF_cds,output_gct_file):
-    print("____________________________________________________________")
-    print(name_ORF)
-    print("uORf original sequence:\n"+seq_ORF+"\nuORF sequence in CDS:\n"+sum_ORF_cds)
-    print(start_ORF, end_ORF)
-    print("GC Content of Orf:",round(ratio_GC_ORF,2))
-    print("GC Content of Orf in CDS:",round(ratio_GC_ORF_cds,2))
-    output_gct_file.write(name_ORF)
-    output_gct_file.write(str(start_ORF)+","+str(end_ORF)+"\n")
-    output_gct_file.write("uORf original sequence:\n"+seq_ORF.rstrip()+"\nuORF sequence in CDS:\n"+sum_ORF_cds+"\n")
-    output_gct_file.write("Conteudo GC Orf: "+str(round(ratio_GC_ORF,2))+"\nConteudo GC Orf CDS: "+str(round(ratio_GC_ORF_cds,2))+"\n\n")
-
-#Function that reads the uORFs file and calculate GC content for each one of the ORFs listed in it. Summary variables are returned as result.
-def uORFsFileGCCalc(uORFs_file, genome_array, output_gct_file):
-    name_ORF=""
+#Each uORF is printed and saved with a single call. With quiet=True (option --quiet) nothing is printed and with output_gct_file=None (option --no-gct) nothing is saved
+def printSaveuORFsResults(name_ORF,seq_ORF,sum_ORF_cds,start_ORF,end_ORF,ratio_GC_ORF,ratio_GC_ORF_cds,output_gct_file,quiet=False):
+    if (not quiet):
+        print("____________________________________________________________\n"+name_ORF+"\nuORf original sequence:\n"+seq_ORF+"\nuORF sequence in CDS:\n"+sum_ORF_cds+"\n" \
+            +str(start_ORF)+" "+str(end_ORF)+"\nGC Content of Orf: "+str(round(ratio_GC_ORF,2))+"\nGC Content of Orf in CDS: "+str(round(ratio_GC_ORF_cds,2)))
+    if (output_gct_file is not None):
+        output_gct_file.write(name_ORF+str(start_ORF)+","+str(end_ORF)+"\nuORf original sequence:\n"+seq_ORF.rstrip()+"\nuORF sequence in CDS:\n"+sum_ORF_cds+"\n" \
+            +"Conteudo GC Orf: "+str(round(ratio_GC_ORF,2))+"\nConteudo GC Orf CDS: "+str(round(ratio_GC_ORF_cds,2))+"\n\n")
+
+#Function that calculate GC content for each one of the ORFs listed in the uORFs file (read by genomeBundle.readuORFsRecords). Summary variables are returned as result.
+#The values of each uORF are also added to results_writer (resultsWriter.py, option --results), when it is given
+#With uORFs_state (uORFsState.py, option --incremental), the uORFs of the previous run are not computed again and the removed ones leave the uORF plane
+def uORFsFileGCCalc(uORFs, annotation_track, gc_index, whole_genome, output_gct_file, metrics=NO_METRICS, quiet=False, results_writer=None, uORFs_state=None):
     #Total number of GC ORFs nucleotides
     sum_nc_GC_ORFs=0
     #Total number of GC ORFs nucleotides that are part of coding regions
@@ -194,44 +236,60 @@ def uORFsFileGCCalc(uORFs_file, genome_array, output_gct_file):
     sum_nc_ORFs=0
     #Total number of ORFs nucleotides in coding regions
     sum_nc_ORFs_cds=0
-    for line in uORFs_file:
-        if (line.find(">")!=-1):
-            name_ORF=line[1:]
-        elif (line.find("+")!=-1):
-            start_ORF=int(line[1:])
-        elif (line.find("-")!=-1):
-            end_ORF=int(line[1:])
-        elif (line.find("@")!=-1):
-            seq_ORF=line[1:].upper().strip()
-            size_ORF=len(seq_ORF)
-            #Call function that calculate GC Content and update genome_array
-            sum_ORF_cds, sum_GC_ORF_nc, sum_GC_ORF_nc_cds, sum_ORF_nc_cds=gcContentCalc(start_ORF, end_ORF, seq_ORF, genome_array)
-
-            #Ratio_GC_ORF shows the proportion of GC nucleotides of the sequence
-            ratio_GC_ORF=sum_GC_ORF_nc/len(seq_ORF)*100
-
-            #Ratio_GC_ORF_cds shows the proportion of GC nucleotides in the coding region of the sequence
-            ratio_GC_ORF_cds=0
-            #Check to avoid division by 0
-            if (sum_ORF_nc_cds>0):
-                ratio_GC_ORF_cds=sum_GC_ORF_nc_cds/sum_ORF_nc_cds*100
-            else:
-                ratio_GC_ORF_cds=sum_GC_ORF_nc_cds/1*100
-            #Print and save in output files the ORF values
-            printSaveuORFsResults(name_ORF, seq_ORF, sum_ORF_cds, start_ORF, end_ORF, ratio_GC_ORF, ratio_GC_ORF_cds, output_gct_file)
-
-            sum_nc_GC_ORFs=sum_nc_GC_ORFs + sum_GC_ORF_nc
-            sum_nc_GC_ORFs_cds=sum_nc_GC_ORFs_cds + sum_GC_ORF_nc_cds
-            sum_nc_ORFs=sum_nc_ORFs+size_ORF
-            sum_nc_ORFs_cds=sum_nc_ORFs_cds+sum_ORF_nc_cds
+    for uORF in uORFs:
+        name_ORF, start_ORF, end_ORF, seq_ORF=uORF
+        size_ORF=len(seq_ORF)
+        values=None if uORFs_state is None else uORFs_state.reuse(uORF)
+        if (values is None):
+            #Call function that calculate GC Content and update the annotation track
+            values=gcContentCalc(start_ORF, end_ORF, seq_ORF, annotation_track, gc_index, whole_genome)
+            if (uORFs_state is not None):
+                uORFs_state.add(uORF, values)
+        sum_ORF_cds, sum_GC_ORF_nc, sum_GC_ORF_nc_cds, sum_ORF_nc_cds=values
+
+        #Ratio_GC_ORF shows the proportion of GC nucleotides of the sequence
+        ratio_GC_ORF=sum_GC_ORF_nc/len(seq_ORF)*100
+
+        #Ratio_GC_ORF_cds shows the proportion of GC nucleotides in the coding region of the sequence
+        ratio_GC_ORF_cds=0
+        #Check to avoid division by 0
+        if (sum_ORF_nc_cds>0):
+            ratio_GC_ORF_cds=sum_GC_ORF_nc_cds/sum_ORF_nc_cds*100
+        else:
+            ratio_GC_ORF_cds=sum_GC_ORF_nc_cds/1*100
+        #Print and save in output files the ORF values
+        with metrics.stage("output_writing"):
+            printSaveuORFsResults(name_ORF, seq_ORF, sum_ORF_cds, start_ORF, end_ORF, ratio_GC_ORF, ratio_GC_ORF_cds, output_gct_file, quiet)
+            if (results_writer is not None):
+                results_writer.write(name_ORF.strip(), start_ORF, end_ORF, size_ORF, sum_GC_ORF_nc, round(ratio_GC_ORF,2), sum_ORF_nc_cds, sum_GC_ORF_nc_cds, \
+                    round(ratio_GC_ORF_cds,2), seq_ORF.rstrip(), sum_ORF_cds)
+
+        sum_nc_GC_ORFs=sum_nc_GC_ORFs + sum_GC_ORF_nc
+        sum_nc_GC_ORFs_cds=sum_nc_GC_ORFs_cds + sum_GC_ORF_nc_cds
+        sum_nc_ORFs=sum_nc_ORFs+size_ORF
+        sum_nc_ORFs_cds=sum_nc_ORFs_cds+sum_ORF_nc_cds
+
+    if (uORFs_state is not None):
+        uORFs_state.removeStale(annotation_track)
 
     #Return summary values
     return sum_nc_GC_ORFs,sum_nc_GC_ORFs_cds,sum_nc_ORFs,sum_nc_ORFs_cds,sum_nc_ORFs-sum_nc_ORFs_cds
 
+#Returns the final summary results as a dictionary
+def finalSummary(genome_size, sum_nc_genome_cds, sum_nc_genome_noncod, sum_GC_nc, sum_GC_nc_cds, sum_GC_nc_noncod, sum_nc_ORFs, sum_nc_GC_ORFs, sum_nc_ORFs_cds, \
+     sum_nc_GC_ORFs_cds, sum_nc_ORFs_noncod):
+    return {"genome_size":genome_size, "cds_size":sum_nc_genome_cds, "noncod_size":sum_nc_genome_noncod, "gc":sum_GC_nc, "gc_cds":sum_GC_nc_cds, \
+        "gc_noncod":sum_GC_nc_noncod, "uORFs_size":sum_nc_ORFs, "uORFs_gc":sum_nc_GC_ORFs, "uORFs_cds_size":sum_nc_ORFs_cds, "uORFs_gc_cds":sum_nc_GC_ORFs_cds, \
+        "uORFs_noncod_size":sum_nc_ORFs_noncod, "uORFs_gc_noncod":sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds}
+
 #Print and saves on input file the final summary results
 def printSaveFinalSummary(genome_size, sum_nc_genome_cds, sum_nc_genome_noncod, sum_GC_nc, sum_GC_nc_cds, sum_GC_nc_noncod, sum_nc_ORFs, sum_nc_GC_ORFs, sum_nc_ORFs_cds, \
      sum_nc_GC_ORFs_cds, sum_nc_ORFs_noncod, output_gct_file):
 
+    #The summary values are also returned, so batch runs can put the summaries of all genomes in a single table
+    summary=finalSummary(genome_size, sum_nc_genome_cds, sum_nc_genome_noncod, sum_GC_nc, sum_GC_nc_cds, sum_GC_nc_noncod, sum_nc_ORFs, sum_nc_GC_ORFs, sum_nc_ORFs_cds, \
+        sum_nc_GC_ORFs_cds, sum_nc_ORFs_noncod)
+
     print("____________________________________________________________")
     print("\n")
     print("------------------------------------------------------------------------------------------------------------------------------------")
@@ -253,87 +311,244 @@ def printSaveFinalSummary(genome_size, sum_nc_genome_cds, sum_nc_genome_noncod,
         print("uORFs GC content in non coding regions (NC) = " +str(sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_noncod) + " nucleotides (0%)")
     print("------------------------------------------------------------------------------------------------------------------------------------")
 
-    output_gct_file.write("\n")
-    output_gct_file.write("------------------------------------------------------------------------------------------------------------------------------------\n")
-    output_gct_file.write("Whole genome total size = "+str(genome_size)+" nucleotides, where "+ str(sum_nc_genome_cds)+" nucleotides ("+str(round(sum_nc_genome_cds/genome_size*100,2)) \
-        +"%) belongs to coding regions (CDS) and "+ str(sum_nc_genome_noncod)+" nucleotides ("+str(round(sum_nc_genome_noncod/genome_size*100,2))+"%) belongs to non coding regions (NC)\n")
-    output_gct_file.write("Whole genome GC content = "+str(sum_GC_nc)+" of "+str(genome_size)+" nucleotides ("+str(round(sum_GC_nc/genome_size*100,2))+"%)\n")
-    output_gct_file.write("GC content in coding regions = "+str(sum_GC_nc_cds)+" of "+str(sum_nc_genome_cds)+" nucleotides ("+str(round(sum_GC_nc_cds/sum_nc_genome_cds*100,2))+"%)\n")
-    output_gct_file.write("GC content in non coding regions = "+str(sum_GC_nc_noncod)+" of "+str(sum_nc_genome_noncod)+" nucleotides (" +str(round(sum_GC_nc_noncod/sum_nc_genome_noncod*100,2))+"%)\n")         
-    output_gct_file.write("uORFs total size = "+ str(sum_nc_ORFs) + " nucleotides, corresponding to " + str(round(sum_nc_ORFs/genome_size*100,2))+ "% "+"of whole genome\n")
-    output_gct_file.write("uORfs GC content = " +str(sum_nc_GC_ORFs)+" of "+str(sum_nc_ORFs)+" nucleotides ("+str(round(sum_nc_GC_ORFs/sum_nc_ORFs*100,2))+"%)\n")
-    output_gct_file.write("uORFs total size in coding regions (CDS) = "+ str(sum_nc_ORFs_cds) + " of "+ str(sum_nc_ORFs)+" nucleotides ("+str(round(sum_nc_ORFs_cds/sum_nc_ORFs*100,2))+"%)\n")
-    output_gct_file.write("uORFs total size in non coding regions (NC) = "+ str(sum_nc_ORFs_noncod) + " of "+ str(sum_nc_ORFs)+" nucleotides ("+str(round(sum_nc_ORFs_noncod/sum_nc_ORFs*100,2))+"%)\n")
-    output_gct_file.write("uORFs GC content in coding regions (CDS) = " +str(sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_cds) + " nucleotides ("+ str(round(sum_nc_GC_ORFs_cds/sum_nc_ORFs_cds*100,2))+"%)\n")
-    #Avoid division by 0
-    if (sum_nc_ORFs_noncod!=0):
-        output_gct_file.write("uORFs GC content in non coding regions (NC) = " +str(sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_noncod) + " nucleotides ("+ \
-        str(round((sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)/(sum_nc_ORFs_noncod)*100,2))+"%)\n")
-    else:
-        output_gct_file.write("uORFs GC content in non coding regions (NC) = " +str(sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_noncod) + " nucleotides (0%)\n")
-    output_gct_file.write("------------------------------------------------------------------------------------------------------------------------------------\n")
+    if (output_gct_file is not None):
+        output_gct_file.write("\n")
+        output_gct_file.write("------------------------------------------------------------------------------------------------------------------------------------\n")
+        output_gct_file.write("Whole genome total size = "+str(genome_size)+" nucleotides, where "+ str(sum_nc_genome_cds)+" nucleotides ("+str(round(sum_nc_genome_cds/genome_size*100,2)) \
+            +"%) belongs to coding regions (CDS) and "+ str(sum_nc_genome_noncod)+" nucleotides ("+str(round(sum_nc_genome_noncod/genome_size*100,2))+"%) belongs to non coding regions (NC)\n")
+        output_gct_file.write("Whole genome GC content = "+str(sum_GC_nc)+" of "+str(genome_size)+" nucleotides ("+str(round(sum_GC_nc/genome_size*100,2))+"%)\n")
+        output_gct_file.write("GC content in coding regions = "+str(sum_GC_nc_cds)+" of "+str(sum_nc_genome_cds)+" nucleotides ("+str(round(sum_GC_nc_cds/sum_nc_genome_cds*100,2))+"%)\n")
+        output_gct_file.write("GC content in non coding regions = "+str(sum_GC_nc_noncod)+" of "+str(sum_nc_genome_noncod)+" nucleotides (" +str(round(sum_GC_nc_noncod/sum_nc_genome_noncod*100,2))+"%)\n")         
+        output_gct_file.write("uORFs total size = "+ str(sum_nc_ORFs) + " nucleotides, corresponding to " + str(round(sum_nc_ORFs/genome_size*100,2))+ "% "+"of whole genome\n")
+        output_gct_file.write("uORfs GC content = " +str(sum_nc_GC_ORFs)+" of "+str(sum_nc_ORFs)+" nucleotides ("+str(round(sum_nc_GC_ORFs/sum_nc_ORFs*100,2))+"%)\n")
+        output_gct_file.write("uORFs total size in coding regions (CDS) = "+ str(sum_nc_ORFs_cds) + " of "+ str(sum_nc_ORFs)+" nucleotides ("+str(round(sum_nc_ORFs_cds/sum_nc_ORFs*100,2))+"%)\n")
+        output_gct_file.write("uORFs total size in non coding regions (NC) = "+ str(sum_nc_ORFs_noncod) + " of "+ str(sum_nc_ORFs)+" nucleotides ("+str(round(sum_nc_ORFs_noncod/sum_nc_ORFs*100,2))+"%)\n")
+        output_gct_file.write("uORFs GC content in coding regions (CDS) = " +str(sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_cds) + " nucleotides ("+ str(round(sum_nc_GC_ORFs_cds/sum_nc_ORFs_cds*100,2))+"%)\n")
+        #Avoid division by 0
+        if (sum_nc_ORFs_noncod!=0):
+            output_gct_file.write("uORFs GC content in non coding regions (NC) = " +str(sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_noncod) + " nucleotides ("+ \
+            str(round((sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)/(sum_nc_ORFs_noncod)*100,2))+"%)\n")
+        else:
+            output_gct_file.write("uORFs GC content in non coding regions (NC) = " +str(sum_nc_GC_ORFs-sum_nc_GC_ORFs_cds)+" of "+str(sum_nc_ORFs_noncod) + " nucleotides (0%)\n")
+        output_gct_file.write("------------------------------------------------------------------------------------------------------------------------------------\n")
+
+    return summary
 
 #Calculate GC content in whole Genome
-def wholeGenomeGCCalc(output_csv_file,output_gct_file,whole_genome, genome_array):
+def wholeGenomeGCCalc(output_file_name,output_gct_file,gc_index, annotation_track, track_format="csv", metrics=NO_METRICS):
+    from trackWriter import writeTrack
+    #The values of every nucleotide (genes + 10 x uORFs) are saved in the track file (csv, bedgraph, npy or npz), written in bulk
+    with metrics.stage("output_writing"):
+        writeTrack(output_file_name, annotation_track.legacyArray(), track_format, path.basename(output_file_name))
+
+    #Total of GC nucleotides in the whole genome
     #Total of nucleotides in the whole genome that belongs to coding regions
-    sum_nc_genome_cds=0
-    #Total of nucleotides in the whole genome that belongs to non coding regions
-    sum_nc_genome_noncod=0
     #Total of GC nucleotides in the whole genome that belongs to coding regions
-    sum_GC_nc_cds=0
-    #Total of GC nucleotides in the whole genome
-    sum_GC_nc=0
-
-    for i in range(1,len(genome_array)):
-        output_csv_file.write(str(genome_array[i])+"\n")
-        if (checkCG(whole_genome[i])):
-            sum_GC_nc=sum_GC_nc+1
-            #Check if nucleotide is part of coding region
-            #uORFs nucleotides adds +10 to genome_array and gene coding regions derived form cds file adds +1
-            #So we get the remainder of division by 10
-            if (genome_array[i]%10>0):
-                sum_GC_nc_cds= sum_GC_nc_cds+1
-                sum_nc_genome_cds=sum_nc_genome_cds+1
-        elif (genome_array[i]%10>0):
-                sum_nc_genome_cds=sum_nc_genome_cds+1
+    sum_GC_nc, sum_nc_genome_cds, sum_GC_nc_cds=gc_index.totals()
 
     return sum_nc_genome_cds, sum_GC_nc_cds, sum_GC_nc
 
 
-def main():
-
-    uORFs_file,cds_file,fasta_file,output_gct_file,output_csv_file =checkInputFiles()
-
-    #Call function that reads data from 'cds' file, creating genome_array
-    genome_size,genome_array = createGenomeArray(cds_file)
+#This function runs all the calculations for one genome and returns its final summary
+#The stages are measured by metrics (stageMetrics.py), started and finished by the caller
+#report_options (reportOptions) has the options --quiet, --results and --no-gct. With incremental=True the state of the uORFs file is used and saved
+def processGenome(uORFs_file_name, cds_file_name, fasta_file_name, track_format="csv", use_bundle=False, metrics=NO_METRICS, report_options={}, incremental=False):
+    from trackWriter import trackFileName
+
+    output_gct_file=None
+    results_writer=None
+    try:
+        with metrics.stage("output_writing"):
+            output_gct_file,output_file_name =openGenomeFiles(uORFs_file_name, report_options.get("gct", True))
+            if (report_options.get("results") is not None):
+                from resultsWriter import ResultsWriter
+                results_writer=ResultsWriter(output_file_name, report_options["results"])
+
+        #Call function that reads the whole genome, the annotation track (genes of the 'cds' file) and the uORFs
+        uORFs_state=None
+        if (incremental):
+            whole_genome, genome_size, annotation_track, uORFs, uORFs_state=readIncrementalGenomeData(uORFs_file_name, cds_file_name, fasta_file_name, metrics)
+        else:
+            whole_genome, genome_size, annotation_track, uORFs=readGenomeData(uORFs_file_name, cds_file_name, fasta_file_name, use_bundle, metrics)
 
-    #Call function to read whole genome from fasta file
-    whole_genome=readWholeGenome(fasta_file)
+        #Call function that counts, once for the whole genome, the GC and coding nucleotides used by the uORFs and whole genome calculations
+        with metrics.stage("array_construction"):
+            gc_index=buildGCIndex(whole_genome, annotation_track.count("gene"))
 
-    #Call function to calculate GC Content of uORfs
-    sum_nc_GC_ORFs, sum_nc_GC_ORFs_cds, sum_nc_ORFs, sum_nc_ORFs_cds,sum_size_uorfs_noncod=uORFsFileGCCalc(uORFs_file,genome_array,output_gct_file)
+        #Call function to calculate GC Content of uORfs
+        with metrics.stage("uORF_pass"):
+            sum_nc_GC_ORFs, sum_nc_GC_ORFs_cds, sum_nc_ORFs, sum_nc_ORFs_cds,sum_size_uorfs_noncod=uORFsFileGCCalc(uORFs,annotation_track,gc_index,whole_genome,output_gct_file,metrics, \
+                report_options.get("quiet", False), results_writer, uORFs_state)
 
-    #Call function to calculate GC Content of whole genome
-    sum_nc_genome_cds, sum_GC_nc_cds, sum_GC_nc=wholeGenomeGCCalc(output_csv_file,output_gct_file, whole_genome, genome_array)
-    sum_nc_genome_noncod=genome_size-sum_nc_genome_cds
-    sum_GC_nc_noncod=sum_GC_nc-sum_GC_nc_cds
+        #Call function to calculate GC Content of whole genome
+        with metrics.stage("whole_genome_pass"):
+            sum_nc_genome_cds, sum_GC_nc_cds, sum_GC_nc=wholeGenomeGCCalc(output_file_name,output_gct_file, gc_index, annotation_track, track_format, metrics)
+        sum_nc_genome_noncod=genome_size-sum_nc_genome_cds
+        sum_GC_nc_noncod=sum_GC_nc-sum_GC_nc_cds
 
-    #Calculate number of ORFs nucleotides in non coding regions
-    sum_nc_ORFs_noncod=sum_nc_ORFs-sum_nc_ORFs_cds
+        #Calculate number of ORFs nucleotides in non coding regions
+        sum_nc_ORFs_noncod=sum_nc_ORFs-sum_nc_ORFs_cds
     
-    #Print final summary
-    printSaveFinalSummary(genome_size, sum_nc_genome_cds, sum_nc_genome_noncod, sum_GC_nc, sum_GC_nc_cds, sum_GC_nc_noncod, sum_nc_ORFs, sum_nc_GC_ORFs, sum_nc_ORFs_cds, \
-sum_nc_GC_ORFs_cds, sum_nc_ORFs_noncod, output_gct_file)
+        with metrics.stage("output_writing"):
+            #Print final summary
+            summary=printSaveFinalSummary(genome_size, sum_nc_genome_cds, sum_nc_genome_noncod, sum_GC_nc, sum_GC_nc_cds, sum_GC_nc_noncod, sum_nc_ORFs, sum_nc_GC_ORFs, sum_nc_ORFs_cds, \
+    sum_nc_GC_ORFs_cds, sum_nc_ORFs_noncod, output_gct_file)
+
+            result_file_names=[trackFileName(output_file_name, track_format)]
+            if (results_writer is not None):
+                result_file_names=results_writer.close(summary)+result_file_names
+            if (output_gct_file is not None):
+                result_file_names=[output_gct_file.name]+result_file_names
+                output_gct_file.close()
+            if (uORFs_state is not None):
+                from uORFsState import STATE_EXTENSION
+                uORFs_state.save(uORFs_file_name+STATE_EXTENSION, annotation_track)
+                reused_uORFs, computed_uORFs=uORFs_state.counts()
+                print("\nuORFs reused from "+uORFs_file_name+STATE_EXTENSION+": "+str(reused_uORFs)+", computed: "+str(computed_uORFs))
+
+            print("\n\n____________________________________________________________")
+            print("\n\nResults saved in: "+", ".join(result_file_names[:-1])+(" e " if len(result_file_names)>1 else "")+result_file_names[-1]+"\n")
+            print("____________________________________________________________\n\n\n")
+    except BaseException:
+        #The result files still open are incomplete, so they are removed instead of being left as the results of the genome
+        discardGenomeFiles(output_gct_file, results_writer)
+        raise
+
+    return summary
+
+#This function reads the genomes of a batch. batch_name can be a manifest file or a folder
+#The manifest has one genome per line with the uORFs, cds and fasta file names separated by tab. Relative names are relative to the manifest folder
+#Empty lines and lines starting with '#' are skipped
+#In a folder, every subfolder (and the folder itself) with exactly one '.uORFs', one '.cds' and one '.fasta' file is a genome
+def readBatchGenomes(batch_name):
+    genomes=[]
+    if (path.isdir(batch_name)):
+        folders=[path.normpath(batch_name)]+sorted([path.normpath(path.join(batch_name,folder)) for folder in os.listdir(batch_name) if path.isdir(path.join(batch_name,folder))])
+        for folder in folders:
+            genome_files=[]
+            for extension in (".uORFs",".cds",".fasta"):
+                genome_files.append([path.join(folder,file_name) for file_name in sorted(os.listdir(folder)) if file_name.endswith(extension)])
+            if (all(len(file_names)==1 for file_names in genome_files)):
+                genomes.append(tuple(file_names[0] for file_names in genome_files))
+    else:
+        manifest_folder=path.dirname(batch_name)
+        with open(batch_name,'r') as manifest_file:
+            for line in manifest_file:
+                if (line.strip()=="" or line.startswith("#")):
+                    continue
+                values=line.rstrip("\r\n").split("\t")
+                if (len(values)!=3):
+                    raise ValueError("Manifest line must have 3 file names separated by tab: "+line.strip())
+                genomes.append(tuple(path.normpath(path.join(manifest_folder,value.strip())) for value in values))
+    return genomes
+
+#This function runs a genome of a batch in a worker process. The console output of the genome is discarded
+#Errors do not stop the batch, they are returned and saved in the summary table
+#metrics_options (stageMetrics.batchMetricsOptions) turns on the metrics and profile files of the genome, named after its result files
+#The results of each uORF are not printed (quiet), since the console output is discarded
+def processBatchGenome(genome_files, track_format="csv", use_bundle=False, metrics_options={}, report_options={}, incremental=False):
+    import contextlib
+    from stageMetrics import metricsFromOptions
+    try:
+        metrics=metricsFromOptions(metrics_options, getOutputFileName(genome_files[0])+".gct")
+        metrics.start()
+        try:
+            with open(os.devnull,'w') as null_output, contextlib.redirect_stdout(null_output):
+                return genome_files, processGenome(*genome_files, track_format=track_format, use_bundle=use_bundle, metrics=metrics, \
+                    report_options=dict(report_options, quiet=True), incremental=incremental), ""
+        finally:
+            metrics.finish({"files":list(genome_files)})
+    except Exception as error:
+        return genome_files, None, type(error).__name__+": "+str(error)
+
+#This function runs all genomes of a batch in a pool of worker processes and saves the summaries of all genomes in a single tab separated table
+#Returns the name of the table
+def runBatch(batch_name, workers, track_format="csv", use_bundle=False, metrics_options={}, report_options={}, incremental=False):
+    import concurrent.futures
+    genomes=readBatchGenomes(batch_name)
+    if (path.isdir(batch_name)):
+        summary_file_name=path.join(batch_name,"batch_summary.tsv")
+    else:
+        summary_file_name=path.splitext(batch_name)[0]+"_summary.tsv"
+
+    columns=None
+    rows=[]
+    error_genomes=""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for genome_files, summary, error in executor.map(processBatchGenome, genomes, [track_format]*len(genomes), [use_bundle]*len(genomes), [metrics_options]*len(genomes), \
+            [report_options]*len(genomes), [incremental]*len(genomes)):
+            print(genome_files[0]+(" - "+error if error!="" else ""))
+            if (summary is not None and columns is None):
+                columns=list(summary)
+            rows.append((genome_files, summary, error))
+            if (error!=""):
+                error_genomes=error_genomes+genome_files[0]+"\n"
+
+    if (columns is None):
+        columns=[]
+    with open(summary_file_name,'w') as summary_file:
+        summary_file.write("\t".join(["genome","uORFs_file","cds_file","fasta_file"]+columns+["error"])+"\n")
+        for genome_files, summary, error in rows:
+            values=[summary[column] if summary is not None else "" for column in columns]
+            summary_file.write("\t".join([getOutputFileName(genome_files[0])]+list(genome_files)+[str(value) for value in values]+[error])+"\n")
 
     print("\n\n____________________________________________________________")
-    print("\n\nResults saved in: "+str(output_gct_file.name)+" e "+str(output_csv_file.name)+"\n")
+    print("\n\n"+str(len(genomes))+" genomes processed. Summary saved in: "+summary_file_name+"\n")
+    if (len(error_genomes)>0):
+        print("\nThe following genomes returned an error:\n"+error_genomes)
     print("____________________________________________________________\n\n\n")
-
-    uORFs_file.close()
-    cds_file.close()
-    output_csv_file.close()
-    output_gct_file.close()
+    return summary_file_name
+
+#This function returns the report options of processGenome (--quiet, --results=tsv|jsonl and --no-gct), or None when an option is not valid
+def reportOptions(options):
+    results_format=options.get("results")
+    if (results_format is not None):
+        from resultsWriter import RESULTS_FORMATS
+        if (results_format not in RESULTS_FORMATS):
+            return None
+    if (options.get("quiet", True) is not True or options.get("no-gct", True) is not True):
+        return None
+    return {"quiet":"quiet" in options, "results":results_format, "gct":"no-gct" not in options}
+
+#The calculations run in mitogenomesApi.py (runuORFsGCContent and runuORFsGCContentBatch), which imports the modules of each option only when it is given
+def main():
+    import mitogenomesApi
+
+    arguments, options=splitOptions(sys.argv[1:])
+    track_format=options.get("track-format", "csv")
+    use_bundle=options.get("bundle") is True
+    incremental=options.get("incremental") is True
+    report_options=reportOptions(options)
+    if (hasUnknownOptions(options, ("track-format","bundle","metrics","profile","quiet","results","no-gct","incremental","batch","workers")) \
+        or options.get("bundle", True) is not True or options.get("incremental", True) is not True or report_options is None or (use_bundle and incremental)):
+        printUsage()
+    if ("track-format" in options):
+        from trackWriter import TRACK_FORMATS
+        if (track_format not in TRACK_FORMATS):
+            printUsage()
+
+    if ("batch" in options):
+        #Check the batch manifest/folder and the number of workers (default: number of CPUs)
+        workers=intOption(options, "workers", os.cpu_count() or 1)
+        if (options["batch"] is True or len(arguments)>0 or workers is None):
+            printUsage()
+        if (path.exists(options["batch"])==False):
+            print("\n--------------------------------------------------------------------------------------------\n")
+            print("\nManifest file or folder not found! Check the path and file name.\n")
+            print("\n--------------------------------------------------------------------------------------------\n")
+            exit(0)
+        #A malformed manifest line (readBatchGenomes) ends the run with its message, as a missing manifest
+        try:
+            mitogenomesApi.runuORFsGCContentBatch(options["batch"], workers, track_format, use_bundle, incremental, report_options["results"], report_options["gct"], options)
+        except ValueError as error:
+            print("\n--------------------------------------------------------------------------------------------\n")
+            print("\n"+str(error)+"\n")
+            print("\n--------------------------------------------------------------------------------------------\n")
+            exit(0)
+    else:
+        uORFs_file_name, cds_file_name, fasta_file_name=checkInputFiles(arguments)
+        mitogenomesApi.runuORFsGCContent(uORFs_file_name, cds_file_name, fasta_file_name, track_format, use_bundle, incremental, report_options["quiet"], \
+            report_options["results"], report_options["gct"], options)
 
 if __name__ == '__main__':
     main()
-
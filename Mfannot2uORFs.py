@@ -16,19 +16,29 @@
 
 import sys
 import os.path
+import itertools
 from os import path
+from commandLine import splitOptions, hasUnknownOptions
+from stageMetrics import NO_METRICS
 
 
 #Function to check if files are OK
-def checkMfannotFile():
+#The first line of the file is checked when it is read (saveuORFs, or iterMfannotRecords with the option --split)
+def checkMfannotFile(arguments):
     #Check if all the necessary files names are passed as arguments
-    if (len(sys.argv)!=2):
+    if (len(arguments)!=1):
         print("\n--------------------------------------------------------------------------------------------\n")
-        print ("\nUsage:\npython Mfannot2uORFs.py [file_path_name]")
+        print ("\nUsage:\npython Mfannot2uORFs.py [file_path_name] [--split] [--metrics[=file.json]] [--profile[=file.prof]]")
+        print ("\nWith --split, the file can have several sequences (e.g. the Mfannot output of a batch of genomes in a single file). It is read once,")
+        print ("line by line, and the uORFs of each sequence are saved in their own file, named after the whole sequence name ('[sequence name].uORFs',")
+        print ("e.g. NC_012345.1.uORFs, as the files of getGffFastaFilesNCBI.py). A sequence name found again gets a suffix ('[sequence name]_2.uORFs')")
+        print ("Without --split, the uORFs file is named after the Mfannot file name up to its first '.' (NC_012345.1.new gives NC_012345.uORFs)")
+        print ("\n--metrics saves the wall time, CPU time and peak memory of each stage (input parsing, uORF pass and output writing) in a JSON file")
+        print ("('.uORFs.metrics.json') and --profile saves a cProfile dump ('.uORFs.prof')")
         print("\n--------------------------------------------------------------------------------------------\n")
         sys.exit(0)
 
-    mfannot_file_name=sys.argv[1]
+    mfannot_file_name=arguments[0]
 
     #Check if path/files exists
     if (path.exists(mfannot_file_name)==False):
@@ -37,27 +47,14 @@ def checkMfannotFile():
         print("\n--------------------------------------------------------------------------------------------\n")
         exit(0)
 
-    #Open input file
-    input_file=open(mfannot_file_name,'r') 
+    return mfannot_file_name
 
-    #Check if input file is a Mfannot
-    if (input_file.readline().find("mfannot")==-1):
-        print("\nThe file is empty or is not a mfannot output file\n")
-        input_file.close()
-        exit(0)
-
-    #Get ID specie from Mfannot file name
+#Get ID specie from Mfannot file name, to name the uORFs output file (without the '.uORFs' extension)
+def getOutputFileName(mfannot_file_name):
     #The strip will remove '.\' that appear on console in Windows 10 before path\filename 
     if (os.name=="nt"):
         mfannot_file_name=mfannot_file_name.strip(".\\")
-    output_file_name=mfannot_file_name[0:mfannot_file_name.find(".")]
-    print(mfannot_file_name)
-    print(output_file_name)
-
-    #Open uORFs output file
-    output_file=open(output_file_name+".uORFs",'w')
-
-    return input_file, output_file
+    return mfannot_file_name[0:mfannot_file_name.find(".")]
 
 #This function look if a string contain a uORfs_name and store it in uORfs_name_vector
 def findOrfs(str_name, uORfs_name_vector):
@@ -78,80 +75,227 @@ def getuORFSNamesMfannot(uORfs_name_vector, input_file):
             #Check if it is at end of gene names block
             if (line.find("end mfannot")!=-1): 
                 find_str_gene=0 #para terminar de ler até o end do mfannot.
-            #The gene names are structured in 3 columns of regular spaced sizes, so we read each one and stores in uORfs_name_vector
             else: 
-                findOrfs(line[8:29].rstrip(' '),uORfs_name_vector)
-                findOrfs(line[29:50].rstrip(' '),uORfs_name_vector)
-                findOrfs(line[50:70].rstrip(' '),uORfs_name_vector) 
-
-
-def getuORFsStartEndSeq(uORfs_name_vector, input_file,output_file):
-    for uORfs_name in uORfs_name_vector:
-        #This sets the position of reading the input_file at the start
-        input_file.seek(0)
-        #This boolean tell us when a sequence of a specific uORF begins
-        bool_start_seq=0
-        #orf_seq store the orf's sequence
-        orf_seq=""
-        orf_start_position=""
-        orf_end_position=""
-        detailed_orf_name=""
-        #num_index store the index +1 after the number position in sequences lines
-        num_index=-1
-        #Loop to read the input_file
-        for line in input_file:
-            #When we find the start line with the uORFS_name, bool_start_seq receives 1 (true)
-            if (line.find("-" + uORfs_name)!=-1 and line.find(" ==> start")!=-1):
-                detailed_orf_name=line[1:line.find(" ==> start")].strip()
-                bool_start_seq=1
-            else:
-                if (bool_start_seq==1):
-                    #num_index store the index +1 after the number position in sequences lines 
-                    num_index=line.find("  ",2)
-                    #If orf_start_position is empty and bool_start_seq==1, then we get the start position of the orf
-                    if (orf_start_position==""):
-                        orf_start_position=line[:num_index].strip()
-                    #Check if its the end of the sequence of uORfs_name, then break case true
-                    if (line.find("-" + uORfs_name)!=-1 and line.find(" ==> end")!=-1):
-                        print(">"+detailed_orf_name)
-                        print("+"+orf_start_position)
-                        print("-"+str(orf_end_position))
-                        print("@"+orf_seq)
-                        output_file.write(">"+detailed_orf_name+"\n")
-                        output_file.write("+"+orf_start_position+"\n")
-                        output_file.write("-"+str(orf_end_position)+"\n")
-                        output_file.write("@"+orf_seq+"\n\n")
-                        #Here we reset variables and let the loop go to the end, as is possible to have another copy
-                        #forward in the file
-                        orf_seq=""
-                        orf_start_position=""
-                        orf_end_position=""
-                        detailed_orf_name=""
-                        bool_start_seq=0
-                    elif(line.find(";")==-1):
-                        orf_seq=orf_seq + line[num_index:].strip()
-                        #Calculate the orf_end_position
-                        orf_end_position=int(line[:num_index].strip())+len(line[num_index:].strip())-1
+                findOrfsInLine(line, uORfs_name_vector)
 
+#The gene names are structured in 3 columns of regular spaced sizes, so we read each one and stores the uORFs in uORfs_name_vector
+def findOrfsInLine(line, uORfs_name_vector):
+    findOrfs(line[8:29].rstrip(' '),uORfs_name_vector)
+    findOrfs(line[29:50].rstrip(' '),uORfs_name_vector)
+    findOrfs(line[50:70].rstrip(' '),uORfs_name_vector) 
 
-def main():
-    input_file,output_file=checkMfannotFile()
 
-    #uORfs_name_vector is a array that stores the name of the uORFs listed in Mfannot file
-    uORfs_name_vector=[]
+#This function returns the uORFs names that appear in a line preceded by '-' (as in "G-orf123 ==> start")
+#Every text after a '-' is compared with the names set, so the cost depends on the size of the line and not on the number of uORFs
+def findNamesInLine(line, uORfs_name_set, max_name_size):
+    found_names=set()
+    index=line.find("-")
+    while (index!=-1):
+        for size in range(1,max_name_size+1):
+            if (line[index+1:index+1+size] in uORfs_name_set):
+                found_names.add(line[index+1:index+1+size])
+        index=line.find("-",index+1)
+    return found_names
+
+#This class collects, line by line, the start and end positions and the sequence of every copy of all uORFs at the same time
+#Each uORF that is being read keeps its own state, so sequences of different uORFs can be interleaved in the file
+class UORFsReader:
+    __slots__=("uORfs_name_vector","uORfs_name_set","max_name_size","orfs_found","reading_orfs")
+
+    def __init__(self, uORfs_name_vector):
+        self.uORfs_name_vector=uORfs_name_vector
+        self.uORfs_name_set=set(uORfs_name_vector)
+        self.max_name_size=max([len(uORfs_name) for uORfs_name in self.uORfs_name_set], default=0)
+        #orfs_found store, for each uORF name, the list of (detailed_orf_name, orf_start_position, orf_end_position, orf_seq) found in the file
+        self.orfs_found={uORfs_name:[] for uORfs_name in self.uORfs_name_set}
+        #reading_orfs store the uORFs whose sequence is being read, with [detailed_orf_name, orf_start_position, orf_end_position, orf_seq_parts]
+        #The sequence parts are joined only at the end of the uORF
+        self.reading_orfs={}
+
+    def readLine(self, line):
+        reading_orfs=self.reading_orfs
+        start_line=line.find(" ==> start")!=-1
+        end_line=line.find(" ==> end")!=-1
+        #Only start and end lines can name a uORF
+        names_in_line=set()
+        if (start_line or end_line):
+            names_in_line=findNamesInLine(line, self.uORfs_name_set, self.max_name_size)
+        #When we find the start line with the uORFS_name, the uORF starts to be read
+        started_orfs=set()
+        if (start_line):
+            for uORfs_name in names_in_line:
+                if (uORfs_name not in reading_orfs):
+                    reading_orfs[uORfs_name]=["","","",[]]
+                reading_orfs[uORfs_name][0]=line[1:line.find(" ==> start")].strip()
+                started_orfs.add(uORfs_name)
+        for uORfs_name in list(reading_orfs):
+            if (uORfs_name in started_orfs):
+                continue
+            orf_data=reading_orfs[uORfs_name]
+            #num_index store the index +1 after the number position in sequences lines 
+            num_index=line.find("  ",2)
+            #If orf_start_position is empty, then we get the start position of the orf
+            if (orf_data[1]==""):
+                orf_data[1]=line[:num_index].strip()
+            #Check if its the end of the sequence of uORfs_name
+            if (end_line and uORfs_name in names_in_line):
+                self.orfs_found[uORfs_name].append((orf_data[0],orf_data[1],orf_data[2],"".join(orf_data[3])))
+                #Here we reset the uORF state and let the loop go to the end, as is possible to have another copy
+                #forward in the file
+                del reading_orfs[uORfs_name]
+            elif(line.find(";")==-1):
+                orf_data[3].append(line[num_index:].strip())
+                #Calculate the orf_end_position
+                orf_data[2]=int(line[:num_index].strip())+len(line[num_index:].strip())-1
+
+    #Returns the list of (detailed_orf_name, orf_start_position, orf_end_position, orf_seq) in the same order of uORfs_name_vector
+    def uORFs(self):
+        return [orf for uORfs_name in self.uORfs_name_vector for orf in self.orfs_found[uORfs_name]]
+
+#This function reads the Mfannot file only once (UORFsReader), collecting the start and end positions and the sequence of every copy of all uORFs
+#Returns the list of (detailed_orf_name, orf_start_position, orf_end_position, orf_seq) in the same order of uORfs_name_vector
+def readuORFsStartEndSeq(uORfs_name_vector, input_file):
+    #This sets the position of reading the input_file at the start
+    input_file.seek(0)
+    uORFs_reader=UORFsReader(uORfs_name_vector)
+    #Loop to read the input_file
+    for line in input_file:
+        uORFs_reader.readLine(line)
+    return uORFs_reader.uORFs()
+
+#This generator reads a Mfannot file with one or more sequences (e.g. the output of a batch of genomes in a single file) and yields, for each
+#sequence, its name (the '>' line up to the first space) and its uORFs (as readuORFsStartEndSeq returns them)
+#The file is read only once and line by line, without seek: only the uORFs of the current sequence are kept in memory, so it also works on pipes
+#The uORF names of each sequence come from its own "List of genes added" block. Raises ValueError when the first line does not contain "mfannot"
+def iterMfannotRecords(input_file):
+    first_line=input_file.readline()
+    if (first_line.find("mfannot")==-1):
+        raise ValueError("The file is empty or is not a mfannot output file")
+    sequence_name=None
+    for line in itertools.chain([first_line], input_file):
+        if (line.startswith(">")):
+            if (sequence_name is not None):
+                yield sequence_name, uORFs_reader.uORFs()
+            sequence_name=(line[1:].split() or [""])[0]
+            uORfs_name_vector=[]
+            find_str_gene=0
+            uORFs_reader=None
+        elif (sequence_name is None):
+            continue
+        elif (uORFs_reader is None):
+            #The block of gene names, read as getuORFSNamesMfannot does. The uORFs are read after its end
+            if (line.find("List of genes added")!=-1):
+                find_str_gene=1
+            if (find_str_gene==1):
+                if (line.find("end mfannot")!=-1):
+                    uORFs_reader=UORFsReader(uORfs_name_vector)
+                else:
+                    findOrfsInLine(line, uORfs_name_vector)
+        else:
+            uORFs_reader.readLine(line)
+    if (sequence_name is not None):
+        yield sequence_name, [] if uORFs_reader is None else uORFs_reader.uORFs()
+
+#This function reads the uORFs of the Mfannot file (readuORFsStartEndSeq) and prints and saves them in the uORFs output file
+def getuORFsStartEndSeq(uORfs_name_vector, input_file,output_file, metrics=NO_METRICS):
+    orfs=readuORFsStartEndSeq(uORfs_name_vector, input_file)
+    #Print and save the uORFs in the same order of uORfs_name_vector
+    with metrics.stage("output_writing"):
+        for detailed_orf_name, orf_start_position, orf_end_position, orf_seq in orfs:
+            print(">"+detailed_orf_name)
+            print("+"+orf_start_position)
+            print("-"+str(orf_end_position))
+            print("@"+orf_seq)
+        writeuORFs(orfs, output_file)
+
+#This function saves the uORFs (as readuORFsStartEndSeq returns them) in the uORFs output file
+def writeuORFs(orfs, output_file):
+    output_file.write("".join([">"+detailed_orf_name+"\n+"+orf_start_position+"\n-"+str(orf_end_position)+"\n@"+orf_seq+"\n\n" \
+        for detailed_orf_name, orf_start_position, orf_end_position, orf_seq in orfs]))
+
+#This function reads the uORFs of a Mfannot file and saves them in its uORFs output file. Returns the name of the uORFs file
+#A file that is not a Mfannot output file raises ValueError. The stages are measured by metrics (stageMetrics.py), started and finished by the caller
+def saveuORFs(mfannot_file_name, metrics=NO_METRICS):
+    with open(mfannot_file_name,'r') as input_file:
+        #Check if input file is a Mfannot
+        if (input_file.readline().find("mfannot")==-1):
+            raise ValueError("The file is empty or is not a mfannot output file")
+
+        output_file_name=getOutputFileName(mfannot_file_name)
+        print(mfannot_file_name.strip(".\\") if os.name=="nt" else mfannot_file_name)
+        print(output_file_name)
+
+        #Open uORFs output file
+        with open(output_file_name+".uORFs",'w') as output_file:
+            #uORfs_name_vector is a array that stores the name of the uORFs listed in Mfannot file
+            uORfs_name_vector=[]
 
-    getuORFSNamesMfannot(uORfs_name_vector, input_file)
+            with metrics.stage("input_parsing"):
+                getuORFSNamesMfannot(uORfs_name_vector, input_file)
 
-    getuORFsStartEndSeq(uORfs_name_vector, input_file, output_file)
+            with metrics.stage("uORF_pass"):
+                getuORFsStartEndSeq(uORfs_name_vector, input_file, output_file, metrics)
 
+            print("\n\n____________________________________________________________")
+            print("\nResults saved in: "+output_file.name)
+            print("____________________________________________________________\n\n\n")
+    return output_file_name+".uORFs"
+
+#This function saves, for each sequence of a Mfannot file with one or more sequences (iterMfannotRecords), its uORFs in its own uORFs file
+#The files are named after the whole sequence names and saved in output_folder. Each file is written as soon as its sequence was read
+#A name used by a previous sequence of the file gets a suffix (_2, _3...), so no sequence overwrites the file of another one
+def splitMfannotRecords(input_file, output_folder, metrics=NO_METRICS):
+    output_file_names=[]
+    used_names=set()
+    for sequence_name, orfs in iterMfannotRecords(input_file):
+        with metrics.stage("output_writing"):
+            #Characters that can not be part of a file name are replaced by '_'
+            file_name="".join([character if character.isalnum() or character in "._-" else "_" for character in sequence_name])
+            unique_name=file_name
+            copy_number=1
+            while (unique_name.lower() in used_names):
+                copy_number=copy_number+1
+                unique_name=file_name+"_"+str(copy_number)
+            used_names.add(unique_name.lower())
+            if (unique_name!=file_name):
+                print("Sequence name found again: "+sequence_name+", saved as "+unique_name+".uORFs")
+            output_file_name=path.join(output_folder, unique_name+".uORFs")
+            with open(output_file_name,'w') as output_file:
+                writeuORFs(orfs, output_file)
+            print(sequence_name+": "+str(len(orfs))+" uORFs")
+        output_file_names.append(output_file_name)
+    return output_file_names
+
+#This function saves the uORFs of each sequence of a Mfannot file (option --split) in the folder of the file. Returns the names of the uORFs files
+#A file that is not a Mfannot output file raises ValueError (iterMfannotRecords)
+def splitMfannotFile(mfannot_file_name, metrics=NO_METRICS):
+    output_folder=path.dirname(mfannot_file_name)
+    with open(mfannot_file_name,'r') as input_file, metrics.stage("uORF_pass"):
+        output_file_names=splitMfannotRecords(input_file, output_folder, metrics)
     print("\n\n____________________________________________________________")
-    print("\nResults saved in: "+output_file.name)
+    print("\n"+str(len(output_file_names))+" sequences. Results saved in: "+(output_folder or "."))
     print("____________________________________________________________\n\n\n")
+    return output_file_names
 
-    output_file.close() 
-    input_file.close() 
 
-    
+#The uORFs are saved by mitogenomesApi.py (runMfannotuORFs and runMfannotuORFsSplit)
+def main():
+    import mitogenomesApi
+
+    arguments, options=splitOptions(sys.argv[1:])
+    #Unknown options and a value given to --split show the usage
+    if (hasUnknownOptions(options, ("split","metrics","profile")) or options.get("split", True) is not True):
+        arguments=[]
+    mfannot_file_name=checkMfannotFile(arguments)
+    #The stages are measured when --metrics or --profile are given (stageMetrics.py)
+    try:
+        if (options.get("split") is True):
+            mitogenomesApi.runMfannotuORFsSplit(mfannot_file_name, options)
+        else:
+            mitogenomesApi.runMfannotuORFs(mfannot_file_name, options)
+    except ValueError as error:
+        print("\n"+str(error)+"\n")
+        exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,102 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module keeps all the annotation layers of a genome (genes, uORFs, introns, tRNAs, rRNAs) in a single numpy array with one count plane per class:
+#counts[c][i] is the number of features of class c that cover nucleotide i (1-based, position 0 is not used)
+#It replaces the decimal encoding of genome_array (+1 per gene, +10 per uORF), which mixed the classes when a nucleotide had 10 or more genes.
+#Counts are kept in uint16 and stop at 65535 instead of overflowing
+#The legacy values (genes + 10 x uORFs) of the csv track are still available with legacyArray()
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import numpy as np
+from genomeCoverage import buildCoverageArray
+
+#Feature classes of the track, and the gff types of each class
+CLASSES=("gene","uORF","intron","tRNA","rRNA")
+GFF_TYPES={"gene":("gene",), "intron":("intron",), "tRNA":("tRNA",), "rRNA":("rRNA",)}
+
+class AnnotationTrack:
+    __slots__=("genome_size","classes","counts")
+
+    def __init__(self, genome_size, classes=CLASSES, dtype=np.uint16):
+        self.genome_size=genome_size
+        self.classes=tuple(classes)
+        self.counts=np.zeros((len(self.classes), genome_size+1), dtype=dtype)
+
+    #Number of positions, as len(genome_array)
+    def __len__(self):
+        return self.genome_size+1
+
+    def _plane(self, feature_class):
+        if (feature_class not in self.classes):
+            raise KeyError("The track has no class "+str(feature_class)+" (classes: "+", ".join(self.classes)+")")
+        return self.counts[self.classes.index(feature_class)]
+
+    #Adds the coverage of the intervals to the plane of a class. Intervals with start > end wrap past the origin of the circular genome
+    def addIntervals(self, feature_class, starts, ends):
+        self.addCoverage(feature_class, buildCoverageArray(self.genome_size, starts, ends, dtype=np.int64))
+
+    #Adds a coverage array (number of features at each position, as buildCoverageArray returns) to the plane of a class
+    def addCoverage(self, feature_class, coverage):
+        plane=self._plane(feature_class)
+        plane[:]=np.minimum(plane+np.asarray(coverage, dtype=np.int64), np.iinfo(plane.dtype).max)
+
+    #Adds 1 to the plane of a class at the given positions (e.g. the positions of an uORF from gcIndex.circularPositions)
+    def addPositions(self, feature_class, positions):
+        plane=self._plane(feature_class)
+        positions=np.asarray(positions, dtype=np.int64)
+        np.add.at(plane, positions[plane[positions]<np.iinfo(plane.dtype).max], 1)
+
+    #Subtracts 1 from the plane of a class at the given positions, undoing addPositions (e.g. when an uORF is removed from the uORFs file)
+    def removePositions(self, feature_class, positions):
+        plane=self._plane(feature_class)
+        positions=np.asarray(positions, dtype=np.int64)
+        np.subtract.at(plane, positions[plane[positions]>0], 1)
+
+    #Returns the count plane of a class (a view, not a copy)
+    def count(self, feature_class):
+        return self._plane(feature_class)
+
+    #Returns a boolean array telling which positions have at least one feature of any of the classes
+    def mask(self, *feature_classes):
+        result=np.zeros(self.genome_size+1, dtype=bool)
+        for feature_class in feature_classes:
+            result|=self._plane(feature_class)>0
+        return result
+
+    #Returns a boolean array telling which positions have a feature of every class in include and none of the classes in exclude
+    #e.g. select(include=("uORF",), exclude=("gene",)) gives the uORF nucleotides in non coding regions. Position 0 is always False
+    def select(self, include=(), exclude=()):
+        result=np.ones(self.genome_size+1, dtype=bool)
+        result[0]=False
+        for feature_class in include:
+            result&=self._plane(feature_class)>0
+        for feature_class in exclude:
+            result&=self._plane(feature_class)==0
+        return result
+
+    #Returns the values of the original genome_array: genes + 10 x uORFs (0 = non coding, 1 = coding, 10 = uORF in non coding region, 11 = ...)
+    def legacyArray(self):
+        values=self._plane("gene").astype(np.int64)
+        if ("uORF" in self.classes):
+            values+=10*self._plane("uORF").astype(np.int64)
+        return values
+
+#This function creates the track of a genome from a GffTable (gffLoader.py), with the gene, intron, tRNA and rRNA features of the gff file
+#The uORF plane is empty: uORFs come from the uORFs file
+def trackFromGff(gff_table, genome_size, classes=CLASSES):
+    track=AnnotationTrack(genome_size, classes)
+    for feature_class in track.classes:
+        for feature_type in GFF_TYPES.get(feature_class, ()):
+            rows=gff_table.typeMask(feature_type)
+            track.addIntervals(feature_class, gff_table.starts[rows], gff_table.ends[rows])
+    return track
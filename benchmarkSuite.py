@@ -0,0 +1,213 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This script measures the time of the main steps of the scripts on synthetic genomes (syntheticGenome.py) of several sizes
+#The steps timed are as follow:
+# -readWholeGenome - fasta file of GCContentuORfsCdsCirc.py
+# -createAnnotationTrack - cds file of GCContentuORfsCdsCirc.py
+# -buildGCIndex - GC and coding counts of the whole genome
+# -gcContentCalc - GC content of every uORF of the uORFs file
+# -wholeGenomeGCCalc - whole genome GC content and the csv track
+# -getuORFsStartEndSeq - uORFs of the Mfannot file (Mfannot2uORFs.py)
+# -loadGff - gff file
+# -readGffSelGenes - genes of interest (getGeneSeqOfInterestGff.py)
+# -readXMLCDS - cds file generated from the saved GenBank XML (getGenesGenBank2Cds.py)
+#Each step runs --repeat times and the best and median times are saved, with the machine and versions, in a JSON file
+#With --compare, the times are compared with the ones of a previous JSON file, to track regressions and speedups
+
+#Usage:
+#python benchmarkSuite.py [--sizes=N,N,...] [--orf-density=X] [--seed=N] [--repeat=N] [--steps=name,name,...] [--output=file.json] [--compare=file.json] [--keep=folder]
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import sys
+import os
+import json
+import time
+import shutil
+import platform
+import tempfile
+import contextlib
+from os import path
+import numpy as np
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from syntheticGenome import generateGenome, DEFAULT_GENES, DEFAULT_UORFS, DEFAULT_SEED
+import GCContentuORfsCdsCirc
+import Mfannot2uORFs
+import getGeneSeqOfInterestGff
+import getGenesGenBank2Cds
+from gcIndex import buildGCIndex
+from gffLoader import loadGff
+
+DEFAULT_SIZES=(20000,1000000,20000000)
+DEFAULT_REPEAT=3
+
+def printUsage():
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    print("\nUsage:\npython benchmarkSuite.py [--sizes=N,N,...] [--orf-density=X] [--seed=N] [--repeat=N] [--steps=name,name,...] [--output=file.json] [--compare=file.json] [--keep=folder]\n")
+    print("Defaults: genomes of "+",".join([str(size) for size in DEFAULT_SIZES])+" nucleotides with at least "+str(DEFAULT_GENES)+" genes and "+str(DEFAULT_UORFS)+
+        " uORFs (syntheticGenome.py), "+str(DEFAULT_REPEAT)+" runs of each step")
+    print("--orf-density gives the number of uORFs per 1000 nucleotides instead")
+    print("Steps: "+",".join(STEPS))
+    print("The generated genomes are removed at the end, unless --keep gives a folder to save them")
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    sys.exit(0)
+
+#Runs a function and returns the time it took (seconds)
+def timeCall(function, *arguments):
+    start=time.perf_counter()
+    function(*arguments)
+    return time.perf_counter()-start
+
+#Each step receives the files of the genome (syntheticGenome.generateGenome) and a work folder, prepares its input and returns the time of the timed call
+
+def stepReadWholeGenome(genome, work_folder):
+    return timeCall(GCContentuORfsCdsCirc.readWholeGenome, open(genome["files"]["fasta"],'r'))
+
+def stepCreateAnnotationTrack(genome, work_folder):
+    with open(genome["files"]["cds"],'r') as cds_file:
+        return timeCall(GCContentuORfsCdsCirc.createAnnotationTrack, cds_file)
+
+def stepBuildGCIndex(genome, work_folder):
+    whole_genome=GCContentuORfsCdsCirc.readWholeGenome(open(genome["files"]["fasta"],'r'))
+    with open(genome["files"]["cds"],'r') as cds_file:
+        genome_size, annotation_track=GCContentuORfsCdsCirc.createAnnotationTrack(cds_file)
+    return timeCall(buildGCIndex, whole_genome, annotation_track.count("gene"))
+
+def _gcContentCalcAll(uORFs, annotation_track, gc_index, whole_genome):
+    for name_ORF, start_ORF, end_ORF, seq_ORF in uORFs:
+        GCContentuORfsCdsCirc.gcContentCalc(start_ORF, end_ORF, seq_ORF, annotation_track, gc_index, whole_genome)
+
+def stepGcContentCalc(genome, work_folder):
+    whole_genome, genome_size, annotation_track, uORFs=GCContentuORfsCdsCirc.readGenomeData(genome["files"]["uORFs"], genome["files"]["cds"], genome["files"]["fasta"])
+    gc_index=buildGCIndex(whole_genome, annotation_track.count("gene"))
+    return timeCall(_gcContentCalcAll, uORFs, annotation_track, gc_index, whole_genome)
+
+def stepWholeGenomeGCCalc(genome, work_folder):
+    whole_genome, genome_size, annotation_track, uORFs=GCContentuORfsCdsCirc.readGenomeData(genome["files"]["uORFs"], genome["files"]["cds"], genome["files"]["fasta"])
+    gc_index=buildGCIndex(whole_genome, annotation_track.count("gene"))
+    _gcContentCalcAll(uORFs, annotation_track, gc_index, whole_genome)
+    with open(os.devnull,'w') as output_gct_file:
+        return timeCall(GCContentuORfsCdsCirc.wholeGenomeGCCalc, path.join(work_folder, genome["genome_ID"]), output_gct_file, gc_index, annotation_track, "csv")
+
+def stepGetuORFsStartEndSeq(genome, work_folder):
+    uORfs_name_vector=[]
+    with open(genome["files"]["new"],'r') as input_file, open(os.devnull,'w') as output_file:
+        Mfannot2uORFs.getuORFSNamesMfannot(uORfs_name_vector, input_file)
+        return timeCall(Mfannot2uORFs.getuORFsStartEndSeq, uORfs_name_vector, input_file, output_file)
+
+def stepLoadGff(genome, work_folder):
+    with open(genome["files"]["gff"],'r') as gff_file:
+        return timeCall(loadGff, gff_file)
+
+def stepReadGffSelGenes(genome, work_folder):
+    whole_genome, gff_table=getGeneSeqOfInterestGff.readGenomeGff(genome["files"]["gff"], genome["files"]["fasta"])
+    GOI_pattern=getGeneSeqOfInterestGff.compileGOI(getGeneSeqOfInterestGff.GOI)
+    with open(os.devnull,'w') as output_file:
+        return timeCall(getGeneSeqOfInterestGff.readGffSelGenes, GOI_pattern, gff_table, output_file, whole_genome, True, True)
+
+def stepReadXMLCDS(genome, work_folder):
+    #The cds file is written next to the xml file, so the saved xml is copied to the work folder
+    str_ID=path.join(work_folder, genome["genome_ID"])
+    if (path.exists(str_ID+".xml")==False):
+        shutil.copyfile(genome["files"]["xml"], str_ID+".xml")
+    return timeCall(getGenesGenBank2Cds.readXMLCDS, str_ID)
+
+STEPS={"readWholeGenome":stepReadWholeGenome, "createAnnotationTrack":stepCreateAnnotationTrack, "buildGCIndex":stepBuildGCIndex,
+    "gcContentCalc":stepGcContentCalc, "wholeGenomeGCCalc":stepWholeGenomeGCCalc, "getuORFsStartEndSeq":stepGetuORFsStartEndSeq,
+    "loadGff":stepLoadGff, "readGffSelGenes":stepReadGffSelGenes, "readXMLCDS":stepReadXMLCDS}
+
+#This function runs the steps on a genome. The console output of the scripts is discarded
+#Returns a dictionary: step name -> best and median times and the time of every run
+def benchmarkGenome(genome, work_folder, steps, repeat):
+    results={}
+    for step in steps:
+        times=[]
+        for run in range(repeat):
+            with open(os.devnull,'w') as null_output, contextlib.redirect_stdout(null_output):
+                times.append(STEPS[step](genome, work_folder))
+        results[step]={"best":min(times), "median":float(np.median(times)), "runs":times}
+        print("\t"+step.ljust(24)+str(round(min(times),4))+" s")
+    return results
+
+#This function prints the best times of the genomes and steps that are in both results, and how many times faster (>1) or slower (<1) they are now
+def compareResults(previous_results, results):
+    previous_times={(genome["genome_size"], step):values["best"] for genome in previous_results["genomes"] for step, values in genome["steps"].items()}
+    print("\n\n____________________________________________________________")
+    print("\nComparison with the results of "+previous_results["date"]+" (previous / current best times, speedup)\n")
+    for genome in results["genomes"]:
+        for step, values in genome["steps"].items():
+            previous_time=previous_times.get((genome["genome_size"], step))
+            if (previous_time is None):
+                continue
+            speedup=previous_time/values["best"] if values["best"]>0 else float("inf")
+            print(str(genome["genome_size"]).rjust(10)+"  "+step.ljust(24)+str(round(previous_time,4))+" / "+str(round(values["best"],4))+" s  x"+str(round(speedup,2))+
+                ("  (slower)" if speedup<0.9 else ""))
+
+#Returns the list of integers of an option written as N,N,... or None if one of them is not a positive integer
+def intListOption(options, name, default):
+    if (name not in options):
+        return list(default)
+    values=str(options[name]).split(",")
+    if (not all(value.isdigit() and int(value)>0 for value in values)):
+        return None
+    return [int(value) for value in values]
+
+def main():
+    arguments, options=splitOptions(sys.argv[1:])
+    sizes=intListOption(options, "sizes", DEFAULT_SIZES)
+    repeat=intOption(options, "repeat", DEFAULT_REPEAT)
+    seed=intOption(options, "seed", DEFAULT_SEED)
+    steps=str(options.get("steps", ",".join(STEPS))).split(",")
+    try:
+        orf_density=float(options["orf-density"]) if "orf-density" in options else None
+    except (TypeError, ValueError):
+        orf_density=-1
+    if (hasUnknownOptions(options, ("sizes","orf-density","seed","repeat","steps","output","compare","keep")) or len(arguments)>0 or sizes is None or repeat is None or seed is None or (orf_density is not None and orf_density<0) or not all(step in STEPS for step in steps) or
+        any(options.get(name) is True for name in ("output","compare","keep"))):
+        printUsage()
+    output_file_name=options.get("output", "benchmark_"+time.strftime("%Y%m%d_%H%M%S")+".json")
+    previous_results=None
+    if ("compare" in options):
+        if (path.exists(options["compare"])==False):
+            print("\nFile not found! Check the path and file name of --compare.\n")
+            exit(0)
+        with open(options["compare"],'r') as previous_file:
+            previous_results=json.load(previous_file)
+
+    results={"date":time.strftime("%Y-%m-%d %H:%M:%S"), "python":platform.python_version(), "numpy":np.__version__, "platform":platform.platform(),
+        "processor":platform.processor(), "cpus":os.cpu_count(), "repeat":repeat, "orf_density":orf_density, "seed":seed, "genomes":[]}
+    data_folder=options["keep"] if "keep" in options else tempfile.mkdtemp(prefix="benchmark_")
+    try:
+        for genome_size in sizes:
+            genome_folder=path.join(data_folder, str(genome_size))
+            work_folder=path.join(genome_folder, "work")
+            os.makedirs(work_folder, exist_ok=True)
+            start=time.perf_counter()
+            genome=generateGenome(genome_folder, genome_size, orf_density=orf_density, seed=seed)
+            print("\n"+genome["genome_ID"]+": "+str(genome_size)+" nucleotides, "+str(genome["genes"])+" genes, "+str(genome["uORFs"])+" uORFs (generated in "+
+                str(round(time.perf_counter()-start,2))+" s)")
+            results["genomes"].append({"genome_ID":genome["genome_ID"], "genome_size":genome_size, "genes":genome["genes"], "uORFs":genome["uORFs"],
+                "steps":benchmarkGenome(genome, work_folder, steps, repeat)})
+    finally:
+        if ("keep" not in options):
+            shutil.rmtree(data_folder, ignore_errors=True)
+
+    with open(output_file_name,'w') as output_file:
+        json.dump(results, output_file, indent=2)
+    if (previous_results is not None):
+        compareResults(previous_results, results)
+    print("\n\n____________________________________________________________")
+    print("\nResults saved in: "+output_file_name)
+    print("____________________________________________________________\n\n\n")
+
+if __name__ == '__main__':
+    main()
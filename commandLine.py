@@ -0,0 +1,38 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module separates the options from the file names passed as arguments to the scripts
+#Options are written as --name=value (or just --name for the ones that are turned on), and can be placed anywhere in the command line
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+#Returns the list of file names and a dictionary with the options. Options without value receive True
+def splitOptions(argv):
+    arguments=[]
+    options={}
+    for argument in argv:
+        if (argument.startswith("--")):
+            name, separator, value=argument[2:].partition("=")
+            options[name]=value if separator=="=" else True
+        else:
+            arguments.append(argument)
+    return arguments, options
+
+#Returns True when an option is not one of known_options (e.g. a typo as --track-fromat), so the script prints its usage instead of ignoring it
+def hasUnknownOptions(options, known_options):
+    return any(name not in known_options for name in options)
+
+#Returns the value of an integer option, or default if it was not given. Returns None if the value is not a positive integer
+def intOption(options, name, default):
+    value=options.get(name, default)
+    if (value is True or not str(value).isdigit() or int(value)<1):
+        return None
+    return int(value)
@@ -0,0 +1,96 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module reads fasta files for all the scripts (GCContentuORfsCdsCirc.py, gcContentGffFasta.py and getGeneSeqOfInterestGff.py)
+#The sequence lines are appended to a bytearray, so reading a file takes linear time, even for large multi-genome fasta files
+#Each record keeps the convention used by the scripts: position 0 is not used and whole_genome[i] is the nucleotide i (1-based)
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import numpy as np
+
+#A fasta record with its header (without '>') and its sequence stored in data, a bytearray whose position 0 is not used
+class FastaRecord:
+    __slots__=("header","data")
+
+    def __init__(self, header, data):
+        self.header=header
+        self.data=data
+
+    #Number of nucleotides of the record
+    @property
+    def size(self):
+        return len(self.data)-1
+
+    def __len__(self):
+        return len(self.data)-1
+
+    #1-based access as in the old whole_genome string: whole_genome[i] returns a character and whole_genome[start:end+1] returns a string
+    def __getitem__(self, key):
+        if (isinstance(key, slice)):
+            return self.data[key].decode("ascii")
+        return chr(self.data[key])
+
+    #Number of occurrences of a nucleotide in the record
+    def count(self, nc_char):
+        return self.data.count(nc_char.encode("ascii"), 1)
+
+    #Returns the nucleotides between start and end (1-based, inclusive) without copying them
+    def region(self, start, end):
+        return memoryview(self.data)[start:end+1]
+
+    #Returns the whole record as a numpy uint8 array that shares memory with data (position 0 is not used)
+    def codes(self):
+        return np.frombuffer(self.data, dtype=np.uint8)
+
+#Lines may come from a file opened in text ('r') or binary ('rb') mode
+def _lineBytes(line):
+    if (isinstance(line, str)):
+        return line.encode("latin-1")
+    return line
+
+#This generator reads a fasta file and yields one FastaRecord at a time, so only one record is kept in memory
+#If upper is True the sequence is converted to upper case
+def iterFastaRecords(fasta_file, upper=True):
+    header=None
+    data=None
+    for line in fasta_file:
+        line=_lineBytes(line)
+        if (line[:1]==b">"):
+            if (data is not None):
+                yield FastaRecord(header, data)
+            header=line[1:].strip().decode("latin-1")
+            #Position 0 is not used
+            data=bytearray(b" ")
+        else:
+            if (data is None):
+                #Sequence without header line
+                header=""
+                data=bytearray(b" ")
+            line=line.strip()
+            if (upper):
+                line=line.upper()
+            data+=line
+    if (data is not None):
+        yield FastaRecord(header, data)
+
+#This function reads all the sequence lines of a fasta file in a single record, as the scripts always did for the whole genome
+#The header of the first record is kept. An empty file returns an empty record
+def readGenome(fasta_file, upper=True):
+    genome=None
+    for record in iterFastaRecords(fasta_file, upper):
+        if (genome is None):
+            genome=record
+        else:
+            genome.data+=memoryview(record.data)[1:]
+    if (genome is None):
+        genome=FastaRecord("", bytearray(b" "))
+    return genome
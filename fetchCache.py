@@ -0,0 +1,238 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module keeps a local cache of the documents downloaded from NCBI, so repeated runs (or a run started again after a crash) do not download them again
+#Each document is stored in a file named by the sha256 of the accession.version of its record and its report type (gff3, fasta, gbseq...), e.g. cache_dir/3f/3fa9...
+#The accession.version is read from the document (GBSeq_accession-version, first word of the fasta header, gff3 sequence-region), so NC_1 and NC_1.1 share one entry
+#An ID without a version (e.g. NC_1) also gets a small alias entry, keyed by the ID as it was requested, with the accession.version it was downloaded as.
+#IDs with a version are read from their exact entry, and IDs without a version through their alias while it is not older than ttl
+#(NCBI may have a newer version by then, and the ID is downloaded again)
+#Files are written with a temporary name and renamed when complete, so an interrupted run never leaves a broken entry
+#Entries older than ttl seconds are not used (the record may have changed at NCBI), and when the cache is larger than max_bytes
+#the entries used the longest time ago are removed
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+import re
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+
+#Defaults of the scripts: entries are used for 30 days and the cache keeps up to 2 GB
+DEFAULT_TTL_DAYS=30
+DEFAULT_SIZE_MB=2048
+#Only the beginning of a document is read to find the accession.version of its record
+HEAD_BYTES=1024*1024
+VERSIONED_ID=re.compile(r"^[^.\s]+\.\d+$")
+ACCESSION_PATTERNS={"gbseq":re.compile(rb"<GBSeq_accession-version>\s*([^<\s]+)\s*</GBSeq_accession-version>"),
+    "fasta":re.compile(rb"\A\s*>\s*(\S+)"), "gff3":re.compile(rb"^##sequence-region\s+(\S+)", re.MULTILINE)}
+
+#This function returns the accession.version of the record of a document (from a file or bytes), or None when it is not found
+def recordAccession(report, file_name=None, data=None):
+    pattern=ACCESSION_PATTERNS.get(report)
+    if (pattern is None):
+        return None
+    if (data is None):
+        with open(file_name, "rb") as input_file:
+            data=input_file.read(HEAD_BYTES)
+    match=pattern.search(data[:HEAD_BYTES])
+    if (match is None):
+        return None
+    accession=match.group(1).decode("utf-8", "replace")
+    return accession if VERSIONED_ID.match(accession) else None
+
+class FetchCache:
+    def __init__(self, cache_dir, ttl=DEFAULT_TTL_DAYS*86400, max_bytes=DEFAULT_SIZE_MB*1024*1024):
+        self.cache_dir=cache_dir
+        self.ttl=ttl
+        self.max_bytes=max_bytes
+        self._lock=threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes=sum(entry[1] for entry in self._entries())
+        if (max_bytes is not None and self._total_bytes>max_bytes):
+            self.evict()
+        self.hits=0
+        self.misses=0
+
+    #Returns the file of the cache for an accession.version and a report type
+    def path(self, accession, report):
+        key=hashlib.sha256((accession+"\t"+report).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    #Returns (file name, size, time of last use, download time) of every entry of the cache
+    def _entries(self):
+        entries=[]
+        for folder in os.listdir(self.cache_dir):
+            folder_path=os.path.join(self.cache_dir, folder)
+            if (len(folder)!=2 or not os.path.isdir(folder_path)):
+                continue
+            for file_name in os.listdir(folder_path):
+                #Temporary files of writes in progress are not entries
+                if (file_name.endswith(".tmp")):
+                    continue
+                try:
+                    status=os.stat(os.path.join(folder_path, file_name))
+                except FileNotFoundError:
+                    continue
+                entries.append((os.path.join(folder_path, file_name), status.st_size, status.st_atime, status.st_mtime))
+        return entries
+
+    def _remove(self, file_name):
+        try:
+            size=os.path.getsize(file_name)
+            os.remove(file_name)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._total_bytes=self._total_bytes-size
+
+    def _count(self, hit):
+        with self._lock:
+            if (hit):
+                self.hits=self.hits+1
+            else:
+                self.misses=self.misses+1
+
+    #Returns the file of the alias entry of an ID without a version
+    def _aliasPath(self, accession, report):
+        return self.path(accession, report+"\talias")
+
+    #Returns file_name if the entry exists and has not expired, or None (an expired entry is removed)
+    #The time of last use (atime) of the file is updated, while its modification time keeps the time it was downloaded
+    def _fresh(self, file_name):
+        try:
+            status=os.stat(file_name)
+        except FileNotFoundError:
+            return None
+        if (self.ttl is not None and time.time()-status.st_mtime>self.ttl):
+            self._remove(file_name)
+            return None
+        os.utime(file_name, (time.time(), status.st_mtime))
+        return file_name
+
+    #Returns the cached file of an ID and report type, or None if there is not one or it has expired
+    #An ID without a version is found through its alias entry, written when it was downloaded
+    def get(self, accession, report):
+        if (VERSIONED_ID.match(accession)):
+            file_name=self._fresh(self.path(accession, report))
+        else:
+            file_name=None
+            alias_file_name=self._fresh(self._aliasPath(accession, report))
+            if (alias_file_name is not None):
+                try:
+                    with open(alias_file_name, "r", encoding="utf-8") as alias_file:
+                        record_accession=alias_file.read().strip()
+                except FileNotFoundError:
+                    #The alias was evicted by another thread in the meantime
+                    record_accession=""
+                if (VERSIONED_ID.match(record_accession)):
+                    file_name=self._fresh(self.path(record_accession, report))
+        self._count(file_name is not None)
+        return file_name
+
+    #Copies the cached document of an ID and report type to output_file_name. Returns False if it is not in the cache
+    def copyTo(self, accession, report, output_file_name):
+        file_name=self.get(accession, report)
+        if (file_name is None):
+            return False
+        temporary_file_name=output_file_name+".part"
+        try:
+            shutil.copyfile(file_name, temporary_file_name)
+        except FileNotFoundError:
+            #The entry was evicted by another thread in the meantime
+            return False
+        os.replace(temporary_file_name, output_file_name)
+        return True
+
+    #Stores a document in the cache, from a file (source_file_name) or from bytes (data), under the accession.version of its record
+    #(the versioned ID it was downloaded with when the document does not tell it). An ID without a version also gets its alias entry
+    #Returns False when it was not stored
+    def put(self, accession, report, source_file_name=None, data=None):
+        record_accession=recordAccession(report, source_file_name, data)
+        if (record_accession is None and VERSIONED_ID.match(accession)):
+            record_accession=accession
+        if (record_accession is None):
+            return False
+        self._write(self.path(record_accession, report), source_file_name, data)
+        if (not VERSIONED_ID.match(accession)):
+            self._write(self._aliasPath(accession, report), data=record_accession.encode("utf-8"))
+        return True
+
+    #Writes an entry with a temporary name and renames it when complete
+    def _write(self, file_name, source_file_name=None, data=None):
+        os.makedirs(os.path.dirname(file_name), exist_ok=True)
+        temporary_file, temporary_file_name=tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(file_name))
+        try:
+            with os.fdopen(temporary_file, "wb") as output_file:
+                if (data is not None):
+                    output_file.write(data)
+                else:
+                    with open(source_file_name, "rb") as input_file:
+                        shutil.copyfileobj(input_file, output_file)
+            old_size=os.path.getsize(file_name) if os.path.exists(file_name) else 0
+            os.replace(temporary_file_name, file_name)
+        except BaseException:
+            if (os.path.exists(temporary_file_name)):
+                os.remove(temporary_file_name)
+            raise
+        with self._lock:
+            self._total_bytes=self._total_bytes+os.path.getsize(file_name)-old_size
+            over_limit=self.max_bytes is not None and self._total_bytes>self.max_bytes
+        if (over_limit):
+            self.evict()
+
+    #Removes the expired entries, and then the least recently used ones until the cache fits in max_bytes
+    def evict(self):
+        entries=self._entries()
+        now=time.time()
+        kept=[]
+        for file_name, size, used_time, download_time in entries:
+            if (self.ttl is not None and now-download_time>self.ttl):
+                self._remove(file_name)
+            else:
+                kept.append((used_time, file_name, size))
+        total_bytes=sum(size for used_time, file_name, size in kept)
+        kept.sort()
+        for used_time, file_name, size in kept:
+            if (self.max_bytes is None or total_bytes<=self.max_bytes):
+                break
+            self._remove(file_name)
+            total_bytes=total_bytes-size
+        with self._lock:
+            self._total_bytes=total_bytes
+
+    #Same as Downloader.fetchToFile, but the document comes from the cache when it is there, and is stored in the cache after a download
+    #Results with error_marker (e.g. IDs not found) are never cached
+    def fetchToFile(self, downloader, url, accession, report, output_file_name, error_marker=None):
+        if (self.copyTo(accession, report, output_file_name)):
+            return True
+        if (downloader.fetchToFile(url, output_file_name, error_marker)==False):
+            return False
+        self.put(accession, report, output_file_name)
+        return True
+
+#This function creates the cache from the options of the scripts: --cache-dir=DIR [--cache-ttl=days] [--cache-size=MB]
+#Returns None when there is no --cache-dir (no cache), and raises ValueError for invalid options
+def cacheFromOptions(options):
+    cache_dir=options.get("cache-dir")
+    if (cache_dir is None):
+        return None
+    try:
+        ttl_days=float(options.get("cache-ttl", DEFAULT_TTL_DAYS))
+        size_mb=float(options.get("cache-size", DEFAULT_SIZE_MB))
+    except (TypeError, ValueError):
+        raise ValueError("--cache-ttl and --cache-size must be numbers")
+    if (cache_dir is True or ttl_days<=0 or size_mb<=0):
+        raise ValueError("Invalid cache options")
+    return FetchCache(cache_dir, ttl=ttl_days*86400, max_bytes=int(size_mb*1024*1024))
@@ -0,0 +1,153 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module reads the GBSeq xml returned by NCBI efetch (rettype=gb&retmode=xml) one record (GBSeq element) at a time
+#The xml is parsed as it is read and every element is cleared after use, so a file with thousands of genomes needs the memory of a single record
+#Only the features of the asked types (genes by default) are kept, with their location split in parts:
+# -join(a..b,c..d,...) and order(...) give one part per interval, in the order they are written
+# -complement(...) gives parts in the minus strand
+# -partial ends (<a..>b) and single nucleotides (a) are accepted, and origin-spanning features are a join ending at the genome size and restarting at 1
+#Features with a location that is not supported (e.g. gap(), bond()) are not kept: they are listed in record.skipped_features, so the caller can report them
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import re
+import xml.etree.ElementTree as ET
+
+#First lines of a GBSeq xml, used to write a single record as a standalone document
+GBSET_HEADER='<?xml version="1.0" encoding="UTF-8"  ?>\n<!DOCTYPE GBSet PUBLIC "-//NCBI//NCBI GBSeq/EN" "https://www.ncbi.nlm.nih.gov/dtd/NCBI_GBSeq.dtd">\n'
+
+#An interval of a location: a..b, a (one nucleotide) or a^b (a site between two nucleotides). '<' and '>' mark partial ends
+INTERVAL_RE=re.compile(r'^<?(\d+)(?:(\.\.|\^)>?(\d+))?>?$')
+
+class GBFeature:
+    __slots__=("key","location","parts","qualifiers")
+
+    def __init__(self, key, location, parts, qualifiers):
+        self.key=key
+        self.location=location
+        #List of (start, end, strand) with 1-based positions and strand 1 or -1
+        self.parts=parts
+        #List of (name, value) in the order of the xml
+        self.qualifiers=qualifiers
+
+    #Returns the value of the first qualifier with this name, or default
+    def qualifier(self, name, default=None):
+        for qualifier_name, value in self.qualifiers:
+            if (qualifier_name==name):
+                return value
+        return default
+
+class GBSeqRecord:
+    __slots__=("locus","length","definition","primary_accession","accession_version","topology","features","skipped_features","element")
+
+    def __init__(self, locus, length, definition, primary_accession, accession_version, topology, features, element=None, skipped_features=()):
+        self.locus=locus
+        self.length=length
+        self.definition=definition
+        self.primary_accession=primary_accession
+        self.accession_version=accession_version
+        self.topology=topology
+        self.features=features
+        #List of (key, location) of the features left out because their location is not supported
+        self.skipped_features=list(skipped_features)
+        #GBSeq element of the record, only kept with keep_element=True (it is cleared when the next record is read)
+        self.element=element
+
+    #Returns the record as a standalone GBSeq xml document (needs keep_element=True)
+    def toXML(self):
+        return GBSET_HEADER+"<GBSet>\n  "+ET.tostring(self.element, encoding="unicode").rstrip()+"\n</GBSet>\n"
+
+#Splits the top level of a location at the commas that are not inside parentheses
+def _splitTopLevel(text):
+    items=[]
+    depth=0
+    item_start=0
+    for i, character in enumerate(text):
+        if (character=="("):
+            depth=depth+1
+        elif (character==")"):
+            depth=depth-1
+        elif (character=="," and depth==0):
+            items.append(text[item_start:i])
+            item_start=i+1
+    items.append(text[item_start:])
+    return items
+
+#This function converts a GenBank location (e.g. "complement(join(3..100,200..>300))") into a list of (start, end, strand)
+#Parts in other records (e.g. "J00194.1:100..202") are not part of this genome and are left out
+#A site between two nucleotides (a^b) is reported as the single nucleotide a
+def parseLocation(location, strand=1):
+    location=location.replace(" ","").replace("\n","")
+    if (location.startswith("complement(") and location.endswith(")")):
+        return parseLocation(location[11:-1], -strand)
+    for operator in ("join(","order("):
+        if (location.startswith(operator) and location.endswith(")")):
+            parts=[]
+            for item in _splitTopLevel(location[len(operator):-1]):
+                parts.extend(parseLocation(item, strand))
+            return parts
+    if (location.find(":")!=-1):
+        return []
+    match=INTERVAL_RE.match(location)
+    if (match is None):
+        raise ValueError("Invalid location: "+location)
+    start=int(match.group(1))
+    if (match.group(3) is None or match.group(2)=="^"):
+        return [(start, start, strand)]
+    return [(start, int(match.group(3)), strand)]
+
+#Reads a GBFeature element. Returns None if its key is not one of feature_keys
+#A location that is not supported is added to skipped (key, location), and None is returned
+def _readFeature(element, feature_keys, skipped):
+    key=element.findtext("GBFeature_key")
+    if (feature_keys is not None and key not in feature_keys):
+        return None
+    location=element.findtext("GBFeature_location", "")
+    try:
+        parts=parseLocation(location)
+    except ValueError:
+        skipped.append((key, location))
+        return None
+    qualifiers=[(qualifier.findtext("GBQualifier_name"), qualifier.findtext("GBQualifier_value", "")) for qualifier in element.iter("GBQualifier")]
+    return GBFeature(key, location, parts, qualifiers)
+
+#This generator yields one GBSeqRecord for each GBSeq element of xml_file (a file name or a file opened in binary mode)
+#feature_keys are the feature types kept (None keeps all of them)
+#With keep_element=True the GBSeq element is kept in record.element (e.g. to write the record alone with toXML)
+def iterGBSeqRecords(xml_file, feature_keys=("gene",), keep_element=False):
+    root=None
+    features=[]
+    skipped_features=[]
+    for event, element in ET.iterparse(xml_file, events=("start","end")):
+        if (event=="start"):
+            if (root is None):
+                root=element
+            continue
+        if (element.tag=="GBFeature"):
+            feature=_readFeature(element, feature_keys, skipped_features)
+            if (feature is not None):
+                features.append(feature)
+            if (not keep_element):
+                element.clear()
+        elif (element.tag=="GBSeq_sequence" and not keep_element):
+            #The sequence is not used and is the largest element of the record
+            element.clear()
+        elif (element.tag=="GBSeq"):
+            length=element.findtext("GBSeq_length")
+            yield GBSeqRecord(element.findtext("GBSeq_locus", ""), int(length) if length else 0, element.findtext("GBSeq_definition", ""),
+                element.findtext("GBSeq_primary-accession", ""), element.findtext("GBSeq_accession-version", ""),
+                element.findtext("GBSeq_topology", ""), features, element if keep_element else None, skipped_features)
+            features=[]
+            skipped_features=[]
+            #The record is not needed anymore: remove it from the tree
+            element.clear()
+            root.clear()
@@ -18,21 +18,41 @@
 #coding: utf-8
 
 import sys
+import csv
 from pathlib import Path
 import os.path
 from os import path
+import numpy as np
+from gcIndex import buildGCIndex, gcMask
+from gffLoader import loadGff
+from packedGenome import readPackedOrFasta
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from stageMetrics import NO_METRICS
+from annotationTrack import GFF_TYPES, trackFromGff
 
-def checkInputFiles():
+#Feature classes of the gff file with their own columns in the GC matrix (--matrix). Genes are not listed, their columns are cds_size and gc_cds
+MATRIX_CLASSES=tuple(feature_class for feature_class in GFF_TYPES if feature_class!="gene")
+
+def printUsage():
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    print("\nUsage:\npython GCContentGffFasta.py [file_path_name.gff] [file_path_name.fasta] [--bundle] [--metrics[=file.json]] [--profile[=file.prof]]\n")
+    print("With --bundle, the input files are read once and kept in a binary '.gff.bundle.npz' file (genomeBundle.py), loaded by the next runs")
+    print("--metrics saves the wall time, CPU time and peak memory of each stage in a JSON file ('.gcf.metrics.json') and --profile saves a cProfile dump ('.gcf.prof')")
+    print("\nMatrix usage:\npython GCContentGffFasta.py --matrix=[folder] [--workers=N] [--bundle] [--metrics] [--profile]\n")
+    print("Every folder of the tree with one '.gff' and one '.fasta' file (as created by getGffFastaFilesNCBI.py) is a genome, computed in a pool of workers")
+    print("The results of all genomes are saved in a single table with a row per genome and the size and GC nucleotides of each feature class\n(genes are the cds_size and gc_cds columns; intron, tRNA and rRNA have their own _size and _gc columns)")
+    print("([folder]/gc_matrix.parquet when pyarrow is installed, otherwise [folder]/gc_matrix.csv)")
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    sys.exit(0)
+
+def checkInputFiles(arguments):
     #Check if all the necessary files names are passed as arguments
-    if (len(sys.argv)!=3 or sys.argv[1].find(".gff")==-1 or sys.argv[2].find(".fasta")==-1):
-        print("\n----------------------------------------------------------------------------------------------------\n")
-        print("\nUsage:\npython GCContentGffFasta.py [file_path_name.gff] [file_path_name.fasta]\n")
-        print("\n----------------------------------------------------------------------------------------------------\n")
-        sys.exit(0)
+    if (len(arguments)!=2 or arguments[0].find(".gff")==-1 or arguments[1].find(".fasta")==-1):
+        printUsage()
 
     #Get path/file names
-    gff_file_name=sys.argv[1]
-    fasta_file_name=sys.argv[2]
+    gff_file_name=arguments[0]
+    fasta_file_name=arguments[1]
 
 
     #Check if path/files exists
@@ -42,58 +62,35 @@ def checkInputFiles():
         print("\n--------------------------------------------------------------------------------------------\n")
         exit(0)
 
-    #Open input files
-    gff_file=open(gff_file_name,'r') 
-    fasta_file=open(fasta_file_name, 'r')
+    return gff_file_name,fasta_file_name
 
-    #Open output files. The ID filename in fasta file is used to generate the result files ('.gct' and '.csv')
+#The ID filename in fasta file is used to name the result file ('.gcf')
+def getOutputFileName(fasta_file_name):
+    output_file_name=fasta_file_name
     if (os.name=="nt"):
-        fasta_file_name=fasta_file_name.strip(".\\")
-    output_file_name=fasta_file_name[0:fasta_file_name.find(".")]
-    output_gcf_file=open(output_file_name+".gcf",'w')
-
-    return gff_file,fasta_file,output_gcf_file
+        output_file_name=output_file_name.strip(".\\")
+    return output_file_name[0:output_file_name.find(".")]+".gcf"
 
 
-def checkCG(nc_char):
-    if (nc_char=='C' or nc_char=='G'):
-        return True
-    else:
-        return False
-
 #This function read the whole genome from fasta file
 def readWholeGenome(fasta_file):
     #The position 0 of whole_genome will not be used
-    whole_genome=" "
-    for line in fasta_file:
-        if(line[0]!=">"):
-            line=line.upper()
-            whole_genome=whole_genome+line.strip()
+    #When the fasta file was converted by packedGenome.py, the genome is decoded from the '.pack' file instead
+    whole_genome=readPackedOrFasta(fasta_file)
     fasta_file.close()
     return whole_genome
 
-#This function populates the numerical array (genome_array), which will tell us where the coding and non coding regions are, based on gff file.
-def populateGenomeArray(gff_file, genome_array):
-    for line in gff_file: 
-        spl_line=line.split("\t")
-        #Gene reference in gff file are define between 2nd and 3rd tab
-        #Check if line reference a gene
-        if (len(spl_line)==9 and spl_line[2]=="gene"):
-            #if true, then get start and end positions of gene
-            start=int(spl_line[3])
-            end=int(spl_line[4])
-            #Loop to register nucleotides that belong to coding regions, based on start and end positions retrieved
-            #This adds +1 every time a nucleotide belong to a gene in cds file
-            #To contemplate the circular genome, we use a while loop to process every nucleotide in the sequence
-            i=start
-            while True:
-                genome_array[i]=genome_array[i]+1
-                if (i==end):
-                    break
-                i=i+1
-                #Check if it is the final position of genome and point to the first one
-                if (i>len(genome_array)-1):
-                    i=1
+#This function creates the numerical array (genome_array), which will tell us where the coding and non coding regions are, based on gff file.
+def populateGenomeArray(gff_file, genome_size, metrics=NO_METRICS):
+    from genomeBundle import gffGeneCoverage
+    #Read the gff file in a table of columns
+    with metrics.stage("input_parsing"):
+        gff_table=loadGff(gff_file)
+    #Gene reference in gff file are define between 2nd and 3rd tab
+    #Genome_array represent the whole genome. Position 0 is not used.
+    #This adds +1 every time a nucleotide belong to a gene in gff file
+    #Genes that cross the final position of the circular genome continue from the first one
+    return gffGeneCoverage(gff_table, genome_size)
 
 def printSaveResults(genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod,output_gcf_file):
     print("------------------------------------------------------------------------------------------------------------------------------------")
@@ -115,18 +112,14 @@ def printSaveResults(genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cd
 
 
 def calcGCContent(genome_array,genome):
-    #Total GC nucleotides in coding regions
-    sum_GC_nc_cds = 0
-    #Total nucleotides in coding regions
-    sum_nc_cds = sum(i > 0 for i in genome_array)
+    #Count GC and coding nucleotides once for the whole genome
+    gc_index=buildGCIndex(genome,genome_array)
     #Total GC nucleotides in genome
-    sum_GC_nc=genome.count('G')+genome.count('C')
-    for i in range(1,len(genome)):
-        if(checkCG(genome[i])):
-            if (genome_array[i]!=0):
-                sum_GC_nc_cds=sum_GC_nc_cds+1
+    #Total nucleotides in coding regions
+    #Total GC nucleotides in coding regions
+    sum_GC_nc,sum_nc_cds,sum_GC_nc_cds=gc_index.totals()
     #Total nucleotides in genome
-    genome_size=len(genome)-1
+    genome_size=genome.size
     #Total nucleotides in non coding regions
     sum_nc_noncod=genome_size-sum_nc_cds
     #Total GC nucleotides in non coding regions
@@ -134,28 +127,155 @@ def calcGCContent(genome_array,genome):
 
     return genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod
 
-def main():
-    gff_file,fasta_file,output_gcf_file=checkInputFiles()
-
-    genome=readWholeGenome(fasta_file)
-    #Instantiate genome_array with size of genome +1 and populates with value=0
-    #Genome_array represent the whole genome. Position 0 is not used.
-    genome_array=[0]*len(genome)
+#This function calculates the GC content of a genome, prints it and saves it in the '.gcf' file. Returns the values of calcGCContent
+#The stages are measured by metrics (stageMetrics.py), started and finished by the caller
+def processGenome(gff_file_name, fasta_file_name, output_file_name, use_bundle=False, metrics=NO_METRICS):
+    output_gcf_file=open(output_file_name,'w')
 
-    #Populate array with coding regions
-    populateGenomeArray(gff_file, genome_array)
+    if (use_bundle):
+        #Genome and coding regions come from the bundle of the gff file (genomeBundle.py), created when it is missing or its files changed
+        from genomeBundle import loadGffBundle
+        with metrics.stage("input_parsing"):
+            genome, gff_table, genome_array=loadGffBundle(gff_file_name, fasta_file_name)
+    else:
+        with metrics.stage("input_parsing"):
+            genome=readWholeGenome(open(fasta_file_name,'r'))
+        #Populate array with coding regions
+        #Genome_array represent the whole genome. Position 0 is not used.
+        with open(gff_file_name,'r') as gff_file, metrics.stage("array_construction"):
+            genome_array=populateGenomeArray(gff_file, genome.size, metrics)
 
     #Calculate GC content in coding and no coding regions
-    genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod=calcGCContent(genome_array,genome)
+    with metrics.stage("whole_genome_pass"):
+        genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod=calcGCContent(genome_array,genome)
+
+    with metrics.stage("output_writing"):
+        #Print and save results
+        printSaveResults(genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod,output_gcf_file)
+
+        print("\n\n____________________________________________________________")
+        print("\n\nResults saved in: "+str(output_gcf_file.name)+"\n")
+        print("____________________________________________________________\n\n\n")
+
+        output_gcf_file.close()
+    return genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod
 
-    #Print and save results
-    printSaveResults(genome_size,sum_nc_cds,sum_nc_noncod,sum_GC_nc,sum_GC_nc_cds,sum_GC_nc_noncod,output_gcf_file)
+#This function finds the genomes of a folder tree: every folder with exactly one '.gff' and one '.fasta' file
+def readMatrixGenomes(matrix_folder):
+    genomes=[]
+    for folder, folder_names, file_names in os.walk(matrix_folder):
+        folder_names.sort()
+        genome_files=[[path.join(folder,file_name) for file_name in sorted(file_names) if file_name.endswith(extension)] for extension in (".gff",".fasta")]
+        if (all(len(extension_files)==1 for extension_files in genome_files)):
+            genomes.append(tuple(extension_files[0] for extension_files in genome_files))
+    return genomes
+
+#This function calculates the row of a genome in the GC matrix, in a worker process: the values of calcGCContent and, for each feature class
+#of the gff file (annotationTrack.py), the number of nucleotides covered by the class and how many of them are GC
+#Errors do not stop the matrix, they are returned and saved in the error column
+def matrixGenome(genome_files, use_bundle=False, metrics_options={}):
+    from stageMetrics import metricsFromOptions
+    gff_file_name, fasta_file_name=genome_files
+    genome_ID=path.basename(gff_file_name)
+    genome_ID=genome_ID[0:genome_ID.find(".")]
+    try:
+        metrics=metricsFromOptions(metrics_options, path.join(path.dirname(gff_file_name), genome_ID+".gcf"))
+        metrics.start()
+        try:
+            with metrics.stage("input_parsing"):
+                if (use_bundle):
+                    from genomeBundle import loadGffBundle
+                    genome, gff_table, genome_array=loadGffBundle(gff_file_name, fasta_file_name)
+                else:
+                    genome=readWholeGenome(open(fasta_file_name,'r'))
+                    with open(gff_file_name,'r') as gff_file:
+                        gff_table=loadGff(gff_file)
+            with metrics.stage("array_construction"):
+                track=trackFromGff(gff_table, genome.size, ("gene",)+MATRIX_CLASSES)
+                gc=gcMask(genome.codes()[:genome.size+1])
+            with metrics.stage("whole_genome_pass"):
+                values=calcGCContent(track.count("gene"),genome)
+                row=dict(zip(("genome_size","cds_size","noncod_size","gc","gc_cds","gc_noncod"), values))
+                for feature_class in MATRIX_CLASSES:
+                    covered=track.mask(feature_class)
+                    row[feature_class+"_size"]=int(np.count_nonzero(covered))
+                    row[feature_class+"_gc"]=int(np.count_nonzero(covered & gc))
+        finally:
+            metrics.finish({"files":list(genome_files)})
+        return genome_ID, genome_files, row, ""
+    except Exception as error:
+        return genome_ID, genome_files, None, type(error).__name__+": "+str(error)
+
+#This function saves the GC matrix as a Parquet file when pyarrow is installed, otherwise as a CSV file. Returns the file name
+def writeMatrix(matrix_file_name, columns, values):
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        pyarrow=None
+    if (pyarrow is not None):
+        matrix_file_name=matrix_file_name+".parquet"
+        pyarrow.parquet.write_table(pyarrow.table({column:column_values for column, column_values in zip(columns, values)}), matrix_file_name)
+        return matrix_file_name
+    matrix_file_name=matrix_file_name+".csv"
+    #File names and errors can have commas or quotes, so the values are quoted by csv.writer
+    with open(matrix_file_name,'w',newline='') as matrix_file:
+        matrix_writer=csv.writer(matrix_file, lineterminator="\n")
+        matrix_writer.writerow(columns)
+        matrix_writer.writerows([["" if value is None else value for value in row] for row in zip(*values)])
+    return matrix_file_name
+
+#This function calculates the GC matrix of all genomes of a folder tree in a pool of worker processes
+#The table has a row per genome (in the order of the folders) and a column per value, so the genomes can be compared without reading '.gcf' files
+#Returns the name of the matrix file
+def runMatrix(matrix_folder, workers, use_bundle=False, metrics_options={}):
+    import concurrent.futures
+    genomes=readMatrixGenomes(matrix_folder)
+    columns=["genome","gff_file","fasta_file","genome_size","cds_size","noncod_size","gc","gc_cds","gc_noncod"]
+    columns=columns+[feature_class+suffix for feature_class in MATRIX_CLASSES for suffix in ("_size","_gc")]+["error"]
+    values=[[] for column in columns]
+    error_genomes=""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for genome_ID, genome_files, row, error in executor.map(matrixGenome, genomes, [use_bundle]*len(genomes), [metrics_options]*len(genomes)):
+            print(genome_ID+(" - "+error if error!="" else ""))
+            if (error!=""):
+                error_genomes=error_genomes+genome_files[0]+"\n"
+            row=dict(row or {}, genome=genome_ID, gff_file=genome_files[0], fasta_file=genome_files[1], error=error)
+            for column, column_values in zip(columns, values):
+                column_values.append(row.get(column))
+
+    matrix_file_name=writeMatrix(path.join(matrix_folder,"gc_matrix"), columns, values)
 
     print("\n\n____________________________________________________________")
-    print("\n\nResults saved in: "+str(output_gcf_file.name)+"\n")
+    print("\n\n"+str(len(genomes))+" genomes processed. GC matrix saved in: "+matrix_file_name+"\n")
+    if (len(error_genomes)>0):
+        print("\nThe following genomes returned an error:\n"+error_genomes)
     print("____________________________________________________________\n\n\n")
+    return matrix_file_name
+
+#The calculations run in mitogenomesApi.py (runGCContent and runGCMatrix), which imports the modules of each option only when it is given
+def main():
+    import mitogenomesApi
 
-    output_gcf_file.close()
+    arguments, options=splitOptions(sys.argv[1:])
+    if (hasUnknownOptions(options, ("bundle","metrics","profile","matrix","workers")) or options.get("bundle", True) is not True):
+        printUsage()
+    if ("matrix" in options):
+        #Check the folder and the number of workers (default: number of CPUs)
+        workers=intOption(options, "workers", os.cpu_count() or 1)
+        if (options["matrix"] is True or len(arguments)>0 or workers is None):
+            printUsage()
+        if (path.isdir(options["matrix"])==False):
+            print("\n--------------------------------------------------------------------------------------------\n")
+            print("\nFolder not found! Check the path and folder name.\n")
+            print("\n--------------------------------------------------------------------------------------------\n")
+            exit(0)
+        mitogenomesApi.runGCMatrix(options["matrix"], workers, options.get("bundle") is True, options)
+        return
+    if ("workers" in options):
+        printUsage()
+    gff_file_name,fasta_file_name=checkInputFiles(arguments)
+    mitogenomesApi.runGCContent(gff_file_name, fasta_file_name, options.get("bundle") is True, options)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
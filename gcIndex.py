@@ -0,0 +1,79 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module keeps cumulative sums of GC nucleotides, coding nucleotides and GC nucleotides in coding regions of a genome
+#They are built once per genome, and then the totals of any interval (uORF, gene or window) come from two lookups in each array
+#Intervals with start > end (or end > genome size) wrap past the origin of the circular genome
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import numpy as np
+
+GC_CODES=np.frombuffer(b"GC", dtype=np.uint8)
+
+#This function returns a boolean array telling which positions of genome_codes (ASCII codes, as FastaRecord.codes()) are G or C
+#The same test of checkCG: only upper case 'G' and 'C' are counted
+def gcMask(genome_codes):
+    return (genome_codes==GC_CODES[0]) | (genome_codes==GC_CODES[1])
+
+#This function returns the positions (1-based) from start to end of a circular genome, as a numpy array
+def circularPositions(start, end, genome_size):
+    if (end>genome_size):
+        end=end-genome_size
+    if (start<=end):
+        return np.arange(start, end+1)
+    return np.concatenate((np.arange(start, genome_size+1), np.arange(1, end+1)))
+
+class GCIndex:
+    __slots__=("genome_size","coding","cum_gc","cum_coding","cum_gc_coding")
+
+    #gc and coding are boolean arrays with genome_size+1 positions (position 0 is not used)
+    def __init__(self, gc, coding):
+        gc=np.asarray(gc, dtype=bool).copy()
+        coding=np.asarray(coding, dtype=bool).copy()
+        if (gc.size!=coding.size):
+            raise ValueError("The genome has "+str(gc.size-1)+" nucleotides, but the coding array has "+str(coding.size-1))
+        gc[0]=False
+        coding[0]=False
+        self.genome_size=gc.size-1
+        self.coding=coding
+        #int32 is enough for mitogenomes and halves the memory, bigger genomes use int64
+        cum_type=np.int32 if gc.size<2**31 else np.int64
+        #cum_X[i] is the number of X nucleotides from position 1 to i, so cum_X[0]=0
+        self.cum_gc=np.cumsum(gc, dtype=cum_type)
+        self.cum_coding=np.cumsum(coding, dtype=cum_type)
+        self.cum_gc_coding=np.cumsum(gc & coding, dtype=cum_type)
+
+    #Sum of an interval using the cumulative array
+    def _rangeSum(self, cum, start, end):
+        if (end>self.genome_size):
+            end=end-self.genome_size
+        if (start<=end):
+            return int(cum[end]-cum[start-1])
+        #The interval wraps: start..genome_size + 1..end
+        return int(cum[self.genome_size]-cum[start-1]+cum[end])
+
+    #Returns the number of GC nucleotides, coding nucleotides and GC nucleotides in coding regions from start to end (1-based, inclusive)
+    def query(self, start, end):
+        return self._rangeSum(self.cum_gc, start, end), self._rangeSum(self.cum_coding, start, end), self._rangeSum(self.cum_gc_coding, start, end)
+
+    #Returns the number of GC nucleotides, coding nucleotides and GC nucleotides in coding regions of the whole genome
+    def totals(self):
+        return int(self.cum_gc[-1]), int(self.cum_coding[-1]), int(self.cum_gc_coding[-1])
+
+#This function builds the GCIndex of a genome read with fastaReader/packedGenome and its genome_array
+#The nucleotides with genome_array > 0 are the coding ones
+#If the fasta file has more nucleotides than genome_array, the extra ones are not used
+def buildGCIndex(whole_genome, genome_array):
+    genome_codes=whole_genome.codes()
+    if (genome_codes.size<len(genome_array)):
+        raise ValueError("The fasta file has "+str(genome_codes.size-1)+" nucleotides, less than the genome size ("+str(len(genome_array)-1)+")")
+    return GCIndex(gcMask(genome_codes[:len(genome_array)]), np.asarray(genome_array)>0)
@@ -0,0 +1,155 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This script calculates the GC content, GC skew (G-C)/(G+C) and AT skew (A-T)/(A+T) in sliding windows along a circular genome
+#The values are calculated for all nucleotides of each window and separately for its coding, non coding and uORF nucleotides
+#The files used are as follow:
+# -gff - genes give the coding regions, as in gcContentGffFasta.py (kept with the other layers in an annotationTrack)
+# -fasta
+# -uORFs (optional) - Generated by Mfannot2uORFs.py script
+#Windows start at positions 1, 1+step, 1+2*step... and the last ones continue from the first position of the genome (circular genome)
+#Each base is counted once per genome in cumulative sums, so the sums of any window come from two lookups instead of a scan of the window
+#The result is a tab separated file ('.gcskew.tsv') with one row per window
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import sys
+from os import path
+import numpy as np
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from gffLoader import loadGff
+from annotationTrack import trackFromGff
+from gcContentGffFasta import readWholeGenome
+
+#Default window size and step (nucleotides)
+DEFAULT_WINDOW=500
+DEFAULT_STEP=100
+
+def printUsage():
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    print("\nUsage:\npython gcSkewWindows.py [file_path_name.gff] [file_path_name.fasta] [file_path_name.uORFs] [--window=N] [--step=N]\n")
+    print("The uORFs file is optional. Defaults: windows of "+str(DEFAULT_WINDOW)+" nucleotides every "+str(DEFAULT_STEP)+" nucleotides")
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    sys.exit(0)
+
+def checkInputFiles(arguments):
+    #Check if all the necessary files names are passed as arguments
+    if (len(arguments) not in (2,3) or arguments[0].find(".gff")==-1 or arguments[1].find(".fasta")==-1 or (len(arguments)==3 and arguments[2].find(".uORFs")==-1)):
+        printUsage()
+
+    #Check if path/files exists
+    for file_name in arguments:
+        if (path.exists(file_name)==False):
+            print("\n--------------------------------------------------------------------------------------------\n")
+            print("\nOne or more files not found! Check the path and file names.\n")
+            print("\n--------------------------------------------------------------------------------------------\n")
+            exit(0)
+
+    gff_file_name=arguments[0]
+    fasta_file_name=arguments[1]
+    uORFs_file_name=arguments[2] if len(arguments)==3 else None
+    return gff_file_name, fasta_file_name, uORFs_file_name
+
+#The ID filename in fasta file is used to name the result file, in the same folder of the fasta file
+def getOutputFileName(fasta_file_name):
+    folder_name, file_name=path.split(fasta_file_name)
+    return path.join(folder_name, file_name[0:file_name.find(".")])
+
+#This function reads the start and end positions of the uORFs in the uORFs file ('+start' and '-end' lines)
+def readuORFsIntervals(uORFs_file):
+    starts=[]
+    ends=[]
+    for line in uORFs_file:
+        if (line.startswith("+")):
+            starts.append(int(line[1:]))
+        elif (line.startswith("-")):
+            ends.append(int(line[1:]))
+    return starts, ends
+
+#This function returns the sums of the windows starting at window_starts, using the cumulative array cum (cum[i] is the sum from position 1 to i)
+#Windows that pass the end of the genome continue from position 1
+def windowSums(cum, window_starts, window_size):
+    genome_size=cum.size-1
+    window_ends=window_starts+window_size-1
+    wrap=window_ends>genome_size
+    sums=cum[np.minimum(window_ends, genome_size)]-cum[window_starts-1]
+    return sums+np.where(wrap, cum[np.where(wrap, window_ends-genome_size, 0)], 0)
+
+#Returns a/b, or nan where b is 0
+def safeRatio(a, b):
+    return np.divide(a, b, out=np.full(a.shape, np.nan), where=b>0)
+
+#This function calculates, for each window and each class of nucleotides, the number of nucleotides, GC content (%), GC skew and AT skew
+#class_masks is a dictionary: class name -> boolean array telling which positions of the genome (1-based) are in the class
+#Returns the start and end of the windows and a dictionary: class name -> (size, gc, gc_skew, at_skew) arrays
+def calcWindows(genome_codes, class_masks, window_size, step):
+    genome_size=genome_codes.size-1
+    window_size=min(window_size, genome_size)
+    window_starts=np.arange(1, genome_size+1, step)
+    window_ends=(window_starts+window_size-2)%genome_size+1
+    base_masks={base:genome_codes==ord(base) for base in "ACGT"}
+    profiles={}
+    for class_name, class_mask in class_masks.items():
+        class_mask=class_mask.copy()
+        class_mask[0]=False
+        #Counts of the class and of each base in the class, from two lookups in their cumulative sums
+        size=windowSums(np.cumsum(class_mask, dtype=np.int64), window_starts, window_size)
+        counts={base:windowSums(np.cumsum(base_masks[base] & class_mask, dtype=np.int64), window_starts, window_size) for base in "ACGT"}
+        gc=counts["G"]+counts["C"]
+        at=counts["A"]+counts["T"]
+        profiles[class_name]=(size, safeRatio(gc*100, size), safeRatio(counts["G"]-counts["C"], gc), safeRatio(counts["A"]-counts["T"], at))
+    return window_starts, window_ends, profiles
+
+#Values without nucleotides to calculate them (nan) are written as NA
+def formatValues(values, decimals):
+    return ["NA" if np.isnan(value) else str(round(value, decimals)) for value in values.tolist()]
+
+def saveWindows(output_file_name, window_starts, window_ends, profiles):
+    header=["window_start","window_end"]
+    columns=[[str(value) for value in window_starts.tolist()], [str(value) for value in window_ends.tolist()]]
+    for class_name, (size, gc, gc_skew, at_skew) in profiles.items():
+        header.extend([class_name+"_size", class_name+"_gc", class_name+"_gc_skew", class_name+"_at_skew"])
+        columns.extend([[str(value) for value in size.tolist()], formatValues(gc, 2), formatValues(gc_skew, 4), formatValues(at_skew, 4)])
+    with open(output_file_name,'w') as output_file:
+        output_file.write("\t".join(header)+"\n")
+        output_file.write("".join(["\t".join(row)+"\n" for row in zip(*columns)]))
+
+def main():
+    arguments, options=splitOptions(sys.argv[1:])
+    gff_file_name, fasta_file_name, uORFs_file_name=checkInputFiles(arguments)
+    window_size=intOption(options, "window", DEFAULT_WINDOW)
+    step=intOption(options, "step", DEFAULT_STEP)
+    if (hasUnknownOptions(options, ("window","step")) or window_size is None or step is None):
+        printUsage()
+
+    genome=readWholeGenome(open(fasta_file_name,'r'))
+    #Coding positions come from the genes of the gff file, and the uORF positions from the uORFs file
+    with open(gff_file_name,'r') as gff_file:
+        annotation_track=trackFromGff(loadGff(gff_file), genome.size)
+    genome_codes=genome.codes()[:genome.size+1]
+    class_masks={"all":annotation_track.select(), "coding":annotation_track.mask("gene"), "noncoding":annotation_track.select(exclude=("gene",))}
+    if (uORFs_file_name is not None):
+        with open(uORFs_file_name,'r') as uORFs_file:
+            uORFs_starts, uORFs_ends=readuORFsIntervals(uORFs_file)
+        annotation_track.addIntervals("uORF", uORFs_starts, uORFs_ends)
+        class_masks["uORFs"]=annotation_track.mask("uORF")
+
+    window_starts, window_ends, profiles=calcWindows(genome_codes, class_masks, window_size, step)
+    output_file_name=getOutputFileName(fasta_file_name)+".gcskew.tsv"
+    saveWindows(output_file_name, window_starts, window_ends, profiles)
+
+    print("\n\n____________________________________________________________")
+    print("\n\n"+str(window_starts.size)+" windows of "+str(min(window_size, genome.size))+" nucleotides (step "+str(step)+")")
+    print("\n\nResults saved in: "+output_file_name+"\n")
+    print("____________________________________________________________\n\n\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module extracts the sequences of the features of a gff file (read by gffLoader.py) from a genome read by fastaReader.py or packedGenome.py
+# -Features in the minus strand are reverse complemented, with a translation table built once
+# -Features that cross the origin of the circular genome (start > end or end > genome size) are read as two pieces: start..genome size and 1..end
+# -With spliced=True, a feature is assembled from the CDS (or, when there is none, the exons) that descend from it through the Parent attribute,
+#  in transcription order, so the introns are left out
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+#Complement of the nucleotides, including the IUPAC ambiguity codes. Upper and lower case are kept
+COMPLEMENT_TABLE=bytes.maketrans(b"ACGTUMRWSYKVHDBNacgtumrwsykvhdbn", b"TGCAAKYWSRMBDHVNtgcaakywsrmbdhvn")
+
+#Feature types used to assemble a spliced feature, in order of preference
+SPLICE_PART_TYPES=(("CDS",),("exon",))
+
+#Returns the reverse complement of a sequence (bytes or str)
+def reverseComplement(sequence):
+    if (isinstance(sequence, str)):
+        return sequence.encode("ascii").translate(COMPLEMENT_TABLE)[::-1].decode("ascii")
+    return bytes(sequence).translate(COMPLEMENT_TABLE)[::-1]
+
+#Returns the nucleotides from start to end (1-based, inclusive) of a genome as bytes, in the case of the fasta file
+def _regionBytes(whole_genome, start, end):
+    if (end<start):
+        return b""
+    if (hasattr(whole_genome, "fetch")):
+        #PackedRecord (packedGenome.py) decodes only the asked region
+        return whole_genome.fetch(start, end, upper=False)
+    return bytes(whole_genome.region(start, end))
+
+#This function returns the sequence of a region of a circular genome as bytes
+#When start > end (or end > genome size) the region goes from start to the end of the genome and continues from position 1
+#With strand=-1 the reverse complement is returned
+def extractRegion(whole_genome, start, end, strand=1):
+    genome_size=whole_genome.size
+    if (end>genome_size):
+        end=end-genome_size
+    if (start<=end):
+        sequence=_regionBytes(whole_genome, start, end)
+    else:
+        sequence=_regionBytes(whole_genome, start, genome_size)+_regionBytes(whole_genome, 1, end)
+    if (strand==-1):
+        return reverseComplement(sequence)
+    return sequence
+
+#Returns a dictionary: ID -> rows of the features with that ID in their Parent attribute (a feature can have several parents, separated by ',')
+def childrenByParent(gff_table):
+    children={}
+    for row, parents in enumerate(gff_table.attribute("Parent")):
+        if (parents is None):
+            continue
+        for parent in parents.split(","):
+            children.setdefault(parent, []).append(row)
+    return children
+
+#Returns the rows of the parts (CDS, or exons) of a feature. The parts are searched in its children, and then in the children of its
+#first child that has parts (e.g. gene -> mRNA -> CDS). A feature without parts is its own single part
+def featureParts(gff_table, row, children, part_types=SPLICE_PART_TYPES):
+    ids=gff_table.attribute("ID")
+    feature_children=children.get(ids[row], []) if ids[row] is not None else []
+    for types in part_types:
+        parts=[child for child in feature_children if gff_table.types[gff_table.type_codes[child]] in types]
+        if (len(parts)>0):
+            return parts
+    for child in feature_children:
+        parts=featureParts(gff_table, child, children, part_types)
+        if (parts!=[child]):
+            return parts
+    return [row]
+
+#This function returns the sequence (bytes) of a feature of gff_table
+#strand_aware=True reverse complements the features in the minus strand. spliced=True joins the parts of the feature (see featureParts)
+#children is the result of childrenByParent, which can be computed once for all features
+def extractFeature(gff_table, row, whole_genome, strand_aware=True, spliced=False, children=None):
+    strand=int(gff_table.strands[row]) if strand_aware else 1
+    if (not spliced):
+        return extractRegion(whole_genome, int(gff_table.starts[row]), int(gff_table.ends[row]), strand)
+    if (children is None):
+        children=childrenByParent(gff_table)
+    parts=featureParts(gff_table, row, children)
+    #The parts are joined in the order of the genome starting at the start of the feature, so a gene that crosses the origin
+    #keeps its parts after the origin at the end. The minus strand is read from its last part to the first one
+    genome_size=whole_genome.size
+    feature_start=int(gff_table.starts[row])
+    parts=sorted(parts, key=lambda part:(int(gff_table.starts[part])-feature_start)%genome_size)
+    if (strand==-1):
+        parts.reverse()
+    return b"".join([extractRegion(whole_genome, int(gff_table.starts[part]), int(gff_table.ends[part]), strand) for part in parts])
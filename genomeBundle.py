@@ -0,0 +1,158 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module keeps everything the scripts read from the text files of a genome (fasta, gff, cds and uORFs) in a single binary '.bundle.npz' file,
+#so the text is parsed only once and the next runs (option --bundle) load numpy arrays instead
+#A bundle holds the sha256 of the contents of its source files. When one of them changes, the bundle is not used and is built again
+#There are two kinds of bundle, named after their first source file:
+# -uORFs_file_name.bundle.npz (uORFs, cds and fasta) - genome sequence, coverage of the genes of the cds file and the uORFs, for GCContentuORfsCdsCirc.py
+# -gff_file_name.bundle.npz (gff and fasta) - genome sequence, the gff table (gffLoader.py) and the coverage of its genes, for gcContentGffFasta.py and getGeneSeqOfInterestGff.py
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+import hashlib
+import tempfile
+import zipfile
+import numpy as np
+from fastaReader import FastaRecord
+from packedGenome import readPackedOrFasta
+from gffLoader import GffTable, loadGff
+from genomeCoverage import buildCoverageArray
+from intervalIndex import readCdsGenes
+
+BUNDLE_EXTENSION=".bundle.npz"
+#Version of the bundle layout. Bundles of other versions are built again
+BUNDLE_VERSION=1
+
+#Returns the sha256 of the contents of the files, in the given order
+def sourceDigest(file_names):
+    digest=hashlib.sha256()
+    for file_name in file_names:
+        with open(file_name,'rb') as source_file:
+            for block in iter(lambda: source_file.read(1048576), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+#This function loads a bundle. Returns a dictionary with its arrays, or None if there is no bundle, it is not current or it can not be read
+def loadBundle(bundle_file_name, digest):
+    if (not os.path.exists(bundle_file_name)):
+        return None
+    try:
+        with np.load(bundle_file_name, allow_pickle=False) as bundle_file:
+            if (str(bundle_file["digest"])!=digest or int(bundle_file["version"])!=BUNDLE_VERSION):
+                return None
+            return {name:bundle_file[name] for name in bundle_file.files}
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return None
+
+#Returns the mode of a new file created with open(): 0666 without the bits of the umask of the process
+def _newFileMode():
+    umask=os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+#This function saves the arrays in a bundle. The file is written with a temporary name and renamed, so a broken bundle is never left
+#The temporary file is created with mode 0600, so it gets the mode of a file created with open() before it is renamed
+def saveBundle(bundle_file_name, digest, arrays):
+    temporary_file, temporary_file_name=tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(os.path.abspath(bundle_file_name)))
+    try:
+        with os.fdopen(temporary_file, "wb") as output_file:
+            np.savez(output_file, digest=np.array(digest), version=np.array(BUNDLE_VERSION), **arrays)
+        os.chmod(temporary_file_name, _newFileMode())
+        os.replace(temporary_file_name, bundle_file_name)
+    except BaseException:
+        if (os.path.exists(temporary_file_name)):
+            os.remove(temporary_file_name)
+        raise
+
+#Arrays of a genome (FastaRecord or PackedRecord) read in the original case
+def _genomeArrays(whole_genome):
+    if (not isinstance(whole_genome, FastaRecord)):
+        whole_genome=whole_genome.toFastaRecord(upper=False)
+    return {"genome_header":np.array(whole_genome.header), "genome_data":np.frombuffer(bytes(whole_genome.data), dtype=np.uint8)}
+
+#Returns the genome of a bundle as a FastaRecord (position 0 is not used), in upper case or in the case of the fasta file
+def genomeFromBundle(bundle, upper=True):
+    data=bundle["genome_data"].tobytes()
+    return FastaRecord(str(bundle["genome_header"]), bytearray(data.upper() if upper else data))
+
+#Arrays of a GffTable
+def _gffArrays(gff_table):
+    return {"gff_seqids":np.array(gff_table.seqids, dtype=str), "gff_types":np.array(gff_table.types, dtype=str),
+        "gff_seqid_codes":gff_table.seqid_codes, "gff_type_codes":gff_table.type_codes, "gff_starts":gff_table.starts, "gff_ends":gff_table.ends,
+        "gff_strands":gff_table.strands, "gff_phases":gff_table.phases,
+        "gff_attributes":np.frombuffer(gff_table._attributes, dtype=np.uint8), "gff_attribute_offsets":gff_table._attribute_offsets}
+
+#This function returns the number of genes that cover each position of the genome (position 0 is not used), from the gene features of a GffTable
+#Genes that cross the final position of the circular genome continue from the first one
+def gffGeneCoverage(gff_table, genome_size):
+    genes=gff_table.typeMask("gene")
+    return buildCoverageArray(genome_size, gff_table.starts[genes], gff_table.ends[genes])
+
+#Returns the GffTable of a bundle
+def gffTableFromBundle(bundle):
+    return GffTable(bundle["gff_seqids"].tolist(), bundle["gff_types"].tolist(), bundle["gff_seqid_codes"], bundle["gff_type_codes"],
+        bundle["gff_starts"], bundle["gff_ends"], bundle["gff_strands"], bundle["gff_phases"],
+        bundle["gff_attributes"].tobytes(), bundle["gff_attribute_offsets"])
+
+#This function reads the uORFs of a uORFs file as the lines are read by GCContentuORfsCdsCirc.py: the name line ('>', kept with its line break),
+#'+start', '-end' and '@sequence' (upper case, without spaces). Returns a list of (name, start, end, sequence)
+def readuORFsRecords(uORFs_file):
+    records=[]
+    for line in uORFs_file:
+        if (line.find(">")!=-1):
+            name_ORF=line[1:]
+        elif (line.find("+")!=-1):
+            start_ORF=int(line[1:])
+        elif (line.find("-")!=-1):
+            end_ORF=int(line[1:])
+        elif (line.find("@")!=-1):
+            records.append((name_ORF, start_ORF, end_ORF, line[1:].upper().strip()))
+    return records
+
+#This function returns the data of GCContentuORfsCdsCirc.py from the bundle of the uORFs file, building the bundle when it is missing or old:
+#whole genome (upper case FastaRecord), genome size, number of genes of the cds file that cover each position and the uORFs (see readuORFsRecords)
+def loadCdsBundle(uORFs_file_name, cds_file_name, fasta_file_name):
+    bundle_file_name=uORFs_file_name+BUNDLE_EXTENSION
+    digest=sourceDigest((uORFs_file_name, cds_file_name, fasta_file_name))
+    bundle=loadBundle(bundle_file_name, digest)
+    if (bundle is None):
+        with open(fasta_file_name,'r') as fasta_file:
+            bundle=_genomeArrays(readPackedOrFasta(fasta_file, upper=False))
+        with open(cds_file_name,'r') as cds_file:
+            genome_size, starts, ends, names=readCdsGenes(cds_file)
+        with open(uORFs_file_name,'r') as uORFs_file:
+            uORFs=readuORFsRecords(uORFs_file)
+        bundle.update({"genome_size":np.array(genome_size), "gene_coverage":buildCoverageArray(genome_size, starts, ends),
+            "uORFs_names":np.array([uORF[0] for uORF in uORFs], dtype=str), "uORFs_starts":np.array([uORF[1] for uORF in uORFs], dtype=np.int64),
+            "uORFs_ends":np.array([uORF[2] for uORF in uORFs], dtype=np.int64), "uORFs_sequences":np.array([uORF[3] for uORF in uORFs], dtype=str)})
+        saveBundle(bundle_file_name, digest, bundle)
+    uORFs=list(zip(bundle["uORFs_names"].tolist(), bundle["uORFs_starts"].tolist(), bundle["uORFs_ends"].tolist(), bundle["uORFs_sequences"].tolist()))
+    return genomeFromBundle(bundle), int(bundle["genome_size"]), bundle["gene_coverage"], uORFs
+
+#This function returns the whole genome (FastaRecord, upper case or in the case of the fasta file), the GffTable and the number of genes
+#that cover each position of the genome (see gffGeneCoverage) from the bundle of the gff file, building the bundle when it is missing or old
+def loadGffBundle(gff_file_name, fasta_file_name, upper=True):
+    bundle_file_name=gff_file_name+BUNDLE_EXTENSION
+    digest=sourceDigest((gff_file_name, fasta_file_name))
+    bundle=loadBundle(bundle_file_name, digest)
+    if (bundle is None):
+        with open(fasta_file_name,'r') as fasta_file:
+            whole_genome=readPackedOrFasta(fasta_file, upper=False)
+        with open(gff_file_name,'r') as gff_file:
+            gff_table=loadGff(gff_file)
+        bundle=_genomeArrays(whole_genome)
+        bundle.update(_gffArrays(gff_table))
+        bundle["gene_coverage"]=gffGeneCoverage(gff_table, whole_genome.size)
+        saveBundle(bundle_file_name, digest, bundle)
+    return genomeFromBundle(bundle, upper), gffTableFromBundle(bundle), bundle["gene_coverage"]
@@ -0,0 +1,54 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module builds the numerical array (genome_array) that tells, for every nucleotide of a circular genome, how many features cover it.
+#It is shared by GCContentuORfsCdsCirc.py and gcContentGffFasta.py
+#Instead of walking every nucleotide of every gene, each interval adds +1 at its start and -1 after its end in a difference array.
+#A single prefix sum over that difference array gives the coverage of every position at once.
+#As in the scripts, position 0 of genome_array is not used, so genome_array[i] is the coverage of nucleotide i (1-based)
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import numpy as np
+
+#This function splits the intervals that wrap past the origin of the circular genome in two pieces: start..genome_size and 1..end
+#An interval wraps when its start is greater than its end, or when its end is written past the genome size (as NCBI does for origin-spanning features)
+#Returns two numpy arrays with the 1-based and inclusive start and end positions of the pieces
+def splitCircularIntervals(starts, ends, genome_size):
+    starts=np.asarray(starts, dtype=np.int64).ravel()
+    ends=np.asarray(ends, dtype=np.int64).ravel()
+    if (starts.size!=ends.size):
+        raise ValueError("The number of start and end positions must be the same")
+    #Bring ends written past the genome size back to the beginning of the genome
+    ends=np.where(ends>genome_size, ends-genome_size, ends)
+    if (starts.size>0 and (starts.min()<1 or ends.min()<1 or starts.max()>genome_size or ends.max()>genome_size)):
+        raise ValueError("Interval positions must be between 1 and the genome size ("+str(genome_size)+")")
+    wrap=starts>ends
+    #Wrapping intervals keep their first piece (start..genome_size) in place and get a second piece (1..end) appended
+    piece_starts=np.concatenate((starts, np.ones(np.count_nonzero(wrap), dtype=np.int64)))
+    piece_ends=np.concatenate((np.where(wrap, genome_size, ends), ends[wrap]))
+    return piece_starts, piece_ends
+
+#This function adds 'weight' to every position covered by the intervals, directly into an existing genome_array
+def addCoverage(genome_array, starts, ends, weight=1):
+    genome_size=len(genome_array)-1
+    piece_starts, piece_ends=splitCircularIntervals(starts, ends, genome_size)
+    #Difference array: +weight at the start of each piece and -weight right after its end
+    #bincount does the scatter-add of all pieces in one call, even when several pieces share the same position
+    diff=np.bincount(piece_starts, minlength=genome_size+2)-np.bincount(piece_ends+1, minlength=genome_size+2)
+    genome_array+=(np.cumsum(diff[:genome_size+1])*weight).astype(genome_array.dtype, copy=False)
+    return genome_array
+
+#This function creates genome_array for a genome with genome_size nucleotides and registers the coverage of the given intervals
+#Returns a compact numpy integer array with genome_size+1 positions (position 0 is not used)
+def buildCoverageArray(genome_size, starts=(), ends=(), weight=1, dtype=np.int32):
+    genome_array=np.zeros(genome_size+1, dtype=dtype)
+    return addCoverage(genome_array, starts, ends, weight)
@@ -19,20 +19,41 @@
 
 
 import sys
+import re
+import numpy as np
 import os.path
 from os import path
-
-
-def checkInputFiles():
+from packedGenome import readPackedOrFasta
+from gffLoader import loadGff
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from geneExtraction import extractFeature, childrenByParent
+from stageMetrics import NO_METRICS
+
+#Genes of interest (GOI). A gene is selected when its name starts with one of them
+GOI={"rrnL","rps3","nad2","nad3","atp9","cox2","nad4l","nad5","cob","cox1","nad1","nad4","atp8","atp6","rrnS","cox3","nad6"}
+
+def printUsage():
+    print("\n--------------------------------------------------------------------------------------------\n")
+    print ("\nUsage:\npython getGeneSeqGff.py [file_path_name.gff] [file_path_name.fasta] [--spliced] [--unstranded] [--bundle] [--metrics[=file.json]] [--profile[=file.prof]]\n\n")
+    print ("\nBatch usage:\npython getGeneSeqGff.py --batch=[folder] [--workers=N] [--output=folder] [--spliced] [--unstranded] [--bundle] [--metrics] [--profile]\n")
+    print ("Genes in the minus strand are reverse complemented, unless --unstranded is given")
+    print ("With --spliced, each gene is assembled from its CDS (or exons), leaving the introns out")
+    print ("With --bundle, the gff and fasta files are read once and kept in a binary '.gff.bundle.npz' file (genomeBundle.py), loaded by the next runs")
+    print ("--metrics saves the wall time, CPU time and peak memory of each stage (input parsing, gene extraction and output writing) in a JSON file")
+    print ("('_GOI.fasta.metrics.json', or '[genome ID].GOI.metrics.json' in the output folder of a batch) and --profile saves a cProfile dump ('.prof')")
+    print ("The folder is searched for subfolders with one '.gff' and one '.fasta' file each (as created by getGffFastaFilesNCBI.py)")
+    print ("Each gene of interest is saved in its own fasta file (cox1.fasta, nad5.fasta...) with the sequences of all genomes (default folder: [folder]/GOI)")
+    print ("In batch mode, names are matched ignoring the case (nad4L is saved in nad4l.fasta). Only the 'gene' rows of the gff files are saved, one sequence per gene\n")
+    print("\n--------------------------------------------------------------------------------------------\n")
+    sys.exit(0)
+
+def checkInputFiles(arguments):
     #Check if all the necessary files names are passed as arguments
-    if (len(sys.argv)!=3 or sys.argv[1].find(".gff")==-1 or sys.argv[2].find(".fasta")==-1):
-        print("\n--------------------------------------------------------------------------------------------\n")
-        print ("\nUsage:\npython getGeneSeqGff.py [file_path_name.gff] [file_path_name.fasta]\n\n")
-        print("\n--------------------------------------------------------------------------------------------\n")
-        sys.exit(0)
+    if (len(arguments)!=2 or arguments[0].find(".gff")==-1 or arguments[1].find(".fasta")==-1):
+        printUsage()
 
-    gff_file_name=sys.argv[1]
-    fasta_file_name=sys.argv[2]
+    gff_file_name=arguments[0]
+    fasta_file_name=arguments[1]
 
 
     #Check if path/files exists
@@ -44,68 +65,184 @@ def checkInputFiles():
 
     return gff_file_name, fasta_file_name
 
+#Get ID specie from gff file name, to name the '_GOI.fasta' output file
+def getOutputFileName(gff_file_name):
+    #The strip will remove '.\' that appear on console in Windows 10 before path\filename 
+    output_file_name=gff_file_name
+    if (os.name=="nt"):
+        output_file_name=output_file_name.strip(".\\")
+    return output_file_name[0:output_file_name.find(".")]+"_GOI.fasta"
+
 #Reads whole sequence from input fasta file
 def readFasta(fasta_file):
-    #Position 0 of whole_genome will not be used
-    whole_genome=" "
-    for line in fasta_file:
-        if (line.find(">")==-1):
-            whole_genome=whole_genome+line.strip()
+    #Position 0 of whole_genome will not be used. The original case of the nucleotides is kept
+    #When the fasta file was converted by packedGenome.py, the gene sequences are sliced straight from the '.pack' file
+    whole_genome=readPackedOrFasta(fasta_file, upper=False, lazy=True)
     fasta_file.close()
     return whole_genome
 
-#This function check if the gene_name is present in the whitelist array, case true, it saves the name and sequence of the gene 
-def search_genes(gene_name,gene_sequence, output_file, GOI):
-    for item in GOI:
-        if (gene_name.startswith(item)):
-            output_file.write(">"+gene_name+"\n"+gene_sequence+"\n\n")
-            break
-
-#Read the gff file to extract data.
+#This function reads the whole genome (original case) and the gff file in a table of columns (gffLoader.py)
+#With use_bundle=True both come from the bundle of the gff file (genomeBundle.py), which is created when it is missing or its files changed
+def readGenomeGff(gff_file_name, fasta_file_name, use_bundle=False):
+    if (use_bundle):
+        from genomeBundle import loadGffBundle
+        whole_genome, gff_table, gene_coverage=loadGffBundle(gff_file_name, fasta_file_name, upper=False)
+        return whole_genome, gff_table
+    whole_genome=readFasta(open(fasta_file_name,'r'))
+    with open(gff_file_name,'r') as gff_file:
+        gff_table=loadGff(gff_file)
+    return whole_genome, gff_table
+
+#This function compiles the gene whitelist in a single regular expression that matches the start of a gene name
+#By default it is the rule of the '_GOI.fasta' file: a name starting with a whitelist name, with the same case ('cox1_intron1' is a cox1 row)
+#With exact=True (batch mode), the case is ignored and the name must end after the whitelist name (at a ';', a space or the end of the text),
+#so 'nad4L' matches 'nad4l' and not 'nad4'. The longest names come first in both cases
+def compileGOI(GOI, exact=False):
+    alternatives="|".join([re.escape(item) for item in sorted(GOI, key=lambda item:(-len(item), item))])
+    if (exact):
+        return re.compile("(?:"+alternatives+r")(?=[;\s]|$)", re.IGNORECASE)
+    return re.compile(alternatives)
+
+#This generator reads the gff table and yields the whitelist name (as written in GOI), gene name and sequence of each gene of interest
 #The gff file contains 1 gene per row with several values ordered by 'tab'. Its straight forward to get the name and positions of a single gene
-#and retrieve th sequence from the whole_genome
-def readGffSelGenes(GOI, gff_file, output_file, whole_genome):
-    for line in gff_file:
-        values=line.split("\t")
-        if (len(values)==9):
-            #Start position is at index 3
-            start_gene_position=values[3]
-            #End position is at index 4
-            end_gene_position=values[4]
-            #Name is at index 8
-            gene_name=values[8][values[8].find("Name=")+5:].strip()
-            #Get gene sequence
-            gene_sequence=whole_genome[int(start_gene_position):int(end_gene_position)+1]
-            #Verify if it is on gene_whitelist to save in output file
-            search_genes(gene_name,gene_sequence,output_file,GOI)
-
-def main():
-
-    GOI={"rrnL","rps3","nad2","nad3","atp9","cox2","nad4l","nad5","cob","cox1","nad1","nad4","atp8","atp6","rrnS","cox3","nad6"}
-
-    gff_file_name, fasta_file_name=checkInputFiles()
-
-    gff_file=open(gff_file_name,'r')
-    fasta_file=open(fasta_file_name,'r')
-
-    whole_genome=readFasta(fasta_file)
+#and retrieve th sequence from the whole_genome (geneExtraction.py: strand, circular genome and, with spliced=True, the parts of the gene)
+#With genes_only=True only the 'gene' rows are read (one sequence per gene, assembled from its CDS or exons with spliced=True); otherwise
+#every row with a name of the whitelist is read, as in the '_GOI.fasta' file (gene, CDS and each part of a split gene)
+def iterSelGenes(GOI_pattern, gff_table, whole_genome, strand_aware=True, spliced=False, GOI=GOI, genes_only=False):
+    children=childrenByParent(gff_table) if spliced else None
+    canonical_names={item.lower():item for item in GOI}
+    rows=np.flatnonzero(gff_table.typeMask("gene")).tolist() if genes_only else range(len(gff_table))
+    for row in rows:
+        #Name is at index 8
+        attributes=gff_table.attributeText(row)
+        gene_name=attributes[attributes.find("Name=")+5:].strip()
+        #Verify if it is on gene_whitelist
+        match=GOI_pattern.match(gene_name)
+        if (match is None):
+            continue
+        #Get gene sequence from its start (index 3), end (index 4) and strand (index 6)
+        gene_sequence=extractFeature(gff_table, row, whole_genome, strand_aware, spliced, children)
+        yield canonical_names[match.group().lower()], gene_name, gene_sequence.decode("ascii")
+
+#Read the gff table to extract data and save the genes of interest in output file
+def readGffSelGenes(GOI_pattern, gff_table, output_file, whole_genome, strand_aware=True, spliced=False, metrics=NO_METRICS):
+    for item, gene_name, gene_sequence in iterSelGenes(GOI_pattern, gff_table, whole_genome, strand_aware, spliced):
+        with metrics.stage("output_writing"):
+            output_file.write(">"+gene_name+"\n"+gene_sequence+"\n\n")
 
-    #Get ID specie from gff file name
-    #The strip will remove '.\' that appear on console in Windows 10 before path\filename 
-    if (os.name=="nt"):
-        gff_file_name=gff_file_name.strip(".\\")
+#This function saves the genes of interest of a genome in the '_GOI.fasta' file
+#The stages are measured by metrics (stageMetrics.py), started and finished by the caller
+def saveGenesOfInterest(gff_file_name, fasta_file_name, output_file_name, strand_aware=True, spliced=False, use_bundle=False, metrics=NO_METRICS):
+    with metrics.stage("input_parsing"):
+        whole_genome, gff_table=readGenomeGff(gff_file_name, fasta_file_name, use_bundle)
 
-    output_file_name=gff_file_name[0:gff_file_name.find(".")]+"_GOI.fasta"
     #Open output file with '_GOI.fasta' extension
     output_file=open(output_file_name,'w')
 
-    readGffSelGenes(GOI,gff_file,output_file, whole_genome)
+    with metrics.stage("gene_extraction"):
+        readGffSelGenes(compileGOI(GOI),gff_table,output_file, whole_genome, strand_aware, spliced, metrics)
 
-    gff_file.close()
     output_file.close()
     print("\n\n____________________________________________________________")
     print("\nResults saved in: "+output_file_name)
     print("____________________________________________________________\n\n\n")
 
+#This function finds the genomes of a batch folder: every subfolder (and the folder itself) with exactly one '.gff' and one '.fasta' file
+def readBatchGenomes(batch_folder):
+    genomes=[]
+    folders=[path.normpath(batch_folder)]+sorted([path.normpath(path.join(batch_folder,folder)) for folder in os.listdir(batch_folder) if path.isdir(path.join(batch_folder,folder))])
+    for folder in folders:
+        genome_files=[]
+        for extension in (".gff",".fasta"):
+            genome_files.append([path.join(folder,file_name) for file_name in sorted(os.listdir(folder)) if file_name.endswith(extension)])
+        if (all(len(file_names)==1 for file_names in genome_files)):
+            genomes.append(tuple(file_names[0] for file_names in genome_files))
+    return genomes
+
+#This function extracts the genes of interest of a genome of a batch in a worker process
+#Returns the genome files, the list of (whitelist name, gene name, sequence) and the error (an empty string when there is none)
+#metrics_options (stageMetrics.batchMetricsOptions) turns on the metrics and profile files of the genome, saved in output_folder
+def extractBatchGenome(genome_files, GOI_items, strand_aware=True, spliced=False, use_bundle=False, metrics_options={}, output_folder=""):
+    import contextlib
+    from stageMetrics import metricsFromOptions
+    gff_file_name, fasta_file_name=genome_files
+    try:
+        GOI_pattern=compileGOI(GOI_items, exact=True)
+        metrics=metricsFromOptions(metrics_options, path.join(output_folder, batchGenomeID(gff_file_name)+".GOI"))
+        metrics.start()
+        try:
+            with open(os.devnull,'w') as null_output, contextlib.redirect_stdout(null_output):
+                with metrics.stage("input_parsing"):
+                    whole_genome, gff_table=readGenomeGff(gff_file_name, fasta_file_name, use_bundle)
+                with metrics.stage("gene_extraction"):
+                    return genome_files, list(iterSelGenes(GOI_pattern, gff_table, whole_genome, strand_aware, spliced, GOI_items, genes_only=True)), ""
+        finally:
+            metrics.finish({"files":list(genome_files)})
+    except Exception as error:
+        return genome_files, [], type(error).__name__+": "+str(error)
+
+#The genome ID of a batch is the gff file name up to the first '.'
+def batchGenomeID(gff_file_name):
+    genome_ID=path.basename(gff_file_name)
+    return genome_ID[0:genome_ID.find(".")]
+
+#This function extracts the genes of interest of all genomes of a batch folder in a pool of worker processes
+#The genes are written, as the genomes finish, in one multi-fasta file per gene of interest. The name of each sequence is 'genomeID|gene_name',
+#with the gene name up to the first ';' (the value of the Name attribute)
+def runBatch(batch_folder, workers, output_folder, strand_aware=True, spliced=False, use_bundle=False, metrics_options={}):
+    import concurrent.futures
+    genomes=readBatchGenomes(batch_folder)
+    os.makedirs(output_folder, exist_ok=True)
+    output_files={}
+    error_genomes=""
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            for genome_files, genes, error in executor.map(extractBatchGenome, genomes, [sorted(GOI)]*len(genomes), [strand_aware]*len(genomes), [spliced]*len(genomes), [use_bundle]*len(genomes),
+                [metrics_options]*len(genomes), [output_folder]*len(genomes)):
+                genome_ID=batchGenomeID(genome_files[0])
+                print(genome_ID+": "+str(len(genes))+" genes of interest"+(" - "+error if error!="" else ""))
+                if (error!=""):
+                    error_genomes=error_genomes+genome_files[0]+"\n"
+                for item, gene_name, gene_sequence in genes:
+                    if (item not in output_files):
+                        output_files[item]=open(path.join(output_folder, item+".fasta"),'w')
+                    output_files[item].write(">"+genome_ID+"|"+gene_name.split(";")[0]+"\n"+gene_sequence+"\n\n")
+    finally:
+        for output_file in output_files.values():
+            output_file.close()
+
+    print("\n\n____________________________________________________________")
+    print("\n"+str(len(genomes))+" genomes processed. Results saved in: "+output_folder+" ("+str(len(output_files))+" gene files)")
+    if (len(error_genomes)>0):
+        print("\nThe following genomes returned an error:\n"+error_genomes)
+    print("____________________________________________________________\n\n\n")
+
+#The genes are saved by mitogenomesApi.py (runGenesOfInterest and runGenesOfInterestBatch), which imports the modules of each option only when it is given
+def main():
+    import mitogenomesApi
+
+    arguments, options=splitOptions(sys.argv[1:])
+    strand_aware=options.get("unstranded") is not True
+    spliced=options.get("spliced") is True
+    use_bundle=options.get("bundle") is True
+    if (hasUnknownOptions(options, ("spliced","unstranded","bundle","metrics","profile","batch","workers","output"))):
+        printUsage()
+
+    if ("batch" in options):
+        #Check the batch folder, the number of workers (default: number of CPUs) and the output folder
+        workers=intOption(options, "workers", os.cpu_count() or 1)
+        if (options["batch"] is True or len(arguments)>0 or workers is None or options.get("output") is True):
+            printUsage()
+        if (path.isdir(options["batch"])==False):
+            print("\n--------------------------------------------------------------------------------------------\n")
+            print("\nFolder not found! Check the path and folder name.\n")
+            print("\n--------------------------------------------------------------------------------------------\n")
+            exit(0)
+        mitogenomesApi.runGenesOfInterestBatch(options["batch"], workers, options.get("output"), strand_aware, spliced, use_bundle, options)
+        return
+
+    gff_file_name, fasta_file_name=checkInputFiles(arguments)
+    mitogenomesApi.runGenesOfInterest(gff_file_name, fasta_file_name, strand_aware, spliced, use_bundle, options)
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
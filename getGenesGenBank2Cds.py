@@ -18,30 +18,45 @@
 # -*- Coding: UTF-8 -*-
 #coding: utf-8
 import sys
-import urllib.request
 import re
+import os
 import os.path
 from os import path
+import tempfile
+import xml.etree.ElementTree as ET
+from urllib.parse import urlencode
+import numpy as np
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from ncbiDownloader import Downloader
+from gbseqParser import iterGBSeqRecords
+from fetchCache import cacheFromOptions
+from genomeCoverage import buildCoverageArray
+
+#Base URL of the NCBI E-utilities. It can be changed with --base-url (e.g. to a local test server)
+EUTILS_URL="https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+#Message of efetch when no record was found
+EMPTY_RESULT="<ERROR>Empty result - nothing to do</ERROR>"
+#Report type of the xml files in the download cache
+CACHE_REPORT="gbseq"
 
 #This function reads the target(s) id(s) specie(s) from a 'txt' file
 def readIDs(fileName_txt):
     ids_file=open(fileName_txt,'r')
     query_IDs = []
     for line in ids_file:
-        #the '[accn]' substring is added as requirement by NCBI API
-        query_IDs.append(line.rstrip()+"[accn]")
+        #Empty lines are skipped. The '[accn]' substring is added as requirement by NCBI API
+        if (line.strip()!=""):
+            query_IDs.append(line.strip()+"[accn]")
     ids_file.close()
     return query_IDs
 
-#This function will try to retrieve the data of a target specie using NCBI API. The result is a xml string with all data.
-def getXMLNCBI(str_ID):
-    urlBase = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
-
+#This function will try to retrieve the data of a target specie using NCBI API. The result is saved in output_xml_file_name, a xml file with all data.
+#Returns False (and no file is created) if NCBI returned an empty result
+def getXMLNCBI(str_ID, downloader, output_xml_file_name, urlBase=EUTILS_URL):
     #create URL for esearch
-    url = urlBase+"esearch.fcgi?db=nuccore&term="+str_ID+"&usehistory=y"
-    f = urllib.request.urlopen(url)
+    url = downloader.buildURL(urlBase+"esearch.fcgi", {"db":"nuccore","term":str_ID,"usehistory":"y"})
     #Read xml from url
-    xml = f.read()
+    xml = downloader.fetch(url)
     strXml=xml.decode("utf-8")
 
     #If WebEnv e QueryKey exists in this firstxml, fetch the URL query 
@@ -51,111 +66,89 @@ def getXMLNCBI(str_ID):
     objRe = re.search('<QueryKey>(\d+)<\/QueryKey>',strXml)
     queryKey = objRe.group()
     queryKey = queryKey[10:len(queryKey)-11]
-    #URL efetch
-    url = urlBase+"efetch.fcgi?db=nuccore&query_key="+queryKey+"&WebEnv="+webEnv+"&rettype=gb&retmode=xml"
-    f = urllib.request.urlopen(url)
-    xml_esearch_bin = f.read()
-    xml_esearch = xml_esearch_bin.decode("utf-8")
-    return xml_esearch
-
-#This function generates xml and cds files with the data retrieved from NCBI. The CDS file will contain all the annotated genes within the genome of a specie
-def generateXMLCDS(item, xml_esearch, key_words):
-
-    genome_ID=""
-    genome_size=0
-    genome_size_CDS=0
-    #To treat gene overlapping, the array cds_vector will store the nucleotides positons that are part of a coding region
-    #If a nucleotide is part of CDS, then its position on cds_vector will be '1', while the positions with '0' will represent the nucleotides of non coding region
-    cds_vector=[]
-    #The index_key_words is a counter that controls the exploration of the ordered indendation and alignment in the xml format, retrieving the gene data when found
-    index_key_words=0
-
-    #Open output files .xml and .cds
-    output_xml_file=open(item[:len(item)-6]+".xml",'w')
-    output_cds_file=open(item[:len(item)-6]+".cds","w")
-    #List that stores start and end positions of a gene
-    rangeCDS=[]
-    for line in xml_esearch:
-        output_xml_file.write(line+"\n")
-        #The command below search for the key_word indicated by index_key_words in the present line of the xml
-        id_str_found=line.find(key_words[index_key_words])
-        if(id_str_found!=-1):
-            #if it is the first index_key_word, get the genome ID and set to next key_word 
-            if (index_key_words==0):
-                genome_ID=line[id_str_found+len(key_words[index_key_words]):line.find("<",id_str_found+1)]
-                index_key_words=index_key_words+1
-            #If it is the second one, get genome total size and set to next key_word 
-            elif (index_key_words==1):
-                genome_size=int(line[id_str_found+len(key_words[index_key_words]):line.find("<",id_str_found+1)])
-                #Instantiate cds_vector with size + 1 of the whole genome. The 0 position will not be used
-                cds_vector = [0]*(genome_size+1)
-                genome_size_CDS=0
-                index_key_words=index_key_words+1
-            #In the third key_word, get specie name header, write in screen and cds file and set to next key_word
-            elif (index_key_words==2):
-                output_cds_file.write(line[id_str_found+len(key_words[index_key_words]):line.find("<",id_str_found+1)]+"\n")
-                output_cds_file.write("Genome ID: "+genome_ID+"\n")
-                output_cds_file.write("Genome size: "+str(genome_size)+"\n")
-                output_cds_file.write("Genes:\n")
-                print(line[id_str_found+len(key_words[index_key_words]):line.find("<",id_str_found+1)])
-                print("Genome ID: "+genome_ID)
-                print("Genome size: "+str(genome_size))
-                index_key_words=index_key_words+1
-            #Here we get the information if the next data is part of a gene and go further into the xml with another key_word
-            elif (index_key_words==3):
-                index_key_words=index_key_words+1
-            #In the fifth one, we get the string with the start and end positions of the gene, calling a function that print the values on screen and cds file, 
-            #besides marking the nuclotides positions of the gene on cds_vector
-            elif (index_key_words==4):
-                #Treat a Join if necessary
-                if (line.find("join")==-1):
-                    rangeCDS.append(re.sub('[^0-9.]','',line))
-                else:
-                    aux_rangeCDS=re.sub('[^0-9.,]','',line)
-                    rangeCDS.append(aux_rangeCDS[:aux_rangeCDS.find(",")])
-                    rangeCDS.append(aux_rangeCDS[aux_rangeCDS.find(",")+1:])
-                index_key_words=index_key_words+1
-            #We go further into the xml indendation
-            elif (index_key_words==5):
-                index_key_words=index_key_words+1
-            #And get the gene name, printing on screen and cds file
-            elif (index_key_words==6):
-                gene_name=line[line.find("<GBQualifier_value>")+19:line.find("</GBQualifier_value>",18)]
-                for cds_range in rangeCDS:
-                    write_start_end_gene(cds_range,output_cds_file,cds_vector)
-                    output_cds_file.write("#"+gene_name+"\n")
-                    print(" ("+str(gene_name)+")")
-                #Then we retrocede 3 positions in index_key_value to look for another genes
-                index_key_words=index_key_words-3
-                #And clear rangeCDS
-                rangeCDS=[]
+    #URL efetch. The xml is written to the file as it arrives
+    url = downloader.buildURL(urlBase+"efetch.fcgi", {"db":"nuccore","query_key":queryKey,"WebEnv":webEnv,"rettype":"gb","retmode":"xml"})
+    return downloader.fetchToFile(url, output_xml_file_name, EMPTY_RESULT)
+
+#This function retrieves the data of several species with only two requests: the IDs are posted to the NCBI history server (EPost)
+#and all GenBank records are fetched at once (EFetch) to output_xml_file_name, a xml file with one GBSeq element per record found
+#Returns False (and no file is created) when none of the IDs is valid
+def getXMLNCBIBatch(str_IDs, downloader, output_xml_file_name, urlBase=EUTILS_URL):
+    #The IDs go in the body of a POST request, so the list can be long
+    body=urlencode({"db":"nuccore","id":",".join(str_IDs)}).encode("utf-8")
+    strXml=downloader.fetch(downloader.buildURL(urlBase+"epost.fcgi", {}), body).decode("utf-8")
+    objWebEnv = re.search('<WebEnv>(\S+)<\/WebEnv>',strXml)
+    objQueryKey = re.search('<QueryKey>(\d+)<\/QueryKey>',strXml)
+    if (objWebEnv is None or objQueryKey is None):
+        return False
+    url = downloader.buildURL(urlBase+"efetch.fcgi", {"db":"nuccore","query_key":objQueryKey.group(1),"WebEnv":objWebEnv.group(1),
+        "rettype":"gb","retmode":"xml","retstart":0,"retmax":len(str_IDs)})
+    return downloader.fetchToFile(url, output_xml_file_name, EMPTY_RESULT)
+
+#This function generates the cds file of a GenBank record (read by gbseqParser) with the data retrieved from NCBI. The CDS file will contain all the annotated genes within the genome of a specie
+#Every part of a gene location (join, order, complement, origin-spanning genes) is written in a line start;end#gene_name
+def generateCDS(str_ID, record):
+
+    genome_ID=record.locus
+    genome_size=record.length
+    #To treat gene overlapping, the coverage of every nucleotide of the genome is counted, and the nucleotides covered by at least one gene are part of a coding region
+    starts=[]
+    ends=[]
+
+    #Open output file .cds
+    output_cds_file=open(str_ID+".cds","w")
+    #Write specie name header, genome ID and size on screen and cds file
+    output_cds_file.write(record.definition+"\n")
+    output_cds_file.write("Genome ID: "+genome_ID+"\n")
+    output_cds_file.write("Genome size: "+str(genome_size)+"\n")
+    output_cds_file.write("Genes:\n")
+    print(record.definition)
+    print("Genome ID: "+genome_ID)
+    print("Genome size: "+str(genome_size))
+    for feature in record.features:
+        #The gene name is in the 'gene' qualifier (or in the first qualifier when there is not one)
+        gene_name=feature.qualifier("gene", feature.qualifiers[0][1] if feature.qualifiers else "")
+        for start, end, strand in feature.parts:
+            print("\t\t"+str(start)+"\t"+str(end), end = '')
+            output_cds_file.write(str(start)+";"+str(end)+"#"+gene_name+"\n")
+            print(" ("+str(gene_name)+")")
+            starts.append(start)
+            ends.append(end)
+    #Genes with a location that is not supported (e.g. gap(), bond()) are not in the cds file
+    for key, location in record.skipped_features:
+        print("\t\tSkipped "+key+" with unsupported location: "+location)
 
     #Get the number of nucleotides in coding regions
-    genome_size_CDS=sum(cds_vector)
+    genome_size_CDS=int(np.count_nonzero(buildCoverageArray(genome_size, starts, ends)))
     print("Sum of nucleotides in the coding regions (CDS) of the genome ID= "+genome_ID+": "+str(genome_size_CDS)+" of "+str(genome_size)+" nucleotides ("+str(round(genome_size_CDS*100/genome_size,2))+"%)")
     output_cds_file.write("Sum of nucleotides in the coding regions (CDS) of the genome: "+str(genome_size_CDS)+" of "+str(genome_size)+" nucleotides ("+str(round(genome_size_CDS*100/genome_size,2))+"%)")   
     output_cds_file.close()
-    output_xml_file.close()
-
-#This function extracts from a string the start and end position of a gene, print the data on screen and on cds file and register the position of all nucleotides on cds_vector
-#by changing the '0' value to 1. The change only occurs once for a nucleotide.
-def write_start_end_gene(range_gene, output_cds_file,cds_vector):
-    indexRange=range_gene.find("..")
-    print("\t\t"+range_gene[:indexRange]+"\t"+range_gene[indexRange+2:], end = '')
-    output_cds_file.write(range_gene[:indexRange]+";"+range_gene[indexRange+2:])
-    for i in range(int(range_gene[:indexRange]),int(range_gene[indexRange+2:])+1):
-        if (cds_vector[i]==0):
-            cds_vector[i]=cds_vector[i]+1
+
+#This function reads the xml file of an ID (already downloaded) and generates its cds file
+#Returns False when the xml has no GBSeq record (e.g. the ID was not found) or can not be read
+def readXMLCDS(str_ID):
+    try:
+        for record in iterGBSeqRecords(str_ID+".xml"):
+            generateCDS(str_ID, record)
+            return True
+    except ET.ParseError as error:
+        print("Invalid xml file "+str_ID+".xml: "+str(error))
+    return False
+
+def printUsage():
+    print ("\nUsage:\npython getCDSGenBank.py [file_path_name.txt] [--batch-size=N] [--api-key=NCBI_API_KEY] [--base-url=URL] [--cache-dir=DIR [--cache-ttl=days] [--cache-size=MB]]")
+    print ("\nWith --batch-size, the IDs are retrieved N at a time (EPost/EFetch) instead of one request pair per ID")
+    print ("With --cache-dir, the xml of each ID is kept in DIR and used again by the next runs (default: for 30 days, up to 2048 MB)")
+    sys.exit(0)
 
 #Function to check if files are OK
-def checkInputFiles():
+def checkInputFiles(arguments):
 
     #Check if all the necessary files names are passed as arguments
-    if (len(sys.argv)!=2 or sys.argv[1].find(".txt")==-1):
-        print ("\nUsage:\npython getCDSGenBank.py [file_path_name.txt]")
-        sys.exit(0)
+    if (len(arguments)!=1 or arguments[0].find(".txt")==-1):
+        printUsage()
 
-    fileName_txt=sys.argv[1]
+    fileName_txt=arguments[0]
 
     #Check if path/files exists
     if (path.exists(fileName_txt)==False):
@@ -166,26 +159,88 @@ def checkInputFiles():
 
 def main():
     
-    fileName_txt=checkInputFiles()
+    arguments, options=splitOptions(sys.argv[1:])
+    fileName_txt=checkInputFiles(arguments)
+
+    #Number of IDs per request (batched mode), NCBI API key and URL of the E-utilities
+    batch_size=intOption(options, "batch-size", 1)
+    api_key=options.get("api-key")
+    urlBase=options.get("base-url", EUTILS_URL)
+    if (hasUnknownOptions(options, ("batch-size","api-key","base-url","cache-dir","cache-ttl","cache-size")) or batch_size is None or api_key is True or urlBase is True):
+        printUsage()
+    if (not urlBase.endswith("/")):
+        urlBase=urlBase+"/"
+    try:
+        cache=cacheFromOptions(options)
+    except ValueError:
+        printUsage()
 
     query_IDs=readIDs(fileName_txt)
 
-    #The key words are used to read the '.xml' format return by NCBI API and extract the genes data from it
-    key_words=["<GBSeq_locus>", "<GBSeq_length>", "<GBSeq_definition>", "<GBFeature_key>gene</GBFeature_key>", "<GBFeature_location>","<GBQualifier_name>","<GBQualifier_value>"]
     #This variable store ids that returns a empty result
     error_ids=""
 
-    for item in query_IDs:
-        print("\n\nQuerying ID: "+item[:len(item)-6]+"\n\n")
-
-        #Get xml with GenBAnk data from NCBI
-        xml_esearch=getXMLNCBI(item)
-        if (xml_esearch.find("<ERROR>Empty result - nothing to do</ERROR>")==-1):
-            xml_esearch=xml_esearch.splitlines()
-            generateXMLCDS(item,xml_esearch,key_words)
-        else:
-            error_ids=error_ids+item[:len(item)-6]+"\n"
-        print("\n--------------------------------------------------------------------------------------------\n")
+    #The requests respect the NCBI limit of 3 requests per second (10 with an API key) and reuse the same connection
+    downloader=Downloader(requests_per_second=10 if api_key else 3, api_key=api_key)
+
+    if (batch_size==1):
+        for item in query_IDs:
+            str_ID=item[:len(item)-6]
+            print("\n\nQuerying ID: "+str_ID+"\n\n")
+
+            #Get xml with GenBAnk data from the cache or from NCBI and read its record
+            #A xml without GBSeq record is an error of the ID, and is not stored in the cache
+            if (cache is not None and cache.copyTo(str_ID, CACHE_REPORT, str_ID+".xml")):
+                found=readXMLCDS(str_ID)
+            elif (getXMLNCBI(item, downloader, str_ID+".xml", urlBase)):
+                found=readXMLCDS(str_ID)
+                if (found and cache is not None):
+                    cache.put(str_ID, CACHE_REPORT, str_ID+".xml")
+            else:
+                found=False
+            if (not found):
+                error_ids=error_ids+str_ID+"\n"
+            print("\n--------------------------------------------------------------------------------------------\n")
+    else:
+        for i in range(0,len(query_IDs),batch_size):
+            batch_IDs=[item[:len(item)-6] for item in query_IDs[i:i+batch_size]]
+            #IDs in the cache are read from it, and only the others are retrieved from NCBI
+            missing_IDs=[]
+            for str_ID in batch_IDs:
+                if (cache is not None and cache.copyTo(str_ID, CACHE_REPORT, str_ID+".xml")):
+                    print("\n\nQuerying ID: "+str_ID+"\n\n")
+                    if (not readXMLCDS(str_ID)):
+                        error_ids=error_ids+str_ID+"\n"
+                    print("\n--------------------------------------------------------------------------------------------\n")
+                else:
+                    missing_IDs.append(str_ID)
+            if (len(missing_IDs)==0):
+                continue
+            #Get xml with GenBAnk data of all IDs of the batch from NCBI in a temporary file, and read it one record at a time
+            #Each record is also saved in its own xml file, as in the mode with one ID per request
+            batch_file, batch_xml_file_name=tempfile.mkstemp(suffix=".xml", dir=".")
+            os.close(batch_file)
+            try:
+                if (getXMLNCBIBatch(missing_IDs, downloader, batch_xml_file_name, urlBase)):
+                    for record in iterGBSeqRecords(batch_xml_file_name, keep_element=True):
+                        for str_ID in (record.accession_version, record.primary_accession):
+                            if (str_ID in missing_IDs):
+                                missing_IDs.remove(str_ID)
+                                print("\n\nQuerying ID: "+str_ID+"\n\n")
+                                with open(str_ID+".xml","w") as output_xml_file:
+                                    output_xml_file.write(record.toXML())
+                                if (cache is not None):
+                                    cache.put(str_ID, CACHE_REPORT, str_ID+".xml")
+                                generateCDS(str_ID, record)
+                                print("\n--------------------------------------------------------------------------------------------\n")
+                                break
+            finally:
+                if (os.path.exists(batch_xml_file_name)):
+                    os.remove(batch_xml_file_name)
+            for str_ID in missing_IDs:
+                print("\n\nQuerying ID: "+str_ID+"\n\n")
+                error_ids=error_ids+str_ID+"\n"
+                print("\n--------------------------------------------------------------------------------------------\n")
         
     #If some ID returned empty, list them
     if (len(error_ids)>0):
@@ -4,7 +4,7 @@
 #Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo, 
 #Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
 
-#This script download the gff and fasta files using the curl command
+#This script download the gff and fasta files from NCBI, several IDs at a time, respecting the NCBI limit of requests per second
 #Use a txt file to get data from one or more species
 #As result it will create a folder with fasta and gff files for each specie in the txt file
 
@@ -16,30 +16,44 @@
 #coding: utf-8
 
 import sys
-import subprocess
 import os.path
+import concurrent.futures
 from os import path
 from pathlib import Path
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from ncbiDownloader import Downloader, DownloadError
+from fetchCache import cacheFromOptions
+
+#URL used to retrieve the gff3 and fasta reports of an ID
+BASE_URL="https://www.ncbi.nlm.nih.gov/sviewer/viewer.cgi"
 
 #This function reads the target(s) id(s) specie(s) from a 'txt' file
 def readIDs(fileName_txt):
     ids_file=open(fileName_txt,'r')
     query_IDs = []
     for line in ids_file:
-        query_IDs.append(line.rstrip())
+        #Empty lines are skipped
+        if (line.strip()!=""):
+            query_IDs.append(line.strip())
     ids_file.close()
     return query_IDs
 
-def checkInputFiles():
+def printUsage():
+    print("\n--------------------------------------------------------------------------------------------\n")
+    print ("\nUsage:\npython getGffFastaFilesNCBI.py [file_path_name.txt] [--workers=N] [--rate=requests_per_second] [--api-key=NCBI_API_KEY] [--base-url=URL]")
+    print ("                               [--cache-dir=DIR [--cache-ttl=days] [--cache-size=MB]]")
+    print("\nDefaults: 4 workers and 3 requests per second (10 with an API key), as recommended by NCBI")
+    print("With --cache-dir, the downloaded files are kept in DIR and used again by the next runs (default: for 30 days, up to 2048 MB)")
+    print("\n--------------------------------------------------------------------------------------------\n")
+    sys.exit(0)
+
+def checkInputFiles(arguments):
 
     #Check if all the necessary files names are passed as arguments
-    if (len(sys.argv)!=2 or sys.argv[1].find(".txt")==-1):
-        print("\n--------------------------------------------------------------------------------------------\n")
-        print ("\nUsage:\npython getGffFastaFilesNCBI.py [file_path_name.txt]")
-        print("\n--------------------------------------------------------------------------------------------\n")
-        sys.exit(0)
+    if (len(arguments)!=1 or arguments[0].find(".txt")==-1):
+        printUsage()
 
-    fileName_txt=sys.argv[1]
+    fileName_txt=arguments[0]
 
     #Check if path/files exists
     if (path.exists(fileName_txt)==False):
@@ -48,43 +62,88 @@ def checkInputFiles():
 
     return fileName_txt
 
+#This function downloads the gff and fasta files of an ID to the folder ID/
+#The files are streamed with temporary names and only receive the final names when both were downloaded, so a failed ID never leaves half files
+#With a cache (fetchCache), files already downloaded by a previous run are copied from it
+def downloadGffFasta(downloader, base_url, item, cache=None):
+    #check if folder exists
+    folder = Path(item)
+    folder_created=not folder.exists()
+    os.makedirs(item, exist_ok=True)
+    downloaded_files=[]
+    complete=False
+    try:
+        for report, extension in (("gff3",".gff"),("fasta",".fasta")):
+            url=downloader.buildURL(base_url, {"db":"nuccore","report":report,"id":item})
+            file_name=item+"/"+item+extension
+            if (cache is None):
+                found=downloader.fetchToFile(url, file_name+".new", "Failed to understand id")
+            else:
+                found=cache.fetchToFile(downloader, url, item, report, file_name+".new", "Failed to understand id")
+            if (found==False):
+                break
+            downloaded_files.append(file_name)
+        else:
+            for file_name in downloaded_files:
+                os.replace(file_name+".new", file_name)
+            complete=True
+    finally:
+        #Remove what was downloaded for an ID that failed
+        if (complete==False):
+            for file_name in downloaded_files:
+                os.remove(file_name+".new")
+            if (folder_created and len(os.listdir(item))==0):
+                os.rmdir(item)
+    return complete
+
 def main():
     
-    fileName_txt=checkInputFiles()
+    arguments, options=splitOptions(sys.argv[1:])
+    fileName_txt=checkInputFiles(arguments)
+
+    #Number of downloads at the same time, requests per second, NCBI API key and URL of the server
+    workers=intOption(options, "workers", 4)
+    api_key=options.get("api-key")
+    try:
+        rate=float(options.get("rate", 10 if api_key else 3))
+    except (TypeError, ValueError):
+        rate=0
+    base_url=options.get("base-url", BASE_URL)
+    if (hasUnknownOptions(options, ("workers","rate","api-key","base-url","cache-dir","cache-ttl","cache-size")) or workers is None or rate<=0 or api_key is True or base_url is True):
+        printUsage()
+    try:
+        cache=cacheFromOptions(options)
+    except ValueError:
+        printUsage()
 
     query_IDs=readIDs(fileName_txt)
 
     #This variable store ids that returns a empty result
     error_ids=""
 
-    for item in query_IDs:
-        print("\n\nQuerying ID: "+item+"\n\n")
-
-        #Retrieve gff file. The --insecure options is to avoid revocation function error 
-        gff_document=subprocess.check_output(["curl", "--insecure", "https://www.ncbi.nlm.nih.gov/sviewer/viewer.cgi?db=nuccore&report=gff3&id="+item])
-        gff_document_dec=gff_document.decode("utf-8")
-
-        #Retrieve fasta file. The --insecure options is to avoid revocation function error 
-        fasta_document=subprocess.check_output(["curl", "--insecure", "https://www.ncbi.nlm.nih.gov/sviewer/viewer.cgi?db=nuccore&report=fasta&id="+item])
-        fasta_document_dec=fasta_document.decode("utf-8")
-        
-        if (fasta_document_dec.find("Failed to understand id")==-1 and gff_document_dec.find("Failed to understand id")==-1):
-            #check if folder exists
-            folder = Path(item)
-            if not folder.exists():
-                #create the folder
-                os.mkdir(item)
-            #Open and write gff file
-            gff_output_file=open(item+"/"+item+".gff",'w')
-            gff_output_file.write(gff_document_dec)
-            gff_output_file.close()
-            #Open and write fasta file
-            fasta_output_file=open(item+"/"+item+".fasta",'w')
-            fasta_output_file.write(fasta_document_dec)
-            fasta_output_file.close()
-        else:
-            error_ids=error_ids+item+"\n"
-        print("\n--------------------------------------------------------------------------------------------\n")
+    #The gff and fasta files are retrieved by a pool of threads. Each thread reuses its connection with NCBI
+    #The certificate of NCBI is checked by Python; the revocation function error that required 'curl --insecure' does not happen here
+    downloader=Downloader(requests_per_second=rate, api_key=api_key)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures={executor.submit(downloadGffFasta, downloader, base_url, item, cache):item for item in query_IDs}
+        for future in concurrent.futures.as_completed(futures):
+            item=futures[future]
+            try:
+                if (future.result()):
+                    print("ID "+item+": files saved in "+item+"/")
+                else:
+                    print("ID "+item+": empty result")
+                    error_ids=error_ids+item+"\n"
+            except DownloadError as error:
+                print("ID "+item+": "+str(error))
+                error_ids=error_ids+item+"\n"
+            except Exception as error:
+                #Any other error of an ID (e.g. its folder can not be created, or NCBI sent a broken response) does not stop the other IDs
+                print("ID "+item+": "+type(error).__name__+": "+str(error))
+                error_ids=error_ids+item+"\n"
+
+    if (cache is not None):
+        print("\nFiles read from the cache: "+str(cache.hits)+", not in the cache: "+str(cache.misses))
         
     #If some ID returned empty, list them
     if (len(error_ids)>0):
@@ -94,8 +153,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
-
-    
-
-        
\ No newline at end of file
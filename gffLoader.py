@@ -0,0 +1,122 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module reads a gff3 file once into a table of columns, shared by gcContentGffFasta.py and getGeneSeqOfInterestGff.py
+#Each column of the gff file is kept in a numpy array (one position per feature):
+# -seqid_codes and type_codes - index of the seqid/type in the seqids/types lists
+# -starts and ends - 1-based positions
+# -strands - 1 for '+', -1 for '-' and 0 for '.' or '?'
+# -phases - 0, 1, 2 or -1 for '.'
+#The attributes (9th column) of all features are kept as a single block of bytes and are only split when an attribute is asked for
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+from array import array
+from urllib.parse import unquote
+import numpy as np
+
+STRAND_CODES={b"+":1, b"-":-1}
+
+class GffTable:
+    __slots__=("seqids","types","seqid_codes","type_codes","starts","ends","strands","phases","_attributes","_attribute_offsets","_columns")
+
+    def __init__(self, seqids, types, seqid_codes, type_codes, starts, ends, strands, phases, attributes, attribute_offsets):
+        self.seqids=seqids
+        self.types=types
+        self.seqid_codes=seqid_codes
+        self.type_codes=type_codes
+        self.starts=starts
+        self.ends=ends
+        self.strands=strands
+        self.phases=phases
+        self._attributes=attributes
+        self._attribute_offsets=attribute_offsets
+        #Attribute columns already parsed
+        self._columns={}
+
+    #Number of features
+    def __len__(self):
+        return self.starts.size
+
+    #Returns a boolean array telling which features are of the given type (e.g. "gene")
+    def typeMask(self, feature_type):
+        if (feature_type not in self.types):
+            return np.zeros(len(self), dtype=bool)
+        return self.type_codes==self.types.index(feature_type)
+
+    #Returns a boolean array telling which features are in the given seqid
+    def seqidMask(self, seqid):
+        if (seqid not in self.seqids):
+            return np.zeros(len(self), dtype=bool)
+        return self.seqid_codes==self.seqids.index(seqid)
+
+    #Returns the attributes (9th column) of a feature as it is in the gff file
+    def attributeText(self, row):
+        return self._attributes[self._attribute_offsets[row]:self._attribute_offsets[row+1]].decode("utf-8")
+
+    #Returns a list with the value of an attribute (e.g. "Name") for every feature, or None for the features without it
+    #The column is parsed the first time it is asked for and kept for the next calls
+    def attribute(self, name):
+        if (name not in self._columns):
+            key=name+"="
+            column=[]
+            for row in range(len(self)):
+                value=None
+                for item in self.attributeText(row).split(";"):
+                    item=item.strip()
+                    if (item.startswith(key)):
+                        value=unquote(item[len(key):])
+                        break
+                column.append(value)
+            self._columns[name]=column
+        return self._columns[name]
+
+#Lines may come from a file opened in text ('r') or binary ('rb') mode
+def _lineBytes(line):
+    if (isinstance(line, str)):
+        return line.encode("utf-8")
+    return line
+
+#This function reads a gff file (already opened) into a GffTable
+#Only lines with the 9 gff columns are features. Comment lines ('#') and the sequences after '##FASTA' are skipped
+def loadGff(gff_file):
+    seqids={}
+    types={}
+    seqid_codes=array('i')
+    type_codes=array('i')
+    starts=array('q')
+    ends=array('q')
+    strands=array('b')
+    phases=array('b')
+    attributes=bytearray()
+    attribute_offsets=array('q',[0])
+    for line in gff_file:
+        line=_lineBytes(line)
+        if (line[:1]==b"#"):
+            if (line.startswith(b"##FASTA")):
+                break
+            continue
+        values=line.split(b"\t")
+        if (len(values)!=9):
+            continue
+        seqid_codes.append(seqids.setdefault(values[0], len(seqids)))
+        type_codes.append(types.setdefault(values[2], len(types)))
+        starts.append(int(values[3]))
+        ends.append(int(values[4]))
+        strands.append(STRAND_CODES.get(values[6], 0))
+        phases.append(int(values[7]) if values[7].isdigit() else -1)
+        attributes+=values[8].rstrip(b"\r\n")
+        attribute_offsets.append(len(attributes))
+    return GffTable([seqid.decode("utf-8") for seqid in seqids], [feature_type.decode("utf-8") for feature_type in types],
+        np.frombuffer(seqid_codes, dtype=np.intc).astype(np.int32), np.frombuffer(type_codes, dtype=np.intc).astype(np.int16),
+        np.frombuffer(starts, dtype=np.int64), np.frombuffer(ends, dtype=np.int64),
+        np.frombuffer(strands, dtype=np.int8), np.frombuffer(phases, dtype=np.int8),
+        bytes(attributes), np.frombuffer(attribute_offsets, dtype=np.int64))
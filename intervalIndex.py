@@ -0,0 +1,224 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module indexes the features of a genome (genes of a gff or cds file, uORFs...) to answer which features overlap a region
+#and which feature is the nearest to a position, without marking the bases of a genome-long array
+#The features are kept in arrays sorted by start that are read as an implicit augmented interval tree (as in cgranges): the node of
+#index i at level k has its children at i-2^(k-1) and i+2^(k-1), and keeps the largest end of its subtree. A query only goes down the
+#subtrees that can reach it, so it takes logarithmic time plus the features found
+#Features and queries with start > end (or end > genome size) wrap past the origin of the circular genome
+#
+#Used as a script, it lists the genes that overlap each uORF of a uORFs file and the nearest gene to it:
+#python intervalIndex.py [file_path_name.cds or file_path_name.gff] [file_path_name.uORFs]
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import sys
+from os import path
+import numpy as np
+from genomeCoverage import splitCircularIntervals
+
+class IntervalIndex:
+    __slots__=("genome_size","starts","ends","names","_piece_starts","_piece_ends","_piece_ids","_tree","_max_level","_ends_order","_sorted_ends")
+
+    #starts and ends are 1-based and inclusive. names (optional) has one name per feature
+    def __init__(self, starts, ends, genome_size, names=None):
+        self.genome_size=genome_size
+        self.starts=np.asarray(starts, dtype=np.int64).ravel()
+        self.ends=np.asarray(ends, dtype=np.int64).ravel()
+        self.names=list(names) if names is not None else [str(i) for i in range(self.starts.size)]
+        #Features that wrap are split in two pieces. _piece_ids tells the feature of each piece
+        piece_starts, piece_ends=splitCircularIntervals(self.starts, self.ends, genome_size)
+        wrap=self.starts>np.where(self.ends>genome_size, self.ends-genome_size, self.ends)
+        piece_ids=np.concatenate((np.arange(self.starts.size), np.flatnonzero(wrap)))
+        order=np.argsort(piece_starts, kind="stable")
+        self._piece_starts=piece_starts[order]
+        self._piece_ends=piece_ends[order]
+        self._piece_ids=piece_ids[order]
+        self._tree, self._max_level=_buildTree(self._piece_starts.tolist(), self._piece_ends.tolist())
+        #Pieces sorted by end, for the nearest feature queries
+        self._ends_order=np.argsort(self._piece_ends, kind="stable")
+        self._sorted_ends=self._piece_ends[self._ends_order]
+
+    #Number of features
+    def __len__(self):
+        return self.starts.size
+
+    #Returns the ids of the pieces that overlap start..end (start <= end, no wrap)
+    def _linearOverlap(self, start, end):
+        piece_starts, piece_ends, max_ends=self._tree
+        num_pieces=len(piece_starts)
+        pieces=[]
+        #Nodes to visit: (level, index, left child already visited)
+        stack=[(self._max_level, (1<<self._max_level)-1, False)] if num_pieces>0 else []
+        while (stack):
+            level, node, left_done=stack.pop()
+            if (level<=3):
+                #Small subtrees are read in order, until a piece starts after end
+                first_node=node>>level<<level
+                for piece in range(first_node, min(first_node+(1<<(level+1))-1, num_pieces)):
+                    if (piece_starts[piece]>end):
+                        break
+                    if (piece_ends[piece]>=start):
+                        pieces.append(piece)
+            elif (not left_done):
+                stack.append((level, node, True))
+                left_child=node-(1<<(level-1))
+                #The left child can be out of the array (its subtree is not complete)
+                if (left_child>=num_pieces or max_ends[left_child]>=start):
+                    stack.append((level-1, left_child, False))
+            elif (node<num_pieces and piece_starts[node]<=end):
+                if (piece_ends[node]>=start):
+                    pieces.append(node)
+                stack.append((level-1, node+(1<<(level-1)), False))
+        return self._piece_ids[np.array(pieces, dtype=np.int64)]
+
+    #Returns the ids (indexes in starts/ends/names) of the features that overlap start..end, in increasing order
+    def overlap(self, start, end):
+        if (end>self.genome_size):
+            end=end-self.genome_size
+        if (start<=end):
+            ids=self._linearOverlap(start, end)
+        else:
+            ids=np.concatenate((self._linearOverlap(start, self.genome_size), self._linearOverlap(1, end)))
+        return np.unique(ids)
+
+    #Returns the ids of the features that contain a position
+    def at(self, position):
+        return self.overlap(position, position)
+
+    #Returns the id of the feature nearest to start..end (or to the position start) and the number of nucleotides between them
+    #The distance is 0 when they overlap, and is measured around the circular genome. Returns (None, None) if there are no features
+    def nearest(self, start, end=None):
+        if (len(self)==0):
+            return None, None
+        if (end is None):
+            end=start
+        if (end>self.genome_size):
+            end=end-self.genome_size
+        inside=self.overlap(start, end)
+        if (inside.size>0):
+            return int(inside[0]), 0
+        #Next feature starting after the end and previous feature ending before the start. Both wrap around the origin
+        next_piece=np.searchsorted(self._piece_starts, end, side="right")%self._piece_starts.size
+        previous_piece=np.searchsorted(self._sorted_ends, start, side="left")-1
+        distance_next=(int(self._piece_starts[next_piece])-end)%self.genome_size
+        distance_previous=(start-int(self._sorted_ends[previous_piece]))%self.genome_size
+        if (distance_next<=distance_previous):
+            return int(self._piece_ids[next_piece]), distance_next
+        return int(self._piece_ids[self._ends_order[previous_piece]]), distance_previous
+
+#This function builds the implicit interval tree of pieces sorted by start. Returns the lists of starts, ends and largest end of the subtree of
+#each node, and the level of the root
+def _buildTree(piece_starts, piece_ends):
+    num_pieces=len(piece_starts)
+    max_ends=list(piece_ends)
+    if (num_pieces==0):
+        return (piece_starts, piece_ends, max_ends), 0
+    #Leaves are the even indexes. last_node follows the last node of each level, whose right child may be out of the array
+    last_node=(num_pieces-1)&~1
+    last_max=max_ends[last_node]
+    level=1
+    while ((1<<level)<=num_pieces):
+        half=1<<(level-1)
+        for node in range((half<<1)-1, num_pieces, half<<2):
+            right_max=max_ends[node+half] if node+half<num_pieces else last_max
+            max_ends[node]=max(piece_ends[node], max_ends[node-half], right_max)
+        last_node=last_node if (last_node>>level)&1 else last_node+half
+        if (last_node<num_pieces and max_ends[last_node]>last_max):
+            last_max=max_ends[last_node]
+        level=level+1
+    return (piece_starts, piece_ends, max_ends), level-1
+
+#This function reads the genome size and the genes (start, end and name) of a cds file generated by getGenesGenBank2Cds.py
+def readCdsGenes(cds_file):
+    genome_size=0
+    starts=[]
+    ends=[]
+    names=[]
+    for line in cds_file:
+        #get total genome size from cds file
+        if (line.find("Genome size: ")!=-1):
+            genome_size=int(line[13:])
+        #Get start and end positions of coding regions (genes on cds): start;end#name
+        if (line.find(";")!=-1):
+            aux_index=line.find(";")
+            line=line.strip()
+            starts.append(int(line[:aux_index]))
+            ends.append(int(line[aux_index+1:line.find("#")]))
+            names.append(line[line.find("#")+1:])
+    return genome_size, starts, ends, names
+
+#This function creates the index of the genes in a cds file
+def indexFromCds(cds_file):
+    genome_size, starts, ends, names=readCdsGenes(cds_file)
+    return IntervalIndex(starts, ends, genome_size, names)
+
+#This function creates the index of the features of a type (genes by default) in a GffTable (gffLoader.py)
+#The names come from the Name attribute (or ID when there is no Name)
+def indexFromGff(gff_table, genome_size, feature_type="gene"):
+    rows=np.flatnonzero(gff_table.typeMask(feature_type))
+    names=gff_table.attribute("Name")
+    ids=gff_table.attribute("ID")
+    return IntervalIndex(gff_table.starts[rows], gff_table.ends[rows], genome_size, [names[row] or ids[row] or "" for row in rows])
+
+#The genome size of a gff file comes from its 'region' feature (the whole sequence), or from the largest end of its features
+def gffGenomeSize(gff_table):
+    regions=gff_table.typeMask("region")
+    if (np.any(regions)):
+        return int(gff_table.ends[regions].max())
+    return int(gff_table.ends.max()) if len(gff_table)>0 else 0
+
+#This function reads the name, start and end of each uORF of a uORFs file
+def readuORFs(uORFs_file):
+    uORFs=[]
+    name_ORF=""
+    start_ORF=0
+    for line in uORFs_file:
+        if (line.startswith(">")):
+            name_ORF=line[1:].strip()
+        elif (line.startswith("+")):
+            start_ORF=int(line[1:])
+        elif (line.startswith("-")):
+            uORFs.append((name_ORF, start_ORF, int(line[1:])))
+    return uORFs
+
+def main():
+    if (len(sys.argv)!=3 or (sys.argv[1].find(".cds")==-1 and sys.argv[1].find(".gff")==-1) or sys.argv[2].find(".uORFs")==-1):
+        print("\nUsage:\npython intervalIndex.py [file_path_name.cds or file_path_name.gff] [file_path_name.uORFs]\n")
+        sys.exit(0)
+    if (path.exists(sys.argv[1])==False or path.exists(sys.argv[2])==False):
+        print("\nOne or more files not found! Check the path and file names.\n")
+        exit(0)
+
+    with open(sys.argv[1],'r') as genes_file:
+        if (sys.argv[1].find(".cds")!=-1):
+            gene_index=indexFromCds(genes_file)
+        else:
+            from gffLoader import loadGff
+            gff_table=loadGff(genes_file)
+            gene_index=indexFromGff(gff_table, gffGenomeSize(gff_table))
+    with open(sys.argv[2],'r') as uORFs_file:
+        uORFs=readuORFs(uORFs_file)
+
+    folder_name, file_name=path.split(sys.argv[2])
+    output_file_name=path.join(folder_name, file_name[0:file_name.find(".")])+".hosts.tsv"
+    with open(output_file_name,'w') as output_file:
+        output_file.write("uORF\tstart\tend\toverlapping_genes\tnearest_gene\tdistance\n")
+        for name_ORF, start_ORF, end_ORF in uORFs:
+            overlapping=[gene_index.names[gene] for gene in gene_index.overlap(start_ORF, end_ORF)]
+            nearest_gene, distance=gene_index.nearest(start_ORF, end_ORF)
+            output_file.write(name_ORF+"\t"+str(start_ORF)+"\t"+str(end_ORF)+"\t"+",".join(overlapping)+"\t"+
+                (gene_index.names[nearest_gene] if nearest_gene is not None else "")+"\t"+(str(distance) if distance is not None else "")+"\n")
+    print("\nResults saved in: "+output_file_name+"\n")
+
+if __name__ == '__main__':
+    main()
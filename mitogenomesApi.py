@@ -0,0 +1,296 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module runs the calculations of the scripts inside another Python program (e.g. a workflow engine), without command line
+#These functions return the results, without result files:
+# -readMfannotuORFs - uORFs of a Mfannot file (Mfannot2uORFs.py)
+# -iterMfannotuORFs - name and uORFs of each sequence of a Mfannot file with one or more sequences, read lazily (Mfannot2uORFs.iterMfannotRecords)
+# -uORFsGCContent - GC content of the whole genome, CDS and uORFs (GCContentuORfsCdsCirc.py). The uORFs can be a '.uORFs' file or the result of readMfannotuORFs
+# -gcContent - GC content of the whole genome and the coding regions of a gff file (gcContentGffFasta.py)
+# -genesOfInterest - sequences of the genes of interest of a gff file (getGeneSeqOfInterestGff.py)
+#The run functions do what the scripts do from the command line, with the same result files and console output, and are called by their main():
+# -runMfannotuORFs and runMfannotuORFsSplit (Mfannot2uORFs.py), runuORFsGCContent and runuORFsGCContentBatch (GCContentuORfsCdsCirc.py),
+#  runGCContent and runGCMatrix (gcContentGffFasta.py), runGenesOfInterest and runGenesOfInterestBatch (getGeneSeqOfInterestGff.py)
+#  metrics_options has the options --metrics and --profile of the scripts (e.g. {"metrics":True} or {"profile":"run.prof"}, stageMetrics.py)
+#The results are dataclasses, and errors raise exceptions (FileNotFoundError, ValueError) instead of ending the program
+#The scripts (and numpy) are only imported when a function is called, so importing this module is fast
+#
+#Example:
+#   import mitogenomesApi
+#   uORFs=mitogenomesApi.readMfannotuORFs("ID.new")
+#   result=mitogenomesApi.uORFsGCContent(uORFs, "ID.cds", "ID.fasta")
+#   print(result.gc, result.uORFs_gc, [uORF.gc_content for uORF in result.uORFs])
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+from os import path
+from dataclasses import dataclass, field
+from typing import Any, Tuple
+
+#A uORF of a Mfannot file, as saved in the '.uORFs' file
+@dataclass(frozen=True)
+class UORFRecord:
+    name: str
+    start: int
+    end: int
+    sequence: str
+
+#GC content of a uORF. sequence_cds is the sequence with the nucleotides out of coding regions replaced by '-'
+@dataclass(frozen=True)
+class UORFGCContent:
+    name: str
+    start: int
+    end: int
+    size: int
+    gc: int
+    gc_content: float
+    cds_size: int
+    gc_cds: int
+    gc_content_cds: float
+    sequence: str
+    sequence_cds: str
+
+#GC content of the whole genome and of its coding regions (gcContentGffFasta.py)
+@dataclass(frozen=True)
+class GenomeGCContent:
+    genome_size: int
+    cds_size: int
+    noncod_size: int
+    gc: int
+    gc_cds: int
+    gc_noncod: int
+
+#Final summary of GCContentuORfsCdsCirc.py and the GC content of each uORF
+#track has the value of each nucleotide of the '.csv' file (genes + 10 x uORFs, position 0 is not used), to be saved with trackWriter.writeTrack
+@dataclass(frozen=True)
+class UORFsGCContent:
+    genome_size: int
+    cds_size: int
+    noncod_size: int
+    gc: int
+    gc_cds: int
+    gc_noncod: int
+    uORFs_size: int
+    uORFs_gc: int
+    uORFs_cds_size: int
+    uORFs_gc_cds: int
+    uORFs_noncod_size: int
+    uORFs_gc_noncod: int
+    uORFs: Tuple[UORFGCContent, ...]=()
+    track: Any=field(default=None, repr=False, compare=False)
+
+#A gene of interest (getGeneSeqOfInterestGff.py): whitelist name (as written in the whitelist, e.g. nad4L), gene name (text after 'Name=' in the gff file, as in the '_GOI.fasta' file) and sequence
+@dataclass(frozen=True)
+class GeneSequence:
+    item: str
+    name: str
+    sequence: str
+
+#Receives the values of each uORF from GCContentuORfsCdsCirc.uORFsFileGCCalc, in the place of a resultsWriter.ResultsWriter
+class _UORFsCollector:
+    def __init__(self):
+        self.uORFs=[]
+
+    def write(self, *values):
+        self.uORFs.append(UORFGCContent(*values))
+
+def _checkFiles(*file_names):
+    for file_name in file_names:
+        if (not path.isfile(file_name)):
+            raise FileNotFoundError("File not found: "+str(file_name))
+
+def _checkFolder(folder_name):
+    if (not path.isdir(folder_name)):
+        raise FileNotFoundError("Folder not found: "+str(folder_name))
+
+#Ends the measurement of a run and prints the files saved by it, as the scripts do
+def _finishMetrics(metrics, file_names):
+    if (metrics.finish({"files":list(file_names)}) is not None):
+        print("Metrics saved in: "+", ".join(metrics.fileNames())+"\n")
+
+#Returns the list of uORFs (UORFRecord) of a Mfannot file, in the order of the list of genes of the file
+def readMfannotuORFs(mfannot_file_name):
+    import Mfannot2uORFs
+    _checkFiles(mfannot_file_name)
+    with open(mfannot_file_name,'r') as input_file:
+        if (input_file.readline().find("mfannot")==-1):
+            raise ValueError("The file is empty or is not a mfannot output file: "+mfannot_file_name)
+        uORfs_name_vector=[]
+        Mfannot2uORFs.getuORFSNamesMfannot(uORfs_name_vector, input_file)
+        orfs=Mfannot2uORFs.readuORFsStartEndSeq(uORfs_name_vector, input_file)
+    return [UORFRecord(name, int(start), int(end), sequence) for name, start, end, sequence in orfs]
+
+#This generator yields the name and the list of uORFs (UORFRecord) of each sequence of a Mfannot file with one or more sequences
+#The file is read only once, and only the uORFs of the current sequence are kept in memory
+def iterMfannotuORFs(mfannot_file_name):
+    import Mfannot2uORFs
+    _checkFiles(mfannot_file_name)
+    with open(mfannot_file_name,'r') as input_file:
+        for sequence_name, orfs in Mfannot2uORFs.iterMfannotRecords(input_file):
+            yield sequence_name, [UORFRecord(name, int(start), int(end), sequence) for name, start, end, sequence in orfs]
+
+#Returns the GC content of the whole genome, CDS and uORFs (UORFsGCContent)
+#uORFs is the name of a '.uORFs' file or a list of UORFRecord. use_bundle=True (genomeBundle.py) needs the name of the '.uORFs' file
+def uORFsGCContent(uORFs, cds_file_name, fasta_file_name, use_bundle=False):
+    import GCContentuORfsCdsCirc
+    from gcIndex import buildGCIndex
+    from intervalIndex import readCdsGenes
+    if (isinstance(uORFs, str)):
+        _checkFiles(uORFs, cds_file_name, fasta_file_name)
+        whole_genome, genome_size, annotation_track, uORFs_records=GCContentuORfsCdsCirc.readGenomeData(uORFs, cds_file_name, fasta_file_name, use_bundle)
+    else:
+        if (use_bundle):
+            raise ValueError("use_bundle needs the name of the uORFs file")
+        _checkFiles(cds_file_name, fasta_file_name)
+        with open(cds_file_name,'r') as cds_file:
+            genome_size, starts, ends, names=readCdsGenes(cds_file)
+        whole_genome=GCContentuORfsCdsCirc.readWholeGenome(open(fasta_file_name,'r'))
+        annotation_track=GCContentuORfsCdsCirc.trackFromGenes(genome_size, starts, ends)
+        #Same records of genomeBundle.readuORFsRecords, as if the uORFs were saved in a '.uORFs' file and read back
+        uORFs_records=[(uORF.name+"\n", int(uORF.start), int(uORF.end), uORF.sequence.upper().strip()) for uORF in uORFs]
+
+    gc_index=buildGCIndex(whole_genome, annotation_track.count("gene"))
+    collector=_UORFsCollector()
+    sum_nc_GC_ORFs, sum_nc_GC_ORFs_cds, sum_nc_ORFs, sum_nc_ORFs_cds, sum_nc_ORFs_noncod=GCContentuORfsCdsCirc.uORFsFileGCCalc(uORFs_records, annotation_track, \
+        gc_index, whole_genome, None, quiet=True, results_writer=collector)
+    sum_GC_nc, sum_nc_genome_cds, sum_GC_nc_cds=gc_index.totals()
+    summary=GCContentuORfsCdsCirc.finalSummary(genome_size, sum_nc_genome_cds, genome_size-sum_nc_genome_cds, sum_GC_nc, sum_GC_nc_cds, sum_GC_nc-sum_GC_nc_cds, \
+        sum_nc_ORFs, sum_nc_GC_ORFs, sum_nc_ORFs_cds, sum_nc_GC_ORFs_cds, sum_nc_ORFs_noncod)
+    return UORFsGCContent(uORFs=tuple(collector.uORFs), track=annotation_track.legacyArray(), **summary)
+
+#Returns the GC content of the whole genome and of the coding regions of the gff file (GenomeGCContent)
+def gcContent(gff_file_name, fasta_file_name, use_bundle=False):
+    import gcContentGffFasta
+    from genomeBundle import loadGffBundle
+    _checkFiles(gff_file_name, fasta_file_name)
+    if (use_bundle):
+        genome, gff_table, genome_array=loadGffBundle(gff_file_name, fasta_file_name)
+    else:
+        genome=gcContentGffFasta.readWholeGenome(open(fasta_file_name,'r'))
+        with open(gff_file_name,'r') as gff_file:
+            genome_array=gcContentGffFasta.populateGenomeArray(gff_file, genome.size)
+    return GenomeGCContent(*gcContentGffFasta.calcGCContent(genome_array, genome))
+
+#Returns the list of genes of interest (GeneSequence) of the gff file, in the order of the file, with one item per 'gene' row of the file
+#genes is the whitelist of gene names (default: getGeneSeqOfInterestGff.GOI), matched ignoring the case. Genes in the minus strand are reverse complemented,
+#unless strand_aware=False, and with spliced=True each gene is assembled from its CDS (or exons)
+def genesOfInterest(gff_file_name, fasta_file_name, genes=None, strand_aware=True, spliced=False, use_bundle=False):
+    import getGeneSeqOfInterestGff
+    _checkFiles(gff_file_name, fasta_file_name)
+    whole_genome, gff_table=getGeneSeqOfInterestGff.readGenomeGff(gff_file_name, fasta_file_name, use_bundle)
+    GOI_items=getGeneSeqOfInterestGff.GOI if genes is None else list(genes)
+    GOI_pattern=getGeneSeqOfInterestGff.compileGOI(GOI_items, exact=True)
+    return [GeneSequence(item, gene_name, gene_sequence) for item, gene_name, gene_sequence in \
+        getGeneSeqOfInterestGff.iterSelGenes(GOI_pattern, gff_table, whole_genome, strand_aware, spliced, GOI_items, genes_only=True)]
+
+#Saves the uORFs of a Mfannot file in its '.uORFs' file, as Mfannot2uORFs.py. Returns the name of the uORFs file
+def runMfannotuORFs(mfannot_file_name, metrics_options={}):
+    import Mfannot2uORFs
+    from stageMetrics import metricsFromOptions
+    _checkFiles(mfannot_file_name)
+    metrics=metricsFromOptions(metrics_options, Mfannot2uORFs.getOutputFileName(mfannot_file_name)+".uORFs")
+    metrics.start()
+    output_file_name=Mfannot2uORFs.saveuORFs(mfannot_file_name, metrics)
+    _finishMetrics(metrics, [mfannot_file_name])
+    return output_file_name
+
+#Saves the uORFs of each sequence of a Mfannot file in its own uORFs file, as Mfannot2uORFs.py --split. Returns the names of the uORFs files
+def runMfannotuORFsSplit(mfannot_file_name, metrics_options={}):
+    import Mfannot2uORFs
+    from stageMetrics import metricsFromOptions
+    _checkFiles(mfannot_file_name)
+    metrics=metricsFromOptions(metrics_options, mfannot_file_name)
+    metrics.start()
+    output_file_names=Mfannot2uORFs.splitMfannotFile(mfannot_file_name, metrics)
+    _finishMetrics(metrics, [mfannot_file_name])
+    return output_file_names
+
+#Saves the results of a genome ('.gct' file, track file and the --results files), as GCContentuORfsCdsCirc.py
+#Returns the final summary (UORFsGCContent, without the uORFs and the track, which are in the result files)
+def runuORFsGCContent(uORFs_file_name, cds_file_name, fasta_file_name, track_format="csv", use_bundle=False, incremental=False, quiet=False, results=None, \
+    save_gct=True, metrics_options={}):
+    import GCContentuORfsCdsCirc
+    from stageMetrics import metricsFromOptions
+    _checkFiles(uORFs_file_name, cds_file_name, fasta_file_name)
+    report_options=_reportOptions(track_format, use_bundle, incremental, quiet, results, save_gct)
+    metrics=metricsFromOptions(metrics_options, GCContentuORfsCdsCirc.getOutputFileName(uORFs_file_name)+".gct")
+    metrics.start()
+    summary=GCContentuORfsCdsCirc.processGenome(uORFs_file_name, cds_file_name, fasta_file_name, track_format, use_bundle, metrics, report_options, incremental)
+    _finishMetrics(metrics, [uORFs_file_name, cds_file_name, fasta_file_name])
+    return UORFsGCContent(**summary)
+
+#Runs the genomes of a batch (manifest file or folder) in a pool of workers (default: number of CPUs), as GCContentuORfsCdsCirc.py --batch
+#Returns the name of the table with the summaries of all genomes
+def runuORFsGCContentBatch(batch_name, workers=None, track_format="csv", use_bundle=False, incremental=False, results=None, save_gct=True, metrics_options={}):
+    import GCContentuORfsCdsCirc
+    from stageMetrics import batchMetricsOptions
+    if (not path.exists(batch_name)):
+        raise FileNotFoundError("Manifest file or folder not found: "+str(batch_name))
+    report_options=_reportOptions(track_format, use_bundle, incremental, True, results, save_gct)
+    return GCContentuORfsCdsCirc.runBatch(batch_name, workers or os.cpu_count() or 1, track_format, use_bundle, batchMetricsOptions(metrics_options), \
+        report_options, incremental)
+
+#Checks the options of runuORFsGCContent and returns its report options (GCContentuORfsCdsCirc.reportOptions)
+def _reportOptions(track_format, use_bundle, incremental, quiet, results, save_gct):
+    from trackWriter import TRACK_FORMATS
+    from resultsWriter import RESULTS_FORMATS
+    if (track_format not in TRACK_FORMATS):
+        raise ValueError("Unknown track format: "+str(track_format))
+    if (results is not None and results not in RESULTS_FORMATS):
+        raise ValueError("Unknown results format: "+str(results))
+    if (use_bundle and incremental):
+        raise ValueError("use_bundle and incremental can not be used together")
+    return {"quiet":quiet, "results":results, "gct":save_gct}
+
+#Saves the GC content of a genome in its '.gcf' file, as gcContentGffFasta.py. Returns the GC content (GenomeGCContent)
+def runGCContent(gff_file_name, fasta_file_name, use_bundle=False, metrics_options={}):
+    import gcContentGffFasta
+    from stageMetrics import metricsFromOptions
+    _checkFiles(gff_file_name, fasta_file_name)
+    output_file_name=gcContentGffFasta.getOutputFileName(fasta_file_name)
+    metrics=metricsFromOptions(metrics_options, output_file_name)
+    metrics.start()
+    values=gcContentGffFasta.processGenome(gff_file_name, fasta_file_name, output_file_name, use_bundle, metrics)
+    _finishMetrics(metrics, [gff_file_name, fasta_file_name])
+    return GenomeGCContent(*values)
+
+#Saves the GC matrix of all genomes of a folder tree, computed in a pool of workers (default: number of CPUs), as gcContentGffFasta.py --matrix
+#Returns the name of the matrix file
+def runGCMatrix(matrix_folder, workers=None, use_bundle=False, metrics_options={}):
+    import gcContentGffFasta
+    from stageMetrics import batchMetricsOptions
+    _checkFolder(matrix_folder)
+    return gcContentGffFasta.runMatrix(matrix_folder, workers or os.cpu_count() or 1, use_bundle, batchMetricsOptions(metrics_options))
+
+#Saves the genes of interest of a genome in its '_GOI.fasta' file, as getGeneSeqOfInterestGff.py. Returns the name of the file
+#As in the script, every row of the gff file whose name starts with a name of the whitelist is saved (see genesOfInterest for the gene rows only)
+def runGenesOfInterest(gff_file_name, fasta_file_name, strand_aware=True, spliced=False, use_bundle=False, metrics_options={}):
+    import getGeneSeqOfInterestGff
+    from stageMetrics import metricsFromOptions
+    _checkFiles(gff_file_name, fasta_file_name)
+    output_file_name=getGeneSeqOfInterestGff.getOutputFileName(gff_file_name)
+    metrics=metricsFromOptions(metrics_options, output_file_name)
+    metrics.start()
+    getGeneSeqOfInterestGff.saveGenesOfInterest(gff_file_name, fasta_file_name, output_file_name, strand_aware, spliced, use_bundle, metrics)
+    _finishMetrics(metrics, [gff_file_name, fasta_file_name])
+    return output_file_name
+
+#Saves the genes of interest of all genomes of a batch folder in one multi-fasta file per gene (default folder: [folder]/GOI), computed in a pool of
+#workers (default: number of CPUs), as getGeneSeqOfInterestGff.py --batch. Returns the output folder
+def runGenesOfInterestBatch(batch_folder, workers=None, output_folder=None, strand_aware=True, spliced=False, use_bundle=False, metrics_options={}):
+    import getGeneSeqOfInterestGff
+    from stageMetrics import batchMetricsOptions
+    _checkFolder(batch_folder)
+    if (output_folder is None):
+        output_folder=path.join(batch_folder,"GOI")
+    getGeneSeqOfInterestGff.runBatch(batch_folder, workers or os.cpu_count() or 1, output_folder, strand_aware, spliced, use_bundle, batchMetricsOptions(metrics_options))
+    return output_folder
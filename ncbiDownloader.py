@@ -0,0 +1,176 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module downloads documents from NCBI (or from any other http/https server with the same interface, such as a local test server)
+#Each worker thread keeps its own keep-alive connection, so consecutive downloads reuse it instead of opening a new one
+#All threads share a rate limiter, so the number of requests per second recommended by NCBI is never exceeded
+#(3 requests per second, or 10 with an API key: https://www.ncbi.nlm.nih.gov/books/NBK25497/)
+#Responses can be streamed straight to files, which are only renamed to their final name when the download is complete
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+import time
+import threading
+import http.client
+from urllib.parse import urlsplit, urlencode, urljoin
+
+#Size of the blocks read from the connection and written to the output files
+BLOCK_SIZE=65536
+#Responses with these HTTP status are tried again after a pause
+RETRY_STATUS={429,500,502,503,504}
+
+class DownloadError(Exception):
+    pass
+
+#This class spaces the requests of all threads so that at most requests_per_second requests start in each second
+class RateLimiter:
+    def __init__(self, requests_per_second):
+        self.interval=1.0/requests_per_second if requests_per_second>0 else 0.0
+        self._next_time=0.0
+        self._lock=threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now=time.monotonic()
+            start_time=max(now, self._next_time)
+            self._next_time=start_time+self.interval
+        if (start_time>now):
+            time.sleep(start_time-now)
+
+class Downloader:
+    def __init__(self, requests_per_second=3, timeout=60, retries=3, api_key=None):
+        self.rate_limiter=RateLimiter(requests_per_second)
+        self.timeout=timeout
+        self.retries=retries
+        self.api_key=api_key
+        self._local=threading.local()
+
+    #Returns the keep-alive connection of the current thread for a server, opening it if necessary
+    def _connection(self, scheme, netloc):
+        connections=getattr(self._local, "connections", None)
+        if (connections is None):
+            connections={}
+            self._local.connections=connections
+        if ((scheme,netloc) not in connections):
+            if (scheme=="https"):
+                connections[(scheme,netloc)]=http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            elif (scheme=="http"):
+                connections[(scheme,netloc)]=http.client.HTTPConnection(netloc, timeout=self.timeout)
+            else:
+                raise DownloadError("Unsupported URL scheme: "+scheme)
+        return connections[(scheme,netloc)]
+
+    def _closeConnection(self, scheme, netloc):
+        connection=getattr(self._local, "connections", {}).pop((scheme,netloc), None)
+        if (connection is not None):
+            connection.close()
+
+    #Returns the URL with the query parameters (and the API key, when there is one)
+    def buildURL(self, base_url, parameters):
+        parameters=dict(parameters)
+        if (self.api_key):
+            parameters["api_key"]=self.api_key
+        return base_url+("&" if "?" in base_url else "?")+urlencode(parameters, safe="[]:,")
+
+    #This function sends a request and calls consume(response) with the open response
+    #Broken keep-alive connections are opened again, and busy servers (429 and 5xx) are tried again after a pause
+    #Connection errors while the response is read by consume (incomplete reads, resets, timeouts) are tried again too, so consume can be called
+    #more than once and must start its work from the beginning. After the last attempt, DownloadError is raised
+    def _request(self, url, consume, body=None):
+        for attempt in range(self.retries+1):
+            url_parts=urlsplit(url)
+            path=url_parts.path or "/"
+            if (url_parts.query):
+                path=path+"?"+url_parts.query
+            self.rate_limiter.wait()
+            connection=self._connection(url_parts.scheme, url_parts.netloc)
+            try:
+                headers={"Connection":"keep-alive", "User-Agent":"mitogenomes-scripts"}
+                if (body is None):
+                    connection.request("GET", path, headers=headers)
+                else:
+                    headers["Content-Type"]="application/x-www-form-urlencoded"
+                    connection.request("POST", path, body=body, headers=headers)
+                response=connection.getresponse()
+            except (http.client.HTTPException, ConnectionError, OSError) as error:
+                self._closeConnection(url_parts.scheme, url_parts.netloc)
+                if (attempt==self.retries):
+                    raise DownloadError("Request failed: "+url+" ("+str(error)+")")
+                continue
+            if (response.status in (301,302,303,307,308) and response.getheader("Location")):
+                response.read()
+                #The Location can be relative to the URL of the request
+                url=urljoin(url, response.getheader("Location"))
+                continue
+            if (response.status in RETRY_STATUS and attempt<self.retries):
+                response.read()
+                time.sleep(2**attempt)
+                continue
+            if (response.status!=200):
+                response.read()
+                raise DownloadError("HTTP "+str(response.status)+" for "+url)
+            try:
+                result=consume(response)
+                #The response must be read to the end before the connection can be used again
+                if (not response.isclosed()):
+                    response.read()
+                #read(size) returns the blocks it received when the connection closes early, without an error
+                if (response.length):
+                    raise http.client.IncompleteRead(b"", response.length)
+            except (http.client.HTTPException, ConnectionError, OSError) as error:
+                #The connection broke in the middle of the response: it can not be used again
+                self._closeConnection(url_parts.scheme, url_parts.netloc)
+                if (attempt==self.retries):
+                    raise DownloadError("Download failed: "+url+" ("+str(error)+")")
+                continue
+            except BaseException:
+                self._closeConnection(url_parts.scheme, url_parts.netloc)
+                raise
+            if (response.will_close):
+                self._closeConnection(url_parts.scheme, url_parts.netloc)
+            return result
+        raise DownloadError("Too many redirects or retries for "+url)
+
+    #Downloads a document and returns its bytes. With body the request is a POST
+    def fetch(self, url, body=None):
+        return self._request(url, lambda response: response.read(), body)
+
+    #Downloads a document straight to output_file_name, block by block
+    #If error_marker is found in the document (e.g. "Failed to understand id"), the file is removed and False is returned
+    def fetchToFile(self, url, output_file_name, error_marker=None):
+        temporary_file_name=output_file_name+".part"
+        def consume(response):
+            marker=error_marker.encode("utf-8") if error_marker else None
+            tail=b""
+            found_marker=False
+            with open(temporary_file_name,'wb') as output_file:
+                while True:
+                    block=response.read(BLOCK_SIZE)
+                    if (not block):
+                        break
+                    #The marker can be split between two blocks, so the end of the previous block is kept
+                    if (marker is not None and not found_marker):
+                        found_marker=(tail+block).find(marker)!=-1
+                        tail=(tail+block)[-(len(marker)-1):] if len(marker)>1 else b""
+                    output_file.write(block)
+            return found_marker
+        try:
+            found_marker=self._request(url, consume)
+        except BaseException:
+            if (os.path.exists(temporary_file_name)):
+                os.remove(temporary_file_name)
+            raise
+        if (found_marker):
+            os.remove(temporary_file_name)
+            return False
+        os.replace(temporary_file_name, output_file_name)
+        return True
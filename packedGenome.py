@@ -0,0 +1,281 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This script converts a fasta file in a packed genome store, so the scripts don't need to parse the fasta text every time they run
+#Each record is packed with 2 bits per nucleotide (A=0, C=1, G=2, T=3). Nucleotides that are not A, C, G or T (N and IUPAC codes) are kept
+#as a list of exceptions (start, length, char), and lower case nucleotides as a list of (start, length) runs
+#The files created are as follow:
+# -fasta_file_name.pack - packed records, read with a memory map
+# -fasta_file_name.pack.idx - index in the spirit of the samtools '.fai' file, with one tab separated line per record:
+#   name, size, offset in the '.pack' file, number of exceptions, number of lower case runs and the original header
+#When a current '.pack' file exists next to the fasta file, GCContentuORfsCdsCirc.py, gcContentGffFasta.py and getGeneSeqOfInterestGff.py
+#load the genome from it instead of the fasta file
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import sys
+import os
+import mmap
+from os import path
+import numpy as np
+from fastaReader import FastaRecord, iterFastaRecords, readGenome
+
+PACK_EXTENSION=".pack"
+INDEX_EXTENSION=".pack.idx"
+
+#ASCII code -> 2 bit code. Every other char is packed as A (0) and registered as an exception
+ENCODE_TABLE=np.zeros(256, dtype=np.uint8)
+for code, nc_chars in enumerate(("Aa","Cc","Gg","Tt")):
+    for nc_char in nc_chars:
+        ENCODE_TABLE[ord(nc_char)]=code
+#True for the chars that can be represented with 2 bits
+PACKABLE_TABLE=np.zeros(256, dtype=bool)
+PACKABLE_TABLE[np.frombuffer(b"ACGTacgt", dtype=np.uint8)]=True
+#2 bit code -> upper case ASCII code
+DECODE_TABLE=np.frombuffer(b"ACGT", dtype=np.uint8)
+#Shifts used to get the 4 nucleotides of each byte, from the first to the last one
+SHIFTS=np.array([6,4,2,0], dtype=np.uint8)
+
+#This function returns the start (0-based) and length of every run of True values in mask
+def maskRuns(mask):
+    diff=np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    run_starts=np.flatnonzero(diff==1)
+    run_ends=np.flatnonzero(diff==-1)
+    return run_starts.astype(np.int64), (run_ends-run_starts).astype(np.int64)
+
+#This function returns the bytes of one record in the '.pack' format and its number of exceptions and lower case runs
+def packRecord(record):
+    codes=record.codes()[1:]
+    size=codes.size
+    #Pad with A to a multiple of 4 nucleotides and put 4 nucleotides in each byte
+    two_bits=np.zeros(-(-size//4)*4, dtype=np.uint8)
+    two_bits[:size]=ENCODE_TABLE[codes]
+    packed=(two_bits.reshape(-1,4)<<SHIFTS).sum(axis=1, dtype=np.uint8)
+    #Keep the 8 bytes alignment of the tables that follow
+    packed=np.concatenate((packed, np.zeros(-packed.size%8, dtype=np.uint8)))
+    #Exceptions are stored as runs of the same char (e.g. 'NNRR' gives two runs)
+    exception_positions=np.flatnonzero(~PACKABLE_TABLE[codes])
+    upper_codes=np.where((codes>=97) & (codes<=122), codes-32, codes).astype(np.uint8)
+    new_run=np.ones(exception_positions.size, dtype=bool)
+    new_run[1:]=(np.diff(exception_positions)!=1) | (upper_codes[exception_positions[1:]]!=upper_codes[exception_positions[:-1]])
+    run_index=np.flatnonzero(new_run)
+    exc_starts=exception_positions[run_index].astype(np.int64)
+    exc_lengths=np.diff(np.append(run_index, exception_positions.size)).astype(np.int64)
+    exc_chars=upper_codes[exc_starts]
+    low_starts, low_lengths=maskRuns((codes>=97) & (codes<=122))
+    data=b"".join((packed.tobytes(), exc_starts.tobytes(), exc_lengths.tobytes(), low_starts.tobytes(), low_lengths.tobytes(), exc_chars.tobytes()))
+    #The next record also starts aligned to 8 bytes
+    data=data+bytes(-len(data)%8)
+    return data, exc_starts.size, low_starts.size
+
+#This function packs all records of a fasta file. Only one record is kept in memory at a time
+#The '.pack' file is written with a temporary name and renamed at the end, so a broken run never leaves a half written store
+def packFasta(fasta_file_name):
+    pack_file_name=fasta_file_name+PACK_EXTENSION
+    index_file_name=fasta_file_name+INDEX_EXTENSION
+    fasta_stat=os.stat(fasta_file_name)
+    index_lines=["#fasta\t"+str(fasta_stat.st_size)+"\t"+str(fasta_stat.st_mtime_ns)+"\n"]
+    offset=0
+    with open(fasta_file_name,'rb') as fasta_file, open(pack_file_name+".tmp",'wb') as pack_file:
+        for record in iterFastaRecords(fasta_file, upper=False):
+            data, num_exceptions, num_lower=packRecord(record)
+            name=record.header.split(" ")[0] if record.header!="" else "record"+str(len(index_lines))
+            index_lines.append(name+"\t"+str(record.size)+"\t"+str(offset)+"\t"+str(num_exceptions)+"\t"+str(num_lower)+"\t"+record.header+"\n")
+            pack_file.write(data)
+            offset=offset+len(data)
+    os.replace(pack_file_name+".tmp", pack_file_name)
+    with open(index_file_name+".tmp",'w') as index_file:
+        index_file.writelines(index_lines)
+    os.replace(index_file_name+".tmp", index_file_name)
+    return pack_file_name
+
+#A record of the packed store. Regions are decoded straight from the memory map, only when they are asked for
+#It can be sliced as FastaRecord: record[start:end+1] returns the nucleotides from start to end (1-based)
+class PackedRecord:
+    __slots__=("name","header","size","_buffer","_offset","_num_exceptions","_num_lower")
+
+    def __init__(self, name, header, size, buffer, offset, num_exceptions, num_lower):
+        self.name=name
+        self.header=header
+        self.size=size
+        self._buffer=buffer
+        self._offset=offset
+        self._num_exceptions=num_exceptions
+        self._num_lower=num_lower
+
+    def __len__(self):
+        return self.size
+
+    #Tables of exceptions and lower case runs, read from the memory map without copying
+    def _tables(self):
+        packed_size=-(-self.size//4)
+        offset=self._offset+packed_size+(-packed_size%8)
+        n_exc=self._num_exceptions
+        n_low=self._num_lower
+        exc_starts=np.frombuffer(self._buffer, dtype=np.int64, count=n_exc, offset=offset)
+        exc_lengths=np.frombuffer(self._buffer, dtype=np.int64, count=n_exc, offset=offset+8*n_exc)
+        low_starts=np.frombuffer(self._buffer, dtype=np.int64, count=n_low, offset=offset+16*n_exc)
+        low_lengths=np.frombuffer(self._buffer, dtype=np.int64, count=n_low, offset=offset+16*n_exc+8*n_low)
+        exc_chars=np.frombuffer(self._buffer, dtype=np.uint8, count=n_exc, offset=offset+16*n_exc+16*n_low)
+        return exc_starts, exc_lengths, exc_chars, low_starts, low_lengths
+
+    #Returns the 2 bit codes (A=0, C=1, G=2, T=3) of the nucleotides from start to end (1-based, inclusive)
+    #Exceptions (N and IUPAC codes) are returned as 0
+    def twoBitCodes(self, start, end):
+        if (end<start):
+            return np.zeros(0, dtype=np.uint8)
+        first_byte=(start-1)//4
+        last_byte=(end-1)//4
+        packed=np.frombuffer(self._buffer, dtype=np.uint8, count=last_byte-first_byte+1, offset=self._offset+first_byte)
+        codes=((packed[:,None]>>SHIFTS)&3).ravel()
+        return codes[(start-1)-first_byte*4:end-first_byte*4]
+
+    #Returns the ASCII codes of the nucleotides from start to end (1-based, inclusive) as a numpy uint8 array
+    def fetchCodes(self, start, end, upper=True):
+        start=max(start,1)
+        end=min(end,self.size)
+        if (end<start):
+            return np.zeros(0, dtype=np.uint8)
+        codes=DECODE_TABLE[self.twoBitCodes(start, end)]
+        exc_starts, exc_lengths, exc_chars, low_starts, low_lengths=self._tables()
+        self._applyRuns(codes, start, exc_starts, exc_lengths, exc_chars)
+        if (not upper):
+            lower=np.zeros(codes.size, dtype=bool)
+            self._applyRuns(lower, start, low_starts, low_lengths, None)
+            codes[lower]=codes[lower]+32
+        return codes
+
+    #Writes the value of each run (or True when values is None) in the positions of the runs that overlap the region that starts at 'start' (1-based)
+    def _applyRuns(self, target, start, run_starts, run_lengths, values):
+        if (run_starts.size==0):
+            return
+        region_start=start-1
+        region_end=region_start+target.size
+        first=max(np.searchsorted(run_starts, region_start, side='right')-1, 0)
+        last=np.searchsorted(run_starts, region_end, side='left')
+        for k in range(first, last):
+            run_start=max(int(run_starts[k]), region_start)
+            run_end=min(int(run_starts[k]+run_lengths[k]), region_end)
+            if (run_end>run_start):
+                target[run_start-region_start:run_end-region_start]=True if values is None else values[k]
+
+    #Returns the nucleotides from start to end (1-based, inclusive) as bytes
+    def fetch(self, start, end, upper=True):
+        return self.fetchCodes(start, end, upper).tobytes()
+
+    #Number of G and C nucleotides from start to end (1-based, inclusive). Exceptions are packed as A, so they are never counted
+    def gcCount(self, start, end):
+        codes=self.twoBitCodes(max(start,1), min(end,self.size))
+        return int(np.count_nonzero((codes==1) | (codes==2)))
+
+    #1-based slices, as in FastaRecord: record[start:end+1]
+    def __getitem__(self, key):
+        if (isinstance(key, slice)):
+            start=1 if key.start is None else max(key.start,1)
+            end=self.size if key.stop is None else key.stop-1
+            return self.fetch(start, end, upper=False).decode("ascii")
+        return chr(self.fetchCodes(key, key, upper=False)[0])
+
+    #Returns the whole record as a numpy uint8 array of upper case ASCII codes (position 0 is not used), as FastaRecord.codes()
+    def codes(self):
+        return np.concatenate((np.array([32], dtype=np.uint8), self.fetchCodes(1, self.size)))
+
+    #Decodes the whole record in a FastaRecord
+    def toFastaRecord(self, upper=True):
+        data=bytearray(b" ")
+        data+=self.fetchCodes(1, self.size, upper).tobytes()
+        return FastaRecord(self.header, data)
+
+#A packed store opened with a memory map. The records are listed in the '.pack.idx' file
+#records keeps every record in the order of the fasta file, also when two records have the same name (record(name) returns the first one)
+class PackedGenomeStore:
+    def __init__(self, fasta_file_name):
+        self.records=[]
+        self._names={}
+        self._map=None
+        buffer=b""
+        if (os.path.getsize(fasta_file_name+PACK_EXTENSION)>0):
+            with open(fasta_file_name+PACK_EXTENSION,'rb') as pack_file:
+                self._map=mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer=self._map
+        with open(fasta_file_name+INDEX_EXTENSION,'r') as index_file:
+            for line in index_file:
+                if (line.startswith("#")):
+                    continue
+                values=line.rstrip("\n").split("\t",5)
+                record=PackedRecord(values[0], values[5], int(values[1]), buffer, int(values[2]), int(values[3]), int(values[4]))
+                self.records.append(record)
+                self._names.setdefault(record.name, record)
+
+    def record(self, name):
+        return self._names[name]
+
+    def close(self):
+        self.records=[]
+        self._names={}
+        if (self._map is not None):
+            self._map.close()
+            self._map=None
+
+#This function checks if there is a '.pack' file created from the current version of the fasta file
+def isPackCurrent(fasta_file_name):
+    if (path.exists(fasta_file_name+PACK_EXTENSION)==False or path.exists(fasta_file_name+INDEX_EXTENSION)==False):
+        return False
+    with open(fasta_file_name+INDEX_EXTENSION,'r') as index_file:
+        values=index_file.readline().rstrip("\n").split("\t")
+    fasta_stat=os.stat(fasta_file_name)
+    return len(values)==3 and values[0]=="#fasta" and values[1]==str(fasta_stat.st_size) and values[2]==str(fasta_stat.st_mtime_ns)
+
+#This function reads the whole genome of an open fasta file, from its '.pack' file when it is current
+#All records are put together in a single record, as readGenome does. With lazy=True a single record store is returned as a PackedRecord,
+#whose regions are decoded from the memory map only when they are sliced. The record is then the owner of the memory map: the store is not
+#kept, and the map is closed when the record is no longer referenced (garbage collected), so the caller has nothing to close
+def readPackedOrFasta(fasta_file, upper=True, lazy=False):
+    fasta_file_name=getattr(fasta_file, "name", None)
+    if (not isinstance(fasta_file_name, str) or not isPackCurrent(fasta_file_name)):
+        return readGenome(fasta_file, upper)
+    store=PackedGenomeStore(fasta_file_name)
+    records=list(store.records)
+    if (lazy and len(records)==1):
+        return records[0]
+    genome=FastaRecord(records[0].header if records else "", bytearray(b" "))
+    for record in records:
+        genome.data+=record.fetch(1, record.size, upper)
+    store.close()
+    return genome
+
+def checkInputFiles():
+    #Check if all the necessary files names are passed as arguments
+    if (len(sys.argv)<2 or any(fasta_file_name.find(".fasta")==-1 for fasta_file_name in sys.argv[1:])):
+        print("\n--------------------------------------------------------------------------------------------\n")
+        print("\nUsage:\npython packedGenome.py [file_path_name.fasta] [file_path_name.fasta] ...\n")
+        print("\n--------------------------------------------------------------------------------------------\n")
+        sys.exit(0)
+
+    #Check if path/files exists
+    for fasta_file_name in sys.argv[1:]:
+        if (path.exists(fasta_file_name)==False):
+            print("\n--------------------------------------------------------------------------------------------\n")
+            print("\nOne or more files not found! Check the path and file names.\n")
+            print("\n--------------------------------------------------------------------------------------------\n")
+            exit(0)
+
+    return sys.argv[1:]
+
+def main():
+    fasta_file_names=checkInputFiles()
+
+    for fasta_file_name in fasta_file_names:
+        pack_file_name=packFasta(fasta_file_name)
+        print("Packed genome saved in: "+pack_file_name)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module saves the results of each uORF of GCContentuORfsCdsCirc.py in a structured file, easier to read by other programs than the '.gct' file:
+# -tsv - one row per uORF with the columns of UORF_COLUMNS. The final summary of the genome is saved in a second file ('.summary.tsv')
+# -jsonl - one JSON object per line: {"record": "uORF", ...} for each uORF and {"record": "summary", ...} for the final summary
+#The rows are kept in memory and written in blocks of BUFFER_ROWS rows, instead of one write per value
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+import json
+
+#Results formats and the extension of their files
+RESULTS_FORMATS={"tsv":".tsv", "jsonl":".jsonl"}
+UORF_COLUMNS=("name","start","end","size","gc","gc_content","cds_size","gc_cds","gc_content_cds","sequence","sequence_cds")
+BUFFER_ROWS=1000
+
+#Returns the name of the results file of output_file_name (without extension) in the given format
+def resultsFileName(output_file_name, results_format):
+    return output_file_name+RESULTS_FORMATS[results_format]
+
+class ResultsWriter:
+    __slots__=("file_name","results_format","_file","_rows","_buffer_rows")
+
+    def __init__(self, output_file_name, results_format="tsv", buffer_rows=BUFFER_ROWS):
+        if (results_format not in RESULTS_FORMATS):
+            raise ValueError("Unknown results format: "+str(results_format)+" (formats: "+", ".join(RESULTS_FORMATS)+")")
+        self.file_name=resultsFileName(output_file_name, results_format)
+        self.results_format=results_format
+        self._file=open(self.file_name,'w')
+        self._rows=[]
+        self._buffer_rows=buffer_rows
+        if (results_format=="tsv"):
+            self._rows.append("\t".join(UORF_COLUMNS)+"\n")
+
+    #Adds the results of an uORF. The values are given in the order of UORF_COLUMNS
+    def write(self, *values):
+        if (self.results_format=="tsv"):
+            self._rows.append("\t".join([str(value) for value in values])+"\n")
+        else:
+            record={"record":"uORF"}
+            record.update(zip(UORF_COLUMNS, values))
+            self._rows.append(json.dumps(record)+"\n")
+        if (len(self._rows)>=self._buffer_rows):
+            self.flush()
+
+    def flush(self):
+        self._file.write("".join(self._rows))
+        self._rows=[]
+
+    #Writes the rows left and the final summary (a dictionary) and closes the file. Returns the names of the files saved
+    def close(self, summary=None):
+        file_names=[self.file_name]
+        if (summary is not None and self.results_format=="jsonl"):
+            record={"record":"summary"}
+            record.update(summary)
+            self._rows.append(json.dumps(record)+"\n")
+        elif (summary is not None):
+            summary_file_name=self.file_name[:-len(RESULTS_FORMATS["tsv"])]+".summary.tsv"
+            with open(summary_file_name,'w') as summary_file:
+                summary_file.write("\t".join(summary)+"\n"+"\t".join([str(value) for value in summary.values()])+"\n")
+            file_names.append(summary_file_name)
+        self.flush()
+        self._file.close()
+        return file_names
+
+    #Closes and removes the results file when it was not closed, e.g. when the calculations of the genome failed
+    def discard(self):
+        if (self._file.closed):
+            return
+        self._rows=[]
+        self._file.close()
+        if (os.path.exists(self.file_name)):
+            os.remove(self.file_name)
@@ -0,0 +1,138 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module measures the stages of a script (options --metrics and --profile):
+# -wall time, CPU time, number of calls and peak memory (tracemalloc, memory allocated by Python and numpy) of each stage, saved in a JSON file
+# -optionally, a cProfile dump of the whole run ('.prof' file, read with python -m pstats or snakeviz)
+#The time of a stage does not include the stages started inside it (e.g. the console output inside the uORF pass), so the times of the stages
+#add up to the total time. The time outside all stages is saved as 'other'
+#Tracing the memory slows the script down, so the times are only comparable between runs with the same options
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import sys
+import json
+import time
+import cProfile
+import tracemalloc
+import contextlib
+
+METRICS_EXTENSION=".metrics.json"
+PROFILE_EXTENSION=".prof"
+
+class StageMetrics:
+    #metrics_file_name: JSON file with the stages. profile_file_name: cProfile dump. Without both, the stages are not measured
+    def __init__(self, metrics_file_name=None, profile_file_name=None):
+        self.metrics_file_name=metrics_file_name
+        self.profile_file_name=profile_file_name
+        self.enabled=metrics_file_name is not None or profile_file_name is not None
+        self.stages={}
+        self._stack=[]
+        self._profiler=None
+        self._started_tracing=False
+        self._start=None
+        self._last=None
+
+    #Starts the measurement of the run
+    def start(self):
+        if (not self.enabled):
+            return
+        self.stages={}
+        self._stack=[]
+        if (self.metrics_file_name is not None and not tracemalloc.is_tracing()):
+            tracemalloc.start()
+            self._started_tracing=True
+        if (self.profile_file_name is not None):
+            self._profiler=cProfile.Profile()
+            self._profiler.enable()
+        self._start=(time.perf_counter(), time.process_time())
+        self._last=self._start
+
+    #Adds the time since the last change of stage (and the peak memory) to the stage that was running
+    def _switch(self):
+        now=(time.perf_counter(), time.process_time())
+        name=self._stack[-1] if self._stack else "other"
+        entry=self.stages.setdefault(name, {"wall_time":0.0, "cpu_time":0.0, "peak_memory":0, "calls":0})
+        entry["wall_time"]+=now[0]-self._last[0]
+        entry["cpu_time"]+=now[1]-self._last[1]
+        if (tracemalloc.is_tracing()):
+            entry["peak_memory"]=max(entry["peak_memory"], tracemalloc.get_traced_memory()[1])
+            if (hasattr(tracemalloc, "reset_peak")):
+                tracemalloc.reset_peak()
+        self._last=now
+
+    #Context manager that measures a stage: with metrics.stage("uORF_pass"): ...
+    #A stage can run several times (its times are added) and inside other stages
+    @contextlib.contextmanager
+    def stage(self, name):
+        if (not self.enabled or self._start is None):
+            yield
+            return
+        self._switch()
+        self._stack.append(name)
+        self.stages.setdefault(name, {"wall_time":0.0, "cpu_time":0.0, "peak_memory":0, "calls":0})["calls"]+=1
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    #Names of the files saved by finish()
+    def fileNames(self):
+        return [file_name for file_name in (self.metrics_file_name, self.profile_file_name) if file_name is not None]
+
+    #Ends the measurement and saves the JSON file (with the values of extra) and the cProfile dump. Returns the metrics as a dictionary
+    def finish(self, extra=None):
+        if (not self.enabled or self._start is None):
+            return None
+        self._stack=[]
+        self._switch()
+        if (self._profiler is not None):
+            self._profiler.disable()
+            self._profiler.dump_stats(self.profile_file_name)
+            self._profiler=None
+        metrics={"script":sys.argv[0], "arguments":sys.argv[1:], "date":time.strftime("%Y-%m-%d %H:%M:%S"),
+            "wall_time":self._last[0]-self._start[0], "cpu_time":self._last[1]-self._start[1]}
+        if (tracemalloc.is_tracing()):
+            metrics["peak_memory"]=max([entry["peak_memory"] for entry in self.stages.values()]+[0])
+        if (self._started_tracing):
+            tracemalloc.stop()
+            self._started_tracing=False
+        if (extra is not None):
+            metrics.update(extra)
+        metrics["stages"]=self.stages
+        if (self.profile_file_name is not None):
+            metrics["profile"]=self.profile_file_name
+        if (self.metrics_file_name is not None):
+            with open(self.metrics_file_name,'w') as metrics_file:
+                json.dump(metrics, metrics_file, indent=2)
+        self._start=None
+        return metrics
+
+#Measurements turned off, used when a script runs without --metrics and --profile
+NO_METRICS=StageMetrics()
+
+#This function creates the StageMetrics of the options --metrics[=file.json] and --profile[=file.prof] of a script
+#Without a file name, the files are named after the result file of the script (e.g. ID.gct.metrics.json and ID.gct.prof)
+def metricsFromOptions(options, output_file_name):
+    metrics_file_name=options.get("metrics")
+    profile_file_name=options.get("profile")
+    if (metrics_file_name is True):
+        metrics_file_name=output_file_name+METRICS_EXTENSION
+    if (profile_file_name is True):
+        profile_file_name=output_file_name+PROFILE_EXTENSION
+    if (metrics_file_name is None and profile_file_name is None):
+        return NO_METRICS
+    return StageMetrics(metrics_file_name, profile_file_name)
+
+#Options of the metrics that each genome of a batch receives: the files are always named after the genome
+def batchMetricsOptions(options):
+    return {name:True for name in ("metrics","profile") if name in options}
@@ -0,0 +1,229 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This script generates a synthetic circular mitogenome with all the files read by the other scripts, to measure their performance (benchmarkSuite.py)
+#The files generated are as follow:
+# -fasta - AT rich random sequence
+# -gff - region, genes (with their CDS, tRNA or rRNA). Some CDS are split by an intron. Genes overlap and some cross the origin (end > genome size)
+# -cds - the genes as written by getGenesGenBank2Cds.py (genes that cross the origin are split in start;genome size and 1;end)
+# -xml - the GenBank record (GBSeq XML) as downloaded by getGenesGenBank2Cds.py
+# -new - Mfannot output with the list of genes and the sequence blocks of the uORFs
+# -uORFs - the uORFs as written by Mfannot2uORFs.py from the Mfannot file
+#By default there are at least DEFAULT_GENES genes and DEFAULT_UORFS uORFs whatever the genome size, so even a small genome has thousands of overlapping
+#and origin-spanning features (large genomes have 1 gene per 2000 nucleotides and DEFAULT_ORF_DENSITY uORFs per 1000 nucleotides, when that is more)
+#--genes and --orf-density (uORFs per 1000 nucleotides) give the numbers instead. The same seed always generates the same files
+
+#Usage:
+#python syntheticGenome.py [output_folder] [--size=N] [--genes=N] [--orf-density=X] [--seed=N]
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import sys
+import os
+from os import path
+import numpy as np
+from commandLine import splitOptions, intOption, hasUnknownOptions
+from genomeCoverage import buildCoverageArray
+
+DEFAULT_SIZE=20000
+DEFAULT_ORF_DENSITY=0.5
+DEFAULT_GENES=1000
+DEFAULT_UORFS=2000
+DEFAULT_SEED=1
+#Gene names, with the genes of interest of getGeneSeqOfInterestGff.py, tRNAs and rRNAs
+GENE_NAMES=("cox1","cox2","cox3","cob","atp6","atp8","atp9","nad1","nad2","nad3","nad4","nad4L","nad5","nad6","rps3","rrnL","rrnS","trnM","trnW","trnP","hyp")
+#Nucleotide frequencies of an AT rich mitogenome
+NUCLEOTIDES=np.frombuffer(b"ATGC", dtype=np.uint8)
+NUCLEOTIDE_FREQUENCIES=(0.36,0.36,0.14,0.14)
+
+def printUsage():
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    print("\nUsage:\npython syntheticGenome.py [output_folder] [--size=N] [--genes=N] [--orf-density=X] [--seed=N]\n")
+    print("Defaults: "+str(DEFAULT_SIZE)+" nucleotides, "+str(DEFAULT_GENES)+" genes and "+str(DEFAULT_UORFS)+" uORFs (or 1 gene per 2000 nucleotides and "+
+        str(DEFAULT_ORF_DENSITY)+" uORFs per 1000 nucleotides, when that is more), seed "+str(DEFAULT_SEED))
+    print("\n----------------------------------------------------------------------------------------------------\n")
+    sys.exit(0)
+
+#Returns the sequence of start..end (1-based, end may pass the genome size) of a circular genome stored in bytes (position 0 is the first nucleotide)
+def circularRegion(sequence, start, end):
+    genome_size=len(sequence)
+    if (end<=genome_size):
+        return sequence[start-1:end]
+    return sequence[start-1:]+sequence[:end-genome_size]
+
+#Returns the parts of a feature: start..end, split at the origin when end passes the genome size
+def circularParts(start, end, genome_size):
+    if (end<=genome_size):
+        return [(start, end)]
+    return [(start, genome_size), (1, end-genome_size)]
+
+#This function creates the features of the genome. Returns a list of genes sorted by start: (start, end, strand, name, type, parts)
+#end is greater than the genome size when the gene crosses the origin. parts are the intervals of its CDS (or tRNA, rRNA)
+#Genes are shorter when there are many of them, so their total size stays around twice the genome size and the genome keeps non coding regions
+def randomGenes(rng, genome_size, num_genes):
+    max_size=max(60, min(3000, genome_size//4, 3*genome_size//max(num_genes,1)))
+    sizes=rng.integers(min(150, max_size//2), max_size, num_genes, endpoint=True)
+    starts=rng.integers(1, genome_size, num_genes, endpoint=True)
+    #The first genes (2, or 1 in 100 of a large number of genes) always cross the origin
+    for i in range(min(max(2, num_genes//100), num_genes)):
+        starts[i]=genome_size-sizes[i]//2
+    strands=rng.choice((1,-1), num_genes)
+    names=rng.integers(0, len(GENE_NAMES), num_genes)
+    genes=[]
+    for i in range(num_genes):
+        start=int(starts[i])
+        end=start+int(sizes[i])-1
+        name=GENE_NAMES[names[i]]
+        feature_type="tRNA" if name.startswith("trn") else ("rRNA" if name.startswith("rrn") else "CDS")
+        parts=[(start, end)]
+        #One in three protein genes has an intron in the middle
+        if (feature_type=="CDS" and i%3==0 and end-start>300):
+            middle=(start+end)//2
+            parts=[(start, middle-50), (middle+50, end)]
+        genes.append((start, end, int(strands[i]), name, feature_type, parts))
+    genes.sort(key=lambda gene:gene[0])
+    return genes
+
+#This function creates the uORFs. Returns a list sorted by start: (name, start, end). end is greater than the genome size when the uORF crosses the origin
+#The names have the same number of digits, so no name is the start of another one
+def randomuORFs(rng, genome_size, num_uORFs):
+    sizes=rng.integers(min(30, genome_size), min(900, genome_size), num_uORFs, endpoint=True)
+    starts=np.sort(rng.integers(1, genome_size, num_uORFs, endpoint=True))
+    digits=len(str(num_uORFs))
+    return [("orf"+str(i+1).zfill(digits), int(starts[i]), int(starts[i]+sizes[i]-1)) for i in range(num_uORFs)]
+
+def writeFasta(file_name, genome_ID, sequence):
+    with open(file_name,'wb') as fasta_file:
+        fasta_file.write((">"+genome_ID+" Synthetic fungus mitochondrion, complete genome\n").encode("ascii"))
+        fasta_file.write(b"\n".join([sequence[i:i+70] for i in range(0, len(sequence), 70)])+b"\n")
+
+def writeGff(file_name, genome_ID, genome_size, genes):
+    with open(file_name,'w') as gff_file:
+        gff_file.write("##gff-version 3\n#!gff-spec-version 1.21\n##sequence-region "+genome_ID+" 1 "+str(genome_size)+"\n")
+        gff_file.write(genome_ID+"\tRefSeq\tregion\t1\t"+str(genome_size)+"\t.\t+\t.\tID="+genome_ID+":1.."+str(genome_size)+
+            ";Is_circular=true;Name=MT;gbkey=Src;genome=mitochondrion\n")
+        for i, (start, end, strand, name, feature_type, parts) in enumerate(genes):
+            strand_char="+" if strand==1 else "-"
+            gff_file.write(genome_ID+"\tRefSeq\tgene\t"+str(start)+"\t"+str(end)+"\t.\t"+strand_char+"\t.\tID=gene-"+name+"-"+str(i)+";Name="+name+
+                ";gbkey=Gene;gene="+name+"\n")
+            for part_start, part_end in parts:
+                gff_file.write(genome_ID+"\tRefSeq\t"+feature_type+"\t"+str(part_start)+"\t"+str(part_end)+"\t.\t"+strand_char+"\t0\tID="+feature_type.lower()+"-"+
+                    str(i)+";Parent=gene-"+name+"-"+str(i)+";Name="+name+";gbkey="+feature_type+";product=synthetic\n")
+
+def writeCds(file_name, genome_ID, genome_size, genes):
+    starts=[]
+    ends=[]
+    with open(file_name,'w') as cds_file:
+        cds_file.write("Synthetic fungus mitochondrion, complete genome\nGenome ID: "+genome_ID.split(".")[0]+"\nGenome size: "+str(genome_size)+"\nGenes:\n")
+        for start, end, strand, name, feature_type, parts in genes:
+            for part_start, part_end in circularParts(start, end, genome_size):
+                cds_file.write(str(part_start)+";"+str(part_end)+"#"+name+"\n")
+                starts.append(part_start)
+                ends.append(part_end)
+        genome_size_CDS=int(np.count_nonzero(buildCoverageArray(genome_size, starts, ends)))
+        cds_file.write("Sum of nucleotides in the coding regions (CDS) of the genome: "+str(genome_size_CDS)+" of "+str(genome_size)+" nucleotides ("+
+            str(round(genome_size_CDS*100/genome_size,2))+"%)")
+
+#Returns the GenBank location of a list of parts: a..b, join(a..b,c..d) and complement(...) for the minus strand
+def genBankLocation(parts, strand):
+    location=",".join([str(start)+".."+str(end) for start, end in parts])
+    if (len(parts)>1):
+        location="join("+location+")"
+    if (strand==-1):
+        location="complement("+location+")"
+    return location
+
+def writeGBSeqXML(file_name, genome_ID, genome_size, sequence, genes):
+    accession=genome_ID.split(".")[0]
+    with open(file_name,'w') as xml_file:
+        xml_file.write('<?xml version="1.0" encoding="UTF-8"  ?>\n<!DOCTYPE GBSet PUBLIC "-//NCBI//NCBI GBSeq/EN" "https://www.ncbi.nlm.nih.gov/dtd/NCBI_GBSeq.dtd">\n')
+        xml_file.write("<GBSet>\n  <GBSeq>\n    <GBSeq_locus>"+accession+"</GBSeq_locus>\n    <GBSeq_length>"+str(genome_size)+"</GBSeq_length>\n")
+        xml_file.write("    <GBSeq_moltype>DNA</GBSeq_moltype>\n    <GBSeq_topology>circular</GBSeq_topology>\n")
+        xml_file.write("    <GBSeq_definition>Synthetic fungus mitochondrion, complete genome</GBSeq_definition>\n")
+        xml_file.write("    <GBSeq_primary-accession>"+accession+"</GBSeq_primary-accession>\n    <GBSeq_accession-version>"+genome_ID+"</GBSeq_accession-version>\n")
+        xml_file.write("    <GBSeq_feature-table>\n")
+        features=[("source", "1.."+str(genome_size), (("organism","Synthetic fungus"),("organelle","mitochondrion")))]
+        for start, end, strand, name, feature_type, parts in genes:
+            features.append(("gene", genBankLocation(circularParts(start, end, genome_size), strand), (("gene",name),)))
+            coding_parts=[part for part_start, part_end in parts for part in circularParts(part_start, part_end, genome_size)]
+            features.append((feature_type, genBankLocation(coding_parts, strand), (("gene",name),("product","synthetic"))))
+        for key, location, qualifiers in features:
+            xml_file.write("      <GBFeature>\n        <GBFeature_key>"+key+"</GBFeature_key>\n        <GBFeature_location>"+location+"</GBFeature_location>\n")
+            xml_file.write("        <GBFeature_quals>\n")
+            for name, value in qualifiers:
+                xml_file.write("          <GBQualifier>\n            <GBQualifier_name>"+name+"</GBQualifier_name>\n            <GBQualifier_value>"+value+
+                    "</GBQualifier_value>\n          </GBQualifier>\n")
+            xml_file.write("        </GBFeature_quals>\n      </GBFeature>\n")
+        xml_file.write("    </GBSeq_feature-table>\n    <GBSeq_sequence>"+sequence.lower().decode("ascii")+"</GBSeq_sequence>\n  </GBSeq>\n</GBSet>\n")
+
+#Writes the Mfannot file and the uORFs file that Mfannot2uORFs.py generates from it
+#Each uORF has a block with its sequence in lines of 60 nucleotides. Lines of uORFs that cross the origin keep counting after the genome size
+def writeMfannotuORFs(mfannot_file_name, uORFs_file_name, genome_ID, sequence, genes, uORFs):
+    names=[name for name, start, end in uORFs]+sorted(set([gene[3] for gene in genes]))
+    with open(mfannot_file_name,'w') as mfannot_file, open(uORFs_file_name,'w') as uORFs_file:
+        mfannot_file.write(";; mfannot v1.35 output\n>"+genome_ID.split(".")[0]+"\n;; Synthetic genome\n;; List of genes added\n")
+        for i in range(0, len(names), 3):
+            #The names are padded to the width of the columns, as Mfannot2uORFs.py reads them by position
+            mfannot_file.write(";;      "+"".join([name.ljust(21) for name in names[i:i+3]])+"\n")
+        mfannot_file.write(";; end mfannot\n")
+        for name, start, end in uORFs:
+            uORF_sequence=circularRegion(sequence, start, end).lower().decode("ascii")
+            mfannot_file.write(";     G-"+name+" ==> start\n")
+            mfannot_file.write("".join([str(start+i).ljust(8)+"  "+uORF_sequence[i:i+60]+"\n" for i in range(0, len(uORF_sequence), 60)]))
+            mfannot_file.write(";     G-"+name+" ==> end\n")
+            uORFs_file.write(">G-"+name+"\n+"+str(start)+"\n-"+str(end)+"\n@"+uORF_sequence+"\n\n")
+
+#This function generates the files of a synthetic genome in output_folder. Returns a dictionary with the file names and the number of features
+#num_genes=None and orf_density=None give the default numbers of genes and uORFs
+def generateGenome(output_folder, genome_size=DEFAULT_SIZE, num_genes=None, orf_density=None, seed=DEFAULT_SEED):
+    rng=np.random.default_rng(seed)
+    if (num_genes is None):
+        num_genes=max(DEFAULT_GENES, genome_size//2000)
+    if (orf_density is None):
+        num_uORFs=max(DEFAULT_UORFS, int(round(DEFAULT_ORF_DENSITY*genome_size/1000)))
+    else:
+        num_uORFs=int(round(orf_density*genome_size/1000))
+    genome_ID="SYN"+str(genome_size)+".1"
+    sequence=NUCLEOTIDES[rng.choice(4, genome_size, p=NUCLEOTIDE_FREQUENCIES)].tobytes()
+    genes=randomGenes(rng, genome_size, num_genes)
+    uORFs=randomuORFs(rng, genome_size, num_uORFs)
+
+    os.makedirs(output_folder, exist_ok=True)
+    file_names={extension:path.join(output_folder, genome_ID+"."+extension) for extension in ("fasta","gff","cds","xml","new","uORFs")}
+    writeFasta(file_names["fasta"], genome_ID, sequence)
+    writeGff(file_names["gff"], genome_ID, genome_size, genes)
+    writeCds(file_names["cds"], genome_ID, genome_size, genes)
+    writeGBSeqXML(file_names["xml"], genome_ID, genome_size, sequence, genes)
+    writeMfannotuORFs(file_names["new"], file_names["uORFs"], genome_ID, sequence, genes, uORFs)
+    return {"genome_ID":genome_ID, "genome_size":genome_size, "genes":len(genes), "uORFs":len(uORFs), "seed":seed, "files":file_names}
+
+def main():
+    arguments, options=splitOptions(sys.argv[1:])
+    if (len(arguments)!=1 or hasUnknownOptions(options, ("size","genes","orf-density","seed"))):
+        printUsage()
+    genome_size=intOption(options, "size", DEFAULT_SIZE)
+    num_genes=intOption(options, "genes", 1) if "genes" in options else None
+    seed=intOption(options, "seed", DEFAULT_SEED)
+    try:
+        orf_density=float(options["orf-density"]) if "orf-density" in options else None
+    except (TypeError, ValueError):
+        orf_density=-1
+    if (genome_size is None or seed is None or ("genes" in options and num_genes is None) or (orf_density is not None and orf_density<0)):
+        printUsage()
+
+    genome=generateGenome(arguments[0], genome_size, num_genes, orf_density, seed)
+    print("\n\n____________________________________________________________")
+    print("\n"+genome["genome_ID"]+": "+str(genome_size)+" nucleotides, "+str(genome["genes"])+" genes and "+str(genome["uORFs"])+" uORFs")
+    print("\nFiles saved in: "+arguments[0])
+    print("____________________________________________________________\n\n\n")
+
+if __name__ == '__main__':
+    main()
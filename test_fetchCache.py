@@ -0,0 +1,115 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of fetchCache.py: entries by accession.version, IDs without a version, expiry and size limit
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+import time
+import pytest
+from fetchCache import FetchCache, recordAccession, cacheFromOptions
+
+def gbseq(accession_version):
+    return ("<GBSet><GBSeq><GBSeq_accession-version>"+accession_version+"</GBSeq_accession-version></GBSeq></GBSet>\n").encode("utf-8")
+
+#Moves the download time of every entry of the cache seconds to the past
+def ageEntries(cache, seconds):
+    for file_name, size, used_time, download_time in cache._entries():
+        os.utime(file_name, (used_time, download_time-seconds))
+
+#Downloader that counts its calls and writes a fixed document
+class FakeDownloader:
+    def __init__(self, data):
+        self.data=data
+        self.calls=0
+
+    def fetchToFile(self, url, output_file_name, error_marker=None):
+        self.calls=self.calls+1
+        with open(output_file_name, "wb") as output_file:
+            output_file.write(self.data)
+        return error_marker is None or error_marker.encode("utf-8") not in self.data
+
+def testRecordAccession():
+    assert recordAccession("gbseq", data=gbseq("NC_1.2"))=="NC_1.2"
+    assert recordAccession("fasta", data=b">NC_3.1 Test genome\nACGT\n")=="NC_3.1"
+    assert recordAccession("gff3", data=b"##gff-version 3\n##sequence-region NC_4.5 1 100\n")=="NC_4.5"
+    assert recordAccession("gbseq", data=b"<GBSet></GBSet>\n") is None
+    assert recordAccession("fasta", data=b">NC_3 no version\n") is None
+
+def testVersionedIDExactMatch(tmp_path):
+    cache=FetchCache(str(tmp_path))
+    assert cache.put("NC_1.1", "gbseq", data=gbseq("NC_1.1"))
+    assert cache.get("NC_1.1", "gbseq") is not None
+    assert cache.get("NC_1.2", "gbseq") is None
+    assert cache.get("NC_1.1", "fasta") is None
+    assert (cache.hits, cache.misses)==(1, 2)
+
+def testUnversionedIDIsFound(tmp_path):
+    cache=FetchCache(str(tmp_path))
+    assert cache.put("NC_1", "gbseq", data=gbseq("NC_1.1"))
+    #The ID as requested and its accession.version share the same document
+    assert cache.get("NC_1", "gbseq")==cache.get("NC_1.1", "gbseq")
+    assert (cache.hits, cache.misses)==(2, 0)
+    #A versioned download does not make the ID without a version found
+    assert cache.put("NC_2.3", "gbseq", data=gbseq("NC_2.3"))
+    assert cache.get("NC_2", "gbseq") is None
+
+def testExpiredEntriesAreNotUsed(tmp_path):
+    cache=FetchCache(str(tmp_path), ttl=100)
+    cache.put("NC_1", "gbseq", data=gbseq("NC_1.1"))
+    ageEntries(cache, 50)
+    assert cache.get("NC_1", "gbseq") is not None
+    ageEntries(cache, 100)
+    assert cache.get("NC_1", "gbseq") is None
+    assert cache.get("NC_1.1", "gbseq") is None
+    assert cache._entries()==[]
+
+def testErrorsAreNotCached(tmp_path):
+    cache=FetchCache(str(tmp_path))
+    assert not cache.put("NC_1", "gbseq", data=b"<GBSet></GBSet>\n")
+    assert cache._entries()==[]
+
+def testFetchToFile(tmp_path):
+    cache=FetchCache(str(tmp_path/"cache"))
+    downloader=FakeDownloader(b"##gff-version 3\n##sequence-region NC_1.1 1 100\n")
+    output_file_name=str(tmp_path/"NC_1.gff")
+    for run in range(3):
+        assert cache.fetchToFile(downloader, "url", "NC_1", "gff3", output_file_name)
+    assert downloader.calls==1
+    with open(output_file_name, "rb") as output_file:
+        assert output_file.read()==downloader.data
+    #Results with the error marker are neither cached nor reported as found
+    error_downloader=FakeDownloader(b"Failed to understand id: NC_9\n")
+    assert not cache.fetchToFile(error_downloader, "url", "NC_9", "gff3", str(tmp_path/"NC_9.gff"), "Failed to understand id")
+    assert not cache.fetchToFile(error_downloader, "url", "NC_9", "gff3", str(tmp_path/"NC_9.gff"), "Failed to understand id")
+    assert error_downloader.calls==2
+
+def testLeastRecentlyUsedAreEvicted(tmp_path):
+    document_size=len(gbseq("NC_1.1"))
+    cache=FetchCache(str(tmp_path), max_bytes=3*document_size)
+    now=time.time()
+    for number in range(1, 4):
+        file_name=cache.path("NC_"+str(number)+".1", "gbseq")
+        cache.put("NC_"+str(number)+".1", "gbseq", data=gbseq("NC_"+str(number)+".1"))
+        os.utime(file_name, (now-100+number, now))
+    cache.get("NC_1.1", "gbseq")
+    cache.put("NC_4.1", "gbseq", data=gbseq("NC_4.1"))
+    assert [cache.get("NC_"+str(number)+".1", "gbseq") is not None for number in range(1, 5)]==[True, False, True, True]
+
+def testCacheFromOptions(tmp_path):
+    assert cacheFromOptions({}) is None
+    cache=cacheFromOptions({"cache-dir":str(tmp_path), "cache-ttl":"2", "cache-size":"1"})
+    assert (cache.ttl, cache.max_bytes)==(2*86400, 1024*1024)
+    for options in ({"cache-dir":True}, {"cache-dir":str(tmp_path), "cache-ttl":"x"}, {"cache-dir":str(tmp_path), "cache-size":"0"}):
+        with pytest.raises(ValueError):
+            cacheFromOptions(options)
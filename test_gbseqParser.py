@@ -0,0 +1,91 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of gbseqParser.py and of the cds files written from its records by getGenesGenBank2Cds.py
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import pytest
+from gbseqParser import parseLocation, iterGBSeqRecords
+import getGenesGenBank2Cds
+
+#GBSeq xml with a record per (accession, features), each feature is (key, location, gene name)
+def gbseqXML(records):
+    xml='<?xml version="1.0"?>\n<GBSet>\n'
+    for accession, features in records:
+        xml=xml+"<GBSeq><GBSeq_locus>"+accession+"</GBSeq_locus><GBSeq_length>1000</GBSeq_length><GBSeq_definition>Test "+accession+"</GBSeq_definition>"
+        xml=xml+"<GBSeq_primary-accession>"+accession+"</GBSeq_primary-accession><GBSeq_accession-version>"+accession+".1</GBSeq_accession-version>"
+        xml=xml+"<GBSeq_topology>circular</GBSeq_topology><GBSeq_feature-table>"
+        for key, location, name in features:
+            xml=xml+"<GBFeature><GBFeature_key>"+key+"</GBFeature_key><GBFeature_location>"+location+"</GBFeature_location><GBFeature_quals>"
+            xml=xml+"<GBQualifier><GBQualifier_name>gene</GBQualifier_name><GBQualifier_value>"+name+"</GBQualifier_value></GBQualifier></GBFeature_quals></GBFeature>"
+        xml=xml+"</GBSeq_feature-table><GBSeq_sequence>acgt</GBSeq_sequence></GBSeq>\n"
+    return xml+"</GBSet>\n"
+
+@pytest.mark.parametrize("location, parts", [
+    ("10..20", [(10, 20, 1)]),
+    ("<1..>300", [(1, 300, 1)]),
+    ("42", [(42, 42, 1)]),
+    ("5^6", [(5, 5, 1)]),
+    ("complement(10..20)", [(10, 20, -1)]),
+    ("join(3..100,200..300)", [(3, 100, 1), (200, 300, 1)]),
+    ("complement(join(3..100, 200..>300))", [(3, 100, -1), (200, 300, -1)]),
+    ("join(complement(50..60),70..80)", [(50, 60, -1), (70, 80, 1)]),
+    ("order(1..5,J00194.1:100..202,9..12)", [(1, 5, 1), (9, 12, 1)]),
+    ("join(990..1000,1..15)", [(990, 1000, 1), (1, 15, 1)]),
+])
+def testParseLocation(location, parts):
+    assert parseLocation(location)==parts
+
+@pytest.mark.parametrize("location", ["gap(10)", "bond(10,20)", "10..x"])
+def testParseLocationUnsupported(location):
+    with pytest.raises(ValueError):
+        parseLocation(location)
+
+def testRecordsAndSkippedFeatures(tmp_path):
+    xml_file_name=tmp_path/"batch.xml"
+    xml_file_name.write_text(gbseqXML([("NC_1", [("gene", "1..50", "cox1"), ("gene", "gap(10)", "gap"), ("CDS", "1..50", "cox1")]),
+        ("NC_2", [("gene", "complement(join(900..1000,1..20))", "nad5")])]))
+    records=list(iterGBSeqRecords(str(xml_file_name)))
+    assert [record.accession_version for record in records]==["NC_1.1", "NC_2.1"]
+    #Only the genes are kept, and the gene with an unsupported location is listed apart
+    assert [(feature.qualifier("gene"), feature.parts) for feature in records[0].features]==[("cox1", [(1, 50, 1)])]
+    assert records[0].skipped_features==[("gene", "gap(10)")]
+    assert records[1].features[0].parts==[(900, 1000, -1), (1, 20, -1)]
+    assert records[1].skipped_features==[]
+
+def testToXMLRoundTrip(tmp_path):
+    xml_file_name=tmp_path/"batch.xml"
+    xml_file_name.write_text(gbseqXML([("NC_1", [("gene", "1..50", "cox1")]), ("NC_2", [("gene", "complement(5..9)", "nad5")])]))
+    for record in iterGBSeqRecords(str(xml_file_name), keep_element=True):
+        single_file_name=tmp_path/(record.accession_version+".xml")
+        single_file_name.write_text(record.toXML())
+        single_records=list(iterGBSeqRecords(str(single_file_name)))
+        assert len(single_records)==1
+        assert (single_records[0].accession_version, single_records[0].length)==(record.accession_version, record.length)
+        assert [feature.parts for feature in single_records[0].features]==[feature.parts for feature in record.features]
+
+def testReadXMLCDS(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path/"NC_1.xml").write_text(gbseqXML([("NC_1", [("gene", "join(990..1000,1..15)", "cox1"), ("gene", "bond(3,4)", "x")])]))
+    (tmp_path/"NC_2.xml").write_text("<GBSet></GBSet>\n")
+    (tmp_path/"NC_3.xml").write_text("<GBSet><GBSeq>\n")
+    assert getGenesGenBank2Cds.readXMLCDS("NC_1")
+    assert not getGenesGenBank2Cds.readXMLCDS("NC_2")
+    assert not getGenesGenBank2Cds.readXMLCDS("NC_3")
+    cds_lines=(tmp_path/"NC_1.cds").read_text().splitlines()
+    assert cds_lines[1:6]==["Genome ID: NC_1", "Genome size: 1000", "Genes:", "990;1000#cox1", "1;15#cox1"]
+
+def testReadIDsSkipsEmptyLines(tmp_path):
+    ids_file_name=tmp_path/"ids.txt"
+    ids_file_name.write_text("NC_1\n\n   \nNC_2.1\n")
+    assert getGenesGenBank2Cds.readIDs(str(ids_file_name))==["NC_1[accn]", "NC_2.1[accn]"]
@@ -0,0 +1,63 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of gcIndex.py: interval sums from the cumulative arrays are compared with a brute-force count, also for intervals that cross the origin
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import random
+import numpy as np
+import pytest
+from fastaReader import FastaRecord
+from gcIndex import GCIndex, buildGCIndex, circularPositions, gcMask
+
+#Random genome (position 0 is not used) with lower case and N nucleotides, and a random coding array
+def randomGenome(rng, genome_size):
+    record=FastaRecord("test", bytearray(b" "+bytes(rng.choice(b"ACGTACGTacgN") for position in range(genome_size))))
+    coding=np.array([False]+[rng.random()<0.6 for position in range(genome_size)])
+    return record, coding
+
+def testCircularPositions():
+    assert circularPositions(3, 6, 10).tolist()==[3, 4, 5, 6]
+    assert circularPositions(8, 2, 10).tolist()==[8, 9, 10, 1, 2]
+    assert circularPositions(8, 12, 10).tolist()==[8, 9, 10, 1, 2]
+    assert circularPositions(1, 10, 10).tolist()==list(range(1, 11))
+
+def testGcMaskUpperCaseOnly():
+    assert gcMask(np.frombuffer(b"GCgcATN", dtype=np.uint8)).tolist()==[True, True, False, False, False, False, False]
+
+def testQueryMatchesBruteForce():
+    rng=random.Random(5)
+    for case in range(100):
+        genome_size=rng.randint(1, 120)
+        record, coding=randomGenome(rng, genome_size)
+        gc=gcMask(record.codes())
+        gc_index=GCIndex(gc, coding)
+        for query in range(20):
+            start=rng.randint(1, genome_size)
+            end=start+rng.randint(1, genome_size)-1
+            #Both ways of writing an interval that crosses the origin: end > genome size and start > end
+            if (end>genome_size and rng.random()<0.5):
+                end=end-genome_size
+            positions=circularPositions(start, end, genome_size)
+            expected=(int(gc[positions].sum()), int(coding[positions].sum()), int((gc & coding)[positions].sum()))
+            assert gc_index.query(start, end)==expected
+        assert gc_index.totals()==(int(gc[1:].sum()), int(coding[1:].sum()), int((gc & coding)[1:].sum()))
+
+def testBuildGCIndex():
+    record=FastaRecord("test", bytearray(b" GGCATCAG"))
+    gc_index=buildGCIndex(record, [0, 1, 1, 0, 0, 2, 0])
+    #The nucleotides after the genome size (genome_array) are not used
+    assert gc_index.totals()==(4, 3, 2)
+    assert gc_index.query(6, 2)==(3, 2, 2)
+    with pytest.raises(ValueError):
+        buildGCIndex(record, [0]*10)
@@ -0,0 +1,60 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of gcSkewWindows.py: the values of each window are compared with a direct count of the window positions, including the windows
+#that continue from the first position of the genome
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import random
+import numpy as np
+from gcIndex import circularPositions
+from gcSkewWindows import windowSums, calcWindows
+
+def testWindowSums():
+    rng=random.Random(13)
+    for case in range(50):
+        values=np.array([0]+[rng.randint(0, 3) for position in range(rng.randint(1, 60))])
+        genome_size=values.size-1
+        window_size=rng.randint(1, genome_size)
+        window_starts=np.arange(1, genome_size+1, rng.randint(1, 7))
+        expected=[int(values[circularPositions(start, start+window_size-1, genome_size)].sum()) for start in window_starts.tolist()]
+        assert windowSums(np.cumsum(values), window_starts, window_size).tolist()==expected
+
+#Expected (size, gc, gc_skew, at_skew) of a window of a class, counted position by position (None when the value is not defined)
+def directCount(genome_codes, class_mask, positions):
+    bases=[chr(genome_codes[position]) for position in positions.tolist() if class_mask[position]]
+    counts={base:bases.count(base) for base in "ACGT"}
+    gc=counts["G"]+counts["C"]
+    at=counts["A"]+counts["T"]
+    return (len(bases), gc*100/len(bases) if bases else None, (counts["G"]-counts["C"])/gc if gc else None,
+        (counts["A"]-counts["T"])/at if at else None)
+
+def testCalcWindowsMatchesDirectCount():
+    rng=random.Random(7)
+    for genome_size, window_size, step in ((97, 20, 7), (60, 60, 13), (50, 80, 9), (31, 1, 1), (120, 33, 40)):
+        genome_codes=np.frombuffer(b" "+bytes(rng.choice(b"ACGTN") for position in range(genome_size)), dtype=np.uint8)
+        coding=np.array([rng.random()<0.5 for position in range(genome_size+1)])
+        class_masks={"all":np.ones(genome_size+1, dtype=bool), "coding":coding, "noncoding":~coding}
+        window_starts, window_ends, profiles=calcWindows(genome_codes, class_masks, window_size, step)
+        #A window longer than the genome covers the whole genome once
+        used_size=min(window_size, genome_size)
+        assert window_starts.tolist()==list(range(1, genome_size+1, step))
+        for window, start in enumerate(window_starts.tolist()):
+            positions=circularPositions(start, start+used_size-1, genome_size)
+            assert window_ends[window]==positions[-1]
+            for class_name, class_mask in class_masks.items():
+                values=[profile[window].item() for profile in profiles[class_name]]
+                expected=directCount(genome_codes, class_mask, positions)
+                assert values[0]==expected[0]
+                for value, expected_value in zip(values[1:], expected[1:]):
+                    assert (np.isnan(value) if expected_value is None else abs(value-expected_value)<1e-9)
@@ -0,0 +1,59 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of the gene whitelist of getGeneSeqOfInterestGff.py: the '_GOI.fasta' file keeps every row starting with a whitelist name,
+#while the batch mode (and mitogenomesApi.genesOfInterest) keeps the 'gene' rows named after a whitelist name, ignoring the case
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import io
+from getGeneSeqOfInterestGff import GOI, compileGOI, readGenomeGff, readGffSelGenes
+from mitogenomesApi import genesOfInterest
+
+NAMES=["cox1", "cox1_intron1", "nad5-i1;gbkey=Gene", "COX2", "nad4L", "nad4l", "nad4", "nad41", "cob", "orf123", "rrnL", "rrnl", "atp9 ", ""]
+
+#(type, start, end, strand, name) of the rows of the test gff file
+ROWS=[("gene", 1, 30, "+", "cox1"), ("CDS", 1, 30, "+", "cox1"), ("exon", 5, 10, "+", "cox1_intron1"), ("gene", 31, 60, "-", "nad5-i1"),
+    ("gene", 61, 90, "+", "COX2"), ("gene", 91, 120, "+", "nad4L"), ("gene", 121, 150, "+", "orf123")]
+
+def writeGenome(folder):
+    sequence="".join("ACGT"[(position*7)%4] for position in range(150))
+    (folder/"test.fasta").write_text(">NC_1.1 Test genome\n"+sequence+"\n")
+    gff_lines=["##gff-version 3", "##sequence-region NC_1.1 1 150"]
+    for number, (row_type, start, end, strand, name) in enumerate(ROWS):
+        gff_lines.append("\t".join(["NC_1.1", "RefSeq", row_type, str(start), str(end), ".", strand, ".", "ID="+row_type+str(number)+";Name="+name+";gbkey=Gene"]))
+    (folder/"test.gff").write_text("\n".join(gff_lines)+"\n")
+    return str(folder/"test.gff"), str(folder/"test.fasta")
+
+def testSingleGenomeRuleIsCaseSensitivePrefix():
+    GOI_pattern=compileGOI(GOI)
+    for name in NAMES:
+        assert (GOI_pattern.match(name) is not None)==any(name.startswith(item) for item in GOI), name
+
+def testExactRule():
+    GOI_pattern=compileGOI(GOI, exact=True)
+    matches={name:GOI_pattern.match(name).group() for name in NAMES if GOI_pattern.match(name) is not None}
+    assert matches=={"cox1":"cox1", "COX2":"COX2", "nad4L":"nad4L", "nad4l":"nad4l", "nad4":"nad4", "cob":"cob", "rrnL":"rrnL", "rrnl":"rrnl", "atp9 ":"atp9"}
+
+def testGOIFastaKeepsEveryMatchingRow(tmp_path):
+    gff_file_name, fasta_file_name=writeGenome(tmp_path)
+    whole_genome, gff_table=readGenomeGff(gff_file_name, fasta_file_name)
+    output_file=io.StringIO()
+    readGffSelGenes(compileGOI(GOI), gff_table, output_file, whole_genome)
+    names=[line[1:] for line in output_file.getvalue().splitlines() if line.startswith(">")]
+    assert names==["cox1;gbkey=Gene", "cox1;gbkey=Gene", "cox1_intron1;gbkey=Gene", "nad5-i1;gbkey=Gene", "nad4L;gbkey=Gene"]
+
+def testBatchGenesOfInterest(tmp_path):
+    gff_file_name, fasta_file_name=writeGenome(tmp_path)
+    genes=genesOfInterest(gff_file_name, fasta_file_name)
+    assert [(gene.item, gene.name) for gene in genes]==[("cox1", "cox1;gbkey=Gene"), ("cox2", "COX2;gbkey=Gene"), ("nad4l", "nad4L;gbkey=Gene")]
+    assert [len(gene.sequence) for gene in genes]==[30, 30, 30]
@@ -0,0 +1,76 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of intervalIndex.py: overlap and nearest queries are compared with a brute-force count of the positions of random circular features
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import random
+from intervalIndex import IntervalIndex, readCdsGenes
+
+#Positions of start..end in a circular genome. end may be greater than the genome size, and start > end wraps past the origin
+def positions(start, end, genome_size):
+    if (end>genome_size):
+        end=end-genome_size
+    if (start<=end):
+        return set(range(start, end+1))
+    return set(range(start, genome_size+1))|set(range(1, end+1))
+
+#Random features: short and long ones, with both ways of writing a feature that crosses the origin
+def randomFeatures(rng, genome_size, num_features):
+    starts=[rng.randint(1, genome_size) for i in range(num_features)]
+    ends=[]
+    for start in starts:
+        end=start+rng.randint(1, rng.choice((5, genome_size)))-1
+        ends.append(end if end<=genome_size or rng.random()<0.5 else end-genome_size)
+    return starts, ends
+
+def testOverlapMatchesBruteForce():
+    rng=random.Random(1)
+    for case in range(300):
+        genome_size=rng.randint(5, 400)
+        starts, ends=randomFeatures(rng, genome_size, rng.choice((0, 1, 2, rng.randint(0, 80))))
+        index=IntervalIndex(starts, ends, genome_size)
+        features=[positions(start, end, genome_size) for start, end in zip(starts, ends)]
+        for query in range(20):
+            start=rng.randint(1, genome_size)
+            end=start+rng.randint(1, genome_size)-1
+            if (end>genome_size and rng.random()<0.5):
+                end=end-genome_size
+            region=positions(start, end, genome_size)
+            expected=[feature for feature, covered in enumerate(features) if covered & region]
+            assert index.overlap(start, end).tolist()==expected
+
+def testNearestMatchesBruteForce():
+    rng=random.Random(2)
+    for case in range(200):
+        genome_size=rng.randint(20, 300)
+        starts, ends=randomFeatures(rng, genome_size, rng.randint(1, 15))
+        index=IntervalIndex(starts, ends, genome_size)
+        features=[positions(start, end, genome_size) for start, end in zip(starts, ends)]
+        position=rng.randint(1, genome_size)
+        #Distance of a feature to the position, around the circular genome
+        distances=[min(min((covered_position-position)%genome_size, (position-covered_position)%genome_size) for covered_position in covered)
+            for covered in features]
+        feature, distance=index.nearest(position)
+        assert distance==min(distances)
+        assert distances[feature]==distance
+
+def testEmptyIndex():
+    index=IntervalIndex([], [], 100)
+    assert index.overlap(1, 100).tolist()==[]
+    assert index.nearest(10)==(None, None)
+
+def testReadCdsGenes():
+    cds_lines=["Synthetic genome\n", "Genome ID: SYN\n", "Genome size: 100\n", "Genes:\n", "90;100#cox1\n", "1;10#cox1\n", "20;40#nad5\n"]
+    genome_size, starts, ends, names=readCdsGenes(cds_lines)
+    assert (genome_size, starts, ends, names)==(100, [90, 1, 20], [100, 10, 40], ["cox1", "cox1", "nad5"])
@@ -0,0 +1,90 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of packedGenome.py: a fasta file packed and read back gives the same records as the fasta reader, with the case, N and IUPAC codes kept
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import os
+import random
+from fastaReader import iterFastaRecords, readGenome
+from packedGenome import packFasta, PackedGenomeStore, PackedRecord, isPackCurrent, readPackedOrFasta
+
+#Records of different sizes (not multiples of 4), with lower case runs, N runs and IUPAC codes. Two records have the same name
+def writeFasta(file_name):
+    rng=random.Random(4)
+    sequences=["ACGTNNNNacgtRYKMacgNNnnT", "".join(rng.choice("ACGTACGTacgtNRn") for position in range(1001)), "G", "", "ttttNNNNAAAAcc"]
+    names=["NC_1.1 first record", "NC_2.1", "NC_3.1 one nucleotide", "NC_4.1 empty", "NC_1.1 same name"]
+    with open(file_name,'w') as fasta_file:
+        for name, sequence in zip(names, sequences):
+            fasta_file.write(">"+name+"\n"+"\n".join(sequence[start:start+60] for start in range(0, len(sequence), 60))+"\n")
+
+def testRoundTrip(tmp_path):
+    fasta_file_name=str(tmp_path/"genome.fasta")
+    writeFasta(fasta_file_name)
+    packFasta(fasta_file_name)
+    with open(fasta_file_name,'rb') as fasta_file:
+        expected=list(iterFastaRecords(fasta_file, upper=False))
+    store=PackedGenomeStore(fasta_file_name)
+    try:
+        assert [(record.header, record.size) for record in store.records]==[(record.header, record.size) for record in expected]
+        assert store.record("NC_1.1").header=="NC_1.1 first record"
+        rng=random.Random(1)
+        for record, fasta_record in zip(store.records, expected):
+            assert bytes(record.toFastaRecord(upper=False).data)==bytes(fasta_record.data)
+            assert bytes(record.toFastaRecord().data)==bytes(fasta_record.data).upper()
+            for region in range(30):
+                start=rng.randint(1, record.size+1)
+                end=rng.randint(start-1, record.size)
+                sequence=bytes(fasta_record.data[start:end+1])
+                assert record.fetch(start, end, upper=False)==sequence
+                assert record[start:end+1]==sequence.decode("ascii")
+                assert record.gcCount(start, end)==sum(sequence.upper().count(base) for base in (b"G", b"C"))
+    finally:
+        store.close()
+
+def testReadPackedOrFasta(tmp_path):
+    fasta_file_name=str(tmp_path/"genome.fasta")
+    writeFasta(fasta_file_name)
+    assert not isPackCurrent(fasta_file_name)
+    packFasta(fasta_file_name)
+    assert isPackCurrent(fasta_file_name)
+    for upper in (True, False):
+        with open(fasta_file_name,'r') as fasta_file:
+            expected=readGenome(fasta_file, upper)
+        with open(fasta_file_name,'r') as fasta_file:
+            genome=readPackedOrFasta(fasta_file, upper)
+        assert (genome.header, bytes(genome.data))==(expected.header, bytes(expected.data))
+
+def testLazySingleRecord(tmp_path):
+    fasta_file_name=str(tmp_path/"single.fasta")
+    with open(fasta_file_name,'w') as fasta_file:
+        fasta_file.write(">NC_9.1 single\nacgtNNACGTRYgc\nGGCC\n")
+    packFasta(fasta_file_name)
+    with open(fasta_file_name,'r') as fasta_file:
+        genome=readPackedOrFasta(fasta_file, upper=False, lazy=True)
+    assert isinstance(genome, PackedRecord)
+    assert genome[1:genome.size+1]=="acgtNNACGTRYgcGGCC"
+    assert bytes(genome.codes()[1:])==b"ACGTNNACGTRYGCGGCC"
+
+def testChangedFastaIsNotCurrent(tmp_path):
+    fasta_file_name=str(tmp_path/"genome.fasta")
+    writeFasta(fasta_file_name)
+    packFasta(fasta_file_name)
+    with open(fasta_file_name,'a') as fasta_file:
+        fasta_file.write(">NC_5.1\nACGT\n")
+    assert not isPackCurrent(fasta_file_name)
+    #A stale pack is not used: the genome comes from the fasta file
+    with open(fasta_file_name,'r') as fasta_file:
+        genome=readPackedOrFasta(fasta_file)
+    assert bytes(genome.data).endswith(b"ACGT")
+    assert os.path.exists(fasta_file_name+".pack")
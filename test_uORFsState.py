@@ -0,0 +1,89 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#Tests of uORFsState.py (option --incremental of GCContentuORfsCdsCirc.py): after uORFs are edited, added or removed, the results and the uORF plane
+#of an incremental run are the same as the ones of a full run
+#Run with: python -m pytest
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import random
+import numpy as np
+from GCContentuORfsCdsCirc import processGenome
+from uORFsState import STATE_EXTENSION, loadState, stateDigest
+
+GENOME_SIZE=700
+GENOME="".join(random.Random(23).choice("ACGTACGTAN") for position in range(GENOME_SIZE))
+
+def writeGenome(folder):
+    (folder/"NC_1.1.fasta").write_text(">NC_1.1 Test genome\n"+"\n".join(GENOME[start:start+70] for start in range(0, GENOME_SIZE, 70))+"\n")
+    #The last gene continues from the first position of the genome
+    (folder/"NC_1.1.cds").write_text("Test genome\nGenome ID: NC_1\nGenome size: "+str(GENOME_SIZE)+"\nGenes:\n"
+        "20;180#cox1\n150;320#nad4\n450;560#cob\n651;700#nad6\n1;40#nad6\nSum of nucleotides\n")
+
+#uORFs are (name, start, end). The sequence is the genome region, also for the uORFs that cross the origin
+def writeuORFs(file_name, uORFs):
+    with open(file_name,'w') as uORFs_file:
+        for name, start, end in uORFs:
+            sequence=GENOME[start-1:end] if start<=end else GENOME[start-1:]+GENOME[:end]
+            uORFs_file.write(">G-"+name+"\n+"+str(start)+"\n-"+str(end)+"\n@"+sequence+"\n\n")
+
+def runGenome(folder, uORFs, incremental, capsys):
+    file_name=str(folder/"NC_1.1.uORFs")
+    if (not (folder/"NC_1.1.fasta").exists()):
+        writeGenome(folder)
+    writeuORFs(file_name, uORFs)
+    capsys.readouterr()
+    summary=processGenome(file_name, str(folder/"NC_1.1.cds"), str(folder/"NC_1.1.fasta"), incremental=incremental)
+    output=capsys.readouterr().out
+    counts=[line for line in output.splitlines() if line.startswith("uORFs reused from")]
+    return summary, (folder/"NC_1.gct").read_text(), (folder/"NC_1.csv").read_text(), counts
+
+UORFS=[("orf1", 10, 90), ("orf8", 200, 260), ("orf15", 640, 30), ("orf22", 300, 480), ("orf8", 200, 260), ("orf29", 500, 530)]
+#orf8 (one of its two copies) is removed, orf22 is edited, orf36 is added
+EDITED_UORFS=[("orf1", 10, 90), ("orf15", 640, 30), ("orf22", 300, 470), ("orf8", 200, 260), ("orf29", 500, 530), ("orf36", 600, 690)]
+
+def testIncrementalRunsMatchFullRuns(tmp_path, capsys):
+    full_folder=tmp_path/"full"
+    incremental_folder=tmp_path/"incremental"
+    full_folder.mkdir()
+    incremental_folder.mkdir()
+    for uORFs, expected_counts in ((UORFS, "0, computed: 6"), (UORFS, "6, computed: 0"), (EDITED_UORFS, "4, computed: 2")):
+        summary, gct, csv, counts=runGenome(incremental_folder, uORFs, True, capsys)
+        expected_summary, expected_gct, expected_csv, no_counts=runGenome(full_folder, uORFs, False, capsys)
+        assert (summary, gct, csv)==(expected_summary, expected_gct, expected_csv)
+        assert counts==["uORFs reused from "+str(incremental_folder/"NC_1.1.uORFs")+STATE_EXTENSION+": "+expected_counts]
+        assert no_counts==[]
+
+def testStateUORFPlane(tmp_path, capsys):
+    runGenome(tmp_path, UORFS, True, capsys)
+    runGenome(tmp_path, EDITED_UORFS, True, capsys)
+    digest=stateDigest(str(tmp_path/"NC_1.1.cds"), str(tmp_path/"NC_1.1.fasta"))
+    uORFs_state=loadState(str(tmp_path/"NC_1.1.uORFs")+STATE_EXTENSION, digest)
+    #Number of uORFs covering each position, counted from the uORFs of the last run
+    expected=np.zeros(GENOME_SIZE+1, dtype=np.int64)
+    for name, start, end in EDITED_UORFS:
+        for position in (range(start, end+1) if start<=end else list(range(start, GENOME_SIZE+1))+list(range(1, end+1))):
+            expected[position]+=1
+    assert np.asarray(uORFs_state.uORF_coverage)[1:GENOME_SIZE+1].tolist()==expected[1:].tolist()
+    assert uORFs_state.counts()==(0, 0)
+
+def testStaleDigest(tmp_path, capsys):
+    runGenome(tmp_path, UORFS, True, capsys)
+    state_file_name=str(tmp_path/"NC_1.1.uORFs")+STATE_EXTENSION
+    digest=stateDigest(str(tmp_path/"NC_1.1.cds"), str(tmp_path/"NC_1.1.fasta"))
+    assert loadState(state_file_name, digest) is not None
+    #A new gene in the cds file makes the state stale, and the next run computes every uORF again
+    cds_file=tmp_path/"NC_1.1.cds"
+    cds_file.write_text(cds_file.read_text().replace("450;560#cob", "450;560#cob\n600;620#atp9"))
+    assert loadState(state_file_name, stateDigest(str(cds_file), str(tmp_path/"NC_1.1.fasta"))) is None
+    summary, gct, csv, counts=runGenome(tmp_path, UORFS, True, capsys)
+    assert counts[0].endswith(": 0, computed: 6")
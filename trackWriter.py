@@ -0,0 +1,104 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module saves the per-nucleotide values of genome_array (0 = non coding, 1 = coding, 10 = uORF in non coding region, 11 = uORF in coding region...)
+#in one of these formats:
+# -csv - one row per nucleotide, as the original output of GCContentuORfsCdsCirc.py
+# -bedgraph - one row per run of nucleotides with the same value: chrom, start (0-based), end and value, as in the bedGraph format of genome browsers
+# -npy - the numpy array in binary, with the smallest integer type for the values. Position 0 is not used, as in genome_array
+# -npz - compressed numpy file with the runs: starts (1-based), values and genome_size
+#The values are always the same of the csv file. readTrack reads any of the formats back into a genome_array
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import numpy as np
+
+#Track formats and the extension of their files
+TRACK_FORMATS={"csv":".csv", "bedgraph":".bedgraph", "npy":".npy", "npz":".npz"}
+
+#Returns the name of the track file of output_file_name (without extension) in the given format
+def trackFileName(output_file_name, track_format):
+    return output_file_name+TRACK_FORMATS[track_format]
+
+#This function splits genome_array (position 0 is not used) in runs of nucleotides with the same value
+#Returns three numpy arrays: 1-based start and end (inclusive) of each run and its value
+def runLengths(genome_array):
+    values=np.asarray(genome_array)[1:]
+    if (values.size==0):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), values
+    #A run starts at the first nucleotide and wherever the value changes
+    run_starts=np.flatnonzero(np.concatenate(([True], values[1:]!=values[:-1])))
+    run_ends=np.append(run_starts[1:], values.size)
+    return run_starts+1, run_ends, values[run_starts]
+
+#Returns genome_array with the smallest unsigned integer type that holds its values (values are never negative)
+def compactArray(genome_array):
+    genome_array=np.asarray(genome_array)
+    max_value=int(genome_array.max()) if genome_array.size>0 else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if (max_value<=np.iinfo(dtype).max):
+            return genome_array.astype(dtype)
+    return genome_array.astype(np.uint64)
+
+#Each row of csv file is the value of genome_array for a nucleotide. The rows are written in blocks, instead of one write per nucleotide
+def writeCsvTrack(file_name, genome_array):
+    block_size=1000000
+    with open(file_name,'w') as output_csv_file:
+        for i in range(1,len(genome_array),block_size):
+            output_csv_file.write("".join([str(value)+"\n" for value in genome_array[i:i+block_size].tolist()]))
+
+#Each row of the bedGraph file is a run of nucleotides with the same value. The runs with value 0 are also written, so the whole genome is in the file
+def writeBedGraphTrack(file_name, genome_array, chrom_name):
+    run_starts, run_ends, run_values=runLengths(genome_array)
+    with open(file_name,'w') as output_file:
+        output_file.write("track type=bedGraph name=\""+chrom_name+"\" description=\"genes + 10 x uORFs per nucleotide\"\n")
+        output_file.write("".join([chrom_name+"\t"+str(start-1)+"\t"+str(end)+"\t"+str(value)+"\n"
+            for start, end, value in zip(run_starts.tolist(), run_ends.tolist(), run_values.tolist())]))
+
+#This function saves genome_array in the track format and returns the name of the file
+#chrom_name is the name of the sequence in the bedGraph rows (the ID of the genome)
+def writeTrack(output_file_name, genome_array, track_format="csv", chrom_name="genome"):
+    file_name=trackFileName(output_file_name, track_format)
+    if (track_format=="csv"):
+        writeCsvTrack(file_name, genome_array)
+    elif (track_format=="bedgraph"):
+        writeBedGraphTrack(file_name, genome_array, chrom_name)
+    elif (track_format=="npy"):
+        np.save(file_name, compactArray(genome_array))
+    elif (track_format=="npz"):
+        run_starts, run_ends, run_values=runLengths(genome_array)
+        np.savez_compressed(file_name, starts=compactArray(run_starts), values=compactArray(run_values), genome_size=np.int64(len(genome_array)-1))
+    else:
+        raise ValueError("Unknown track format: "+str(track_format))
+    return file_name
+
+#This function reads a track file in any of the formats and returns genome_array (position 0 is not used)
+def readTrack(file_name):
+    if (file_name.endswith(".npy")):
+        return np.load(file_name).astype(np.int64)
+    if (file_name.endswith(".npz")):
+        with np.load(file_name) as track:
+            genome_size=int(track["genome_size"])
+            run_starts=track["starts"].astype(np.int64)
+            run_values=track["values"].astype(np.int64)
+        run_sizes=np.diff(np.append(run_starts, genome_size+1))
+        return np.concatenate(([0], np.repeat(run_values, run_sizes)))
+    if (file_name.endswith(".bedgraph")):
+        values=[0]
+        with open(file_name,'r') as track_file:
+            for line in track_file:
+                if (line.startswith("track")):
+                    continue
+                chrom_name, start, end, value=line.split("\t")
+                values.extend([int(value)]*(int(end)-int(start)))
+        return np.array(values, dtype=np.int64)
+    with open(file_name,'r') as track_file:
+        return np.array([0]+[int(line) for line in track_file if line.strip()!=""], dtype=np.int64)
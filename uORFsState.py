@@ -0,0 +1,113 @@
+#This script is part of supplementary documents of "Impact of Introns and Homing Endonucleases on Structural Mitogenome Shaping in Hypocreales"
+#submitted to Frontiers in Microbiology, section Fungi and Their Interactions
+#Manuscript ID: 531057
+#Authors:  Paula Fonseca, Fernanda Badotti, Ruth De-Paula, Daniel Araújo, Dener Eduardo Bortolini, Luiz-Eduardo Del-Bem, Vasco Ariston De Carvalho Azevedo,
+#Bertram Brenig, Eric Roberto Guimarães Rocha Aguiar, Aristóteles Góes-Neto
+
+#This module keeps the state of a run of GCContentuORfsCdsCirc.py (option --incremental) in a binary 'uORFs_file_name.state.npz' file:
+# -genome level data, that depends only on the cds and fasta files: genome sequence and coverage of the genes of the cds file
+# -uORF overlay: the uORF plane of the annotation track and the results (sequence in CDS and GC counts) of each uORF
+#When only the uORFs file changed, the next run loads the state and computes only the uORFs that were added or edited. The uORFs that were
+#removed (or edited) are subtracted from the uORF plane. When the cds or fasta file changed, the state is not used and is built again
+#The state is saved with genomeBundle.saveBundle and holds the sha256 of the cds and fasta files
+
+#******************************************************************************#
+#                          Run the code in Python 3+                           #
+#******************************************************************************#
+
+# -*- Coding: UTF-8 -*-
+#coding: utf-8
+
+import numpy as np
+from fastaReader import FastaRecord
+from annotationTrack import AnnotationTrack
+from gcIndex import circularPositions
+from genomeBundle import sourceDigest, loadBundle, saveBundle
+
+STATE_EXTENSION=".state.npz"
+
+#Returns the positions of the genome covered by an uORF, as gcContentCalc of GCContentuORfsCdsCirc.py adds them to the uORF plane
+def uORFPositions(start, end, sequence, genome_size):
+    return circularPositions(start, end, genome_size)[:len(sequence)]
+
+class UORFsState:
+    __slots__=("digest","whole_genome","genome_size","gene_coverage","uORF_coverage","_old_uORFs","_old_values","_index","_kept","_uORFs","_values")
+
+    #whole_genome is an upper case FastaRecord. uORFs are records of genomeBundle.readuORFsRecords and values their results
+    #(sequence in CDS, GC nucleotides, GC nucleotides in CDS and nucleotides in CDS), from the previous run
+    def __init__(self, digest, whole_genome, genome_size, gene_coverage, uORF_coverage=None, uORFs=(), values=()):
+        self.digest=digest
+        self.whole_genome=whole_genome
+        self.genome_size=genome_size
+        self.gene_coverage=gene_coverage
+        self.uORF_coverage=uORF_coverage
+        self._old_uORFs=list(uORFs)
+        self._old_values=list(values)
+        #The same uORF can be listed more than once, so each record has the list of its positions in the previous run
+        self._index={}
+        for position, uORF in enumerate(self._old_uORFs):
+            self._index.setdefault(uORF, []).append(position)
+        self._kept=set()
+        self._uORFs=[]
+        self._values=[]
+
+    #Creates the annotation track with the genes and the uORFs of the previous run
+    def annotationTrack(self):
+        annotation_track=AnnotationTrack(self.genome_size, ("gene","uORF"))
+        annotation_track.addCoverage("gene", self.gene_coverage)
+        if (self.uORF_coverage is not None):
+            annotation_track.count("uORF")[:]=self.uORF_coverage
+        return annotation_track
+
+    #Returns the results of an uORF of the previous run (its positions are already in the uORF plane), or None when it is new or was edited
+    def reuse(self, uORF):
+        positions=self._index.get(uORF)
+        if (not positions):
+            return None
+        position=positions.pop(0)
+        self._kept.add(position)
+        self._uORFs.append(uORF)
+        self._values.append(self._old_values[position])
+        return self._old_values[position]
+
+    #Keeps the results of an uORF computed in this run
+    def add(self, uORF, values):
+        self._uORFs.append(uORF)
+        self._values.append(values)
+
+    #Subtracts from the uORF plane the uORFs of the previous run that are no longer in the uORFs file. Returns the number of uORFs removed
+    def removeStale(self, annotation_track):
+        removed=0
+        for position, (name_ORF, start_ORF, end_ORF, seq_ORF) in enumerate(self._old_uORFs):
+            if (position not in self._kept):
+                annotation_track.removePositions("uORF", uORFPositions(start_ORF, end_ORF, seq_ORF, self.genome_size))
+                removed=removed+1
+        return removed
+
+    #Number of uORFs reused from the previous run and computed in this run
+    def counts(self):
+        return len(self._kept), len(self._uORFs)-len(self._kept)
+
+    #Saves the state with the uORF plane of annotation_track and the uORFs of this run
+    def save(self, state_file_name, annotation_track):
+        saveBundle(state_file_name, self.digest, {"genome_header":np.array(self.whole_genome.header),
+            "genome_data":np.frombuffer(bytes(self.whole_genome.data), dtype=np.uint8), "genome_size":np.array(self.genome_size),
+            "gene_coverage":np.asarray(self.gene_coverage), "uORF_coverage":annotation_track.count("uORF"),
+            "uORFs_names":np.array([uORF[0] for uORF in self._uORFs], dtype=str), "uORFs_starts":np.array([uORF[1] for uORF in self._uORFs], dtype=np.int64),
+            "uORFs_ends":np.array([uORF[2] for uORF in self._uORFs], dtype=np.int64), "uORFs_sequences":np.array([uORF[3] for uORF in self._uORFs], dtype=str),
+            "uORFs_sequences_cds":np.array([values[0] for values in self._values], dtype=str),
+            "uORFs_counts":np.array([values[1:] for values in self._values], dtype=np.int64).reshape(-1,3)})
+
+#Returns the digest of the genome level files of a state
+def stateDigest(cds_file_name, fasta_file_name):
+    return sourceDigest((cds_file_name, fasta_file_name))
+
+#This function loads the state of a uORFs file. Returns None when there is no state or it was built with other cds or fasta files
+def loadState(state_file_name, digest):
+    state=loadBundle(state_file_name, digest)
+    if (state is None):
+        return None
+    uORFs=list(zip(state["uORFs_names"].tolist(), state["uORFs_starts"].tolist(), state["uORFs_ends"].tolist(), state["uORFs_sequences"].tolist()))
+    values=[(sequence_cds,)+tuple(counts) for sequence_cds, counts in zip(state["uORFs_sequences_cds"].tolist(), state["uORFs_counts"].tolist())]
+    whole_genome=FastaRecord(str(state["genome_header"]), bytearray(state["genome_data"].tobytes()))
+    return UORFsState(digest, whole_genome, int(state["genome_size"]), state["gene_coverage"], state["uORF_coverage"], uORFs, values)